@@ -0,0 +1,93 @@
+"""
+Recommendation Cascade Benchmark
+Runs labelled dataset texts through get_career_recommendations with the
+TF-IDF first stage at several margins and candidate counts, and reports the
+share of queries answered without the transformer, top-1 accuracy against
+the dataset label, agreement with the full transformer path and latency
+
+Queries are scored k-fold: the TF-IDF index is built from the other folds so
+a query never matches its own text. Uses the model in CAREER_MODEL_DIR
+(run_benchmarks.py points it at the offline fixture, whose random weights
+make the transformer's own accuracy meaningless; real models give the real
+trade-off).
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "streamlit_app"))
+
+from utils import model_loader
+from utils.lexical_scorer import LexicalScorer
+from utils.training_data import load_corpus
+
+def _run_queries(samples, margin, candidates, top_k):
+    """Top careers and per-query milliseconds for one cascade setting"""
+    careers = []
+    elapsed = 0.0
+    short_circuited = 0
+    for sample in samples:
+        start = time.perf_counter()
+        results = model_loader.get_career_recommendations_batch(
+            [sample['text']], top_k=top_k, cascade_margin=margin, cascade_candidates=candidates
+        )[0]
+        elapsed += time.perf_counter() - start
+        careers.append(results[0]['career'])
+        short_circuited += results[0]['method'] == 'lexical'
+    return careers, short_circuited, elapsed * 1000 / len(samples)
+
+def run(margins=(0.1, 0.2, 0.3, 0.5), candidates=(3, 5), folds=5, top_k=5):
+    """
+    Run the cascade benchmark
+
+    Args:
+        margins: TF-IDF short-circuit margins to try
+        candidates: Transformer candidate counts to try
+        folds: Folds of the dataset texts
+        top_k: Recommendations per query
+
+    Returns:
+        Per setting: short-circuit fraction, top-1 accuracy, top-1 agreement
+        with the full path and mean milliseconds per query; plus the same
+        for the full transformer path
+    """
+    if not model_loader.load_model():
+        raise RuntimeError("Model not available - set CAREER_MODEL_DIR")
+    classes = model_loader._label_encoder.classes_.tolist()
+    samples = [sample for sample in load_corpus() if sample['role'] in classes]
+    settings = [(None, None)] + [(margin, count) for margin in margins for count in candidates]
+
+    outcomes = {setting: {'careers': [], 'short_circuited': 0, 'ms': 0.0} for setting in settings}
+    labels = []
+    for fold in range(folds):
+        held_out = samples[fold::folds]
+        indexed = [sample for i, sample in enumerate(samples) if i % folds != fold]
+        model_loader._lexical_scorer = model_loader.calibrate_lexical_scorer(
+            LexicalScorer(classes, indexed), (sample['text'] for sample in indexed)
+        )
+        labels.extend(sample['role'] for sample in held_out)
+        for setting in settings:
+            careers, short_circuited, ms = _run_queries(held_out, *setting, top_k)
+            outcome = outcomes[setting]
+            outcome['careers'].extend(careers)
+            outcome['short_circuited'] += short_circuited
+            outcome['ms'] += ms * len(held_out)
+    model_loader._lexical_scorer = None
+
+    full = outcomes[(None, None)]['careers']
+    results = {'queries': len(labels)}
+    for (margin, count), outcome in outcomes.items():
+        name = "full" if margin is None else f"margin={margin},M={count}"
+        careers = outcome['careers']
+        results[name] = {
+            'short_circuit': round(outcome['short_circuited'] / len(labels), 3),
+            'top1_accuracy': round(sum(c == l for c, l in zip(careers, labels)) / len(labels), 3),
+            'agreement_with_full': round(sum(c == f for c, f in zip(careers, full)) / len(labels), 3),
+            'ms_per_query': round(outcome['ms'] / len(labels), 2),
+        }
+    return results
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,106 @@
+"""
+Chat History Benchmark
+Measures Streamlit rerun time and session-state size of the coach chat at 10,
+100 and 1000 messages, comparing the original render-everything list against
+the windowed ChatStore
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "streamlit_app"))
+
+from timing import latency_summary, sample
+from utils.chat_store import ChatStore
+
+# A typical coach exchange (assistant replies are a few paragraphs)
+QUESTION = "How do I move from data analysis into machine learning engineering?"
+ANSWER = (
+    "Start by strengthening your Python and statistics foundations, then work "
+    "through a structured machine learning course. Build two or three end-to-end "
+    "projects that go from raw data to a deployed model, and learn the basics of "
+    "MLOps: experiment tracking, model serving and monitoring. "
+) * 4
+
+def _list_page():
+    """Original chat view: every message rendered on every rerun"""
+    import streamlit as st
+
+    for message in st.session_state.chat_history:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+
+def _windowed_page():
+    """Chat view backed by ChatStore: only the latest window is rendered"""
+    import streamlit as st
+    from utils.chat_store import CHAT_WINDOW
+
+    chat_store = st.session_state.chat_store
+    hidden = len(chat_store) - CHAT_WINDOW
+    if hidden > 0:
+        st.caption(f"{hidden} earlier messages hidden")
+        st.button("⬆️ Show earlier messages", key="chat_show_earlier")
+
+    for message in chat_store.recent(CHAT_WINDOW):
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+
+def _conversation(messages):
+    """Alternating user/assistant messages (numbered, so none are shared)"""
+    for i in range(messages):
+        yield ("user", f"{QUESTION} ({i})") if i % 2 == 0 else ("assistant", f"{ANSWER} ({i})")
+
+def _rerun_samples(page, state, iterations):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_function(page, default_timeout=120)
+    for key, value in state.items():
+        app.session_state[key] = value
+    return sample(app.run, iterations, warmup=1)
+
+def run(sizes=(10, 100, 1000), iterations=10):
+    """
+    Run the chat history benchmark
+
+    Args:
+        sizes: Conversation lengths (messages) to test
+        iterations: Timed reruns per size and variant
+
+    Returns:
+        Per size: rerun percentiles and serialized (JSON) session-state size for the
+        original list and for ChatStore, plus the speedup
+    """
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "chat_history.db"
+
+        for size in sizes:
+            history = [{"role": role, "content": content} for role, content in _conversation(size)]
+            chat_store = ChatStore(db_path=db_path)
+            for role, content in _conversation(size):
+                chat_store.append(role, content)
+
+            list_summary = latency_summary(
+                _rerun_samples(_list_page, {'chat_history': history}, iterations)
+            )
+            store_summary = latency_summary(
+                _rerun_samples(_windowed_page, {'chat_store': chat_store}, iterations)
+            )
+
+            results[f'messages_{size}'] = {
+                'list_rerun_p50_ms': list_summary['p50_ms'],
+                'list_rerun_p95_ms': list_summary['p95_ms'],
+                'store_rerun_p50_ms': store_summary['p50_ms'],
+                'store_rerun_p95_ms': store_summary['p95_ms'],
+                'speedup': round(list_summary['p50_ms'] / store_summary['p50_ms'], 2),
+                'list_state_kb': round(len(json.dumps(history)) / 1024, 1),
+                'store_state_kb': round(len(json.dumps(chat_store.to_dict())) / 1024, 1),
+            }
+
+    return results
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
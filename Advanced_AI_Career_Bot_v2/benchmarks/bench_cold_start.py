@@ -0,0 +1,64 @@
+"""
+Cold Start Benchmark
+Measures a fresh interpreter's time to import the pipeline, load the model
+and answer the first query
+
+Uses the model in CAREER_MODEL_DIR (run_benchmarks.py points it at the
+offline fixture).
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+STREAMLIT_APP_DIR = Path(__file__).parent.parent / "streamlit_app"
+
+# Runs in a fresh interpreter and prints its timings as JSON
+_CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.append(sys.argv[1])
+from utils import model_loader
+imported = time.perf_counter()
+if not model_loader.load_model():
+    sys.exit(1)
+loaded = time.perf_counter()
+model_loader.get_career_recommendations("I love analyzing data with Python", top_k=5)
+answered = time.perf_counter()
+print(json.dumps({
+    'import_s': imported - start,
+    'load_model_s': loaded - imported,
+    'first_query_s': answered - loaded,
+    'total_s': answered - start,
+}))
+"""
+
+def _run_child():
+    """Run one cold start in a subprocess"""
+    env = dict(os.environ, TOKENIZERS_PARALLELISM="false")
+    completed = subprocess.run(
+        [sys.executable, "-c", _CHILD_SCRIPT, str(STREAMLIT_APP_DIR)],
+        capture_output=True, text=True, env=env
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Cold start failed - set CAREER_MODEL_DIR\n{completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def run(repeat=3):
+    """
+    Run the cold start benchmark
+
+    Args:
+        repeat: Fresh interpreters started (the fastest run is reported)
+
+    Returns:
+        Dictionary of import, load, first-query and total seconds
+    """
+    runs = [_run_child() for _ in range(repeat)]
+    best = min(runs, key=lambda r: r['total_s'])
+    return dict((key, round(value, 4)) for key, value in best.items())
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,302 @@
+"""
+Streamlit Load Benchmark
+Drives concurrent headless app.py sessions through Streamlit's AppTest with a
+stubbed OpenRouter endpoint, and reports rerun latency percentiles, memory
+held per session and the concurrency at which throughput saturates
+
+Uses the model in CAREER_MODEL_DIR (run_benchmarks.py points it at the
+offline fixture).
+"""
+
+import contextlib
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+STREAMLIT_APP_DIR = Path(__file__).parent.parent / "streamlit_app"
+APP_PATH = STREAMLIT_APP_DIR / "app.py"
+
+sys.path.append(str(STREAMLIT_APP_DIR))
+
+from fixtures import OpenRouterStub
+from timing import latency_summary
+
+# Simulated interactions and their relative frequency
+ACTION_WEIGHTS = {
+    'recommend': 4,
+    'roadmap': 2,
+    'books': 2,
+    'coach': 3,
+    'interview': 1,
+}
+
+DESCRIPTIONS = [
+    "I love analyzing data and building machine learning models with Python",
+    "I enjoy creating user interfaces with React, CSS and JavaScript",
+    "I automate deployments with Docker, Kubernetes and CI/CD pipelines",
+    "I design APIs and databases for backend services",
+    "I protect networks and run penetration tests",
+]
+
+QUESTIONS = [
+    "How do I move from data analysis into machine learning?",
+    "What salary should I ask for as a junior backend developer?",
+    "Which certifications matter for cloud engineering?",
+]
+
+# A level saturates when throughput grows less than this over the previous level
+SATURATION_GAIN = 0.10
+
+def _by_label(widgets, prefix):
+    """First widget whose label starts with prefix"""
+    for widget in widgets:
+        if widget.label.startswith(prefix):
+            return widget
+    raise LookupError(f"No widget labelled {prefix!r}")
+
+def _choose(widget, rng):
+    """Pick a random option of a selectbox/radio"""
+    return widget.set_value(rng.choice(widget.options))
+
+@contextlib.contextmanager
+def _concurrent_app_tests():
+    """
+    Let AppTest sessions run concurrently in one process
+
+    AppTest assumes one run at a time: every run recompiles the script,
+    installs a process-global runtime, turns on the "global.appTest" config
+    option and resets the multipage-app flag, then clears them when it
+    finishes, pulling them out from under overlapping runs. A real server sets
+    these up once for all sessions, so while the harness runs the compiled
+    script is shared, the option stays on, the most recently installed
+    runtime stays visible and the flag is left alone.
+    """
+    from streamlit.runtime import Runtime
+    from streamlit.testing.v1 import app_test, local_script_runner
+    from streamlit.testing.v1.util import patch_config_options
+
+    class _PagesManager(app_test.PagesManager):
+        """AppTest's per-run flag reset lands on this subclass, not the shared class"""
+
+    script_cache = app_test.ScriptCache()
+    last = {'runtime': None}
+
+    def instance():
+        runtime = Runtime._instance
+        if runtime is not None:
+            last['runtime'] = runtime
+            return runtime
+        if last['runtime'] is None:
+            raise RuntimeError("Runtime hasn't been created!")
+        return last['runtime']
+
+    def exists():
+        return Runtime._instance is not None or last['runtime'] is not None
+
+    with patch_config_options({"global.appTest": True}), \
+            mock.patch.object(app_test, 'PagesManager', _PagesManager), \
+            mock.patch.object(local_script_runner, 'ScriptCache', lambda: script_cache), \
+            mock.patch.object(app_test, 'patch_config_options', lambda options: contextlib.nullcontext()), \
+            mock.patch.object(Runtime, 'instance', staticmethod(instance)), \
+            mock.patch.object(Runtime, 'exists', staticmethod(exists)):
+        yield
+
+class _Session:
+    """One simulated user: an AppTest instance with its own session state"""
+
+    def __init__(self, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.app = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+        self.errors = 0
+        self.messages = []
+
+    def rerun(self):
+        start = time.perf_counter()
+        self.app.run()
+        elapsed = time.perf_counter() - start
+        self.errors += len(self.app.exception) + len(self.app.error)
+        self.messages.extend(e.message for e in self.app.exception)
+        self.messages.extend(e.value for e in self.app.error)
+        return elapsed
+
+    def open(self):
+        """First page load, then enter the (stub) API key"""
+        elapsed = self.rerun()
+        self.app.sidebar.text_input[0].input("load-test-key")
+        return elapsed + self.rerun()
+
+    def act(self, action, rng):
+        """
+        Perform one interaction (one rerun) and return its latency
+
+        If the previous run did not render the widget (e.g., it failed), the
+        interaction counts as an error and the page is simply rerun.
+        """
+        try:
+            self._interact(action, rng)
+        except (LookupError, IndexError) as e:
+            self.errors += 1
+            self.messages.append(f"{action}: {e}")
+        return self.rerun()
+
+    def _interact(self, action, rng):
+        app = self.app
+        if action == 'recommend':
+            app.text_area[0].input(rng.choice(DESCRIPTIONS))
+            app.multiselect[0].set_value(rng.sample(app.multiselect[0].options, 2))
+            _by_label(app.button, "🔍").click()
+        elif action == 'roadmap':
+            _choose(_by_label(app.selectbox, "Select a career path"), rng)
+            _by_label(app.button, "📖 Load Career Roadmap").click()
+        elif action == 'books':
+            _choose(_by_label(app.selectbox, "Select your career interest"), rng)
+            _by_label(app.button, "📖 Get Book").click()
+        elif action == 'coach':
+            app.chat_input[0].set_value(rng.choice(QUESTIONS))
+        elif action == 'interview':
+            _choose(_by_label(app.selectbox, "Select career to prepare"), rng)
+            _choose(app.radio[0], rng)
+            _by_label(app.button, "📝").click()
+
+def _user(actions, seed, timeout):
+    """Run one simulated user to completion; returns the session and its (action, seconds) records"""
+    rng = random.Random(seed)
+    session = _Session(timeout)
+    names = list(ACTION_WEIGHTS)
+    weights = [ACTION_WEIGHTS[n] for n in names]
+
+    records = [('open', session.open())]
+    for _ in range(actions):
+        action = rng.choices(names, weights)[0]
+        records.append((action, session.act(action, rng)))
+
+    return session, records
+
+def run_level(concurrency, actions_per_user=10, timeout=120, seed=0):
+    """
+    Run `concurrency` simulated users at once
+
+    Args:
+        concurrency: Simultaneous sessions
+        actions_per_user: Interactions (reruns) per session after opening
+        timeout: Per-rerun timeout in seconds
+        seed: Random seed for the interaction mix
+
+    Returns:
+        Latency percentiles, throughput and errors
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        finished = list(executor.map(
+            lambda i: _user(actions_per_user, seed * 1000 + i, timeout),
+            range(concurrency)
+        ))
+    elapsed = time.perf_counter() - start
+
+    sessions = [session for session, _ in finished]
+    samples = [record for _, records in finished for record in records]
+
+    result = {
+        'sessions': concurrency,
+        'reruns': len(samples),
+        'errors': sum(session.errors for session in sessions),
+        'error_messages': sorted(set(m for session in sessions for m in session.messages))[:10],
+        'reruns_per_sec': round(len(samples) / elapsed, 2),
+    }
+    result.update({f'rerun_{k}': v for k, v in latency_summary([s for _, s in samples]).items()})
+
+    for action in ['open'] + list(ACTION_WEIGHTS):
+        action_samples = [s for name, s in samples if name == action]
+        if action_samples:
+            summary = latency_summary(action_samples)
+            result[f'{action}_p50_ms'] = summary['p50_ms']
+            result[f'{action}_p95_ms'] = summary['p95_ms']
+
+    return result
+
+def session_memory_kb(sessions=2, actions_per_user=10, seed=0):
+    """
+    Python memory held per live session (KiB), from tracemalloc
+
+    Measured apart from the timed levels, since tracing slows every
+    allocation: sessions run one after another and stay alive, and the
+    memory traced after a full collection is compared with one baseline
+    taken before the first. Process-wide caches warmed by these sessions
+    count too, so this is an upper bound; it is never negative.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        alive = [_user(actions_per_user, seed * 1000 + i, timeout=120)[0] for i in range(sessions)]
+        gc.collect()
+        held = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    del alive
+    return max(0, round(held / sessions / 1024))
+
+def run(levels=(1, 2, 4, 8), actions_per_user=10, llm_latency=0.2, seed=0):
+    """
+    Run the load benchmark at increasing concurrency
+
+    Args:
+        levels: Concurrent session counts to test, in increasing order
+        actions_per_user: Interactions per session
+        llm_latency: Simulated OpenRouter response time in seconds
+        seed: Random seed for the interaction mix
+
+    Returns:
+        Time of the first (cold) session, one result per concurrency level,
+        the saturation point (first level whose throughput grows less than
+        SATURATION_GAIN) and the memory held per session
+    """
+    results = {}
+    saturation = None
+    previous = None
+
+    with OpenRouterStub(latency=llm_latency) as stub, _concurrent_app_tests():
+        # Sessions run in this process, so agents they create use the stub
+        from utils import openrouter_agent
+
+        original_url = openrouter_agent.OPENROUTER_URL
+        openrouter_agent.OPENROUTER_URL = stub.url
+        try:
+            # One untimed session pays the process-wide imports and caches
+            start = time.perf_counter()
+            warmup = _Session(timeout=300)
+            warmup.open()
+            warmup.act('recommend', random.Random(seed))
+            results['first_session_s'] = round(time.perf_counter() - start, 3)
+            del warmup
+
+            for concurrency in levels:
+                level = run_level(concurrency, actions_per_user, seed=seed)
+                results[f'concurrency_{concurrency}'] = level
+
+                throughput = level['reruns_per_sec']
+                if saturation is None and previous is not None and throughput < previous * (1 + SATURATION_GAIN):
+                    saturation = concurrency
+                previous = throughput if previous is None else max(previous, throughput)
+
+            results['memory_per_session_kb'] = session_memory_kb(actions_per_user=actions_per_user, seed=seed)
+        finally:
+            openrouter_agent.OPENROUTER_URL = original_url
+
+        results['llm_requests'] = stub.requests
+
+    results['peak_reruns_per_sec'] = max(
+        level['reruns_per_sec'] for key, level in results.items() if key.startswith('concurrency_')
+    )
+    results['saturation_concurrency'] = saturation
+    return results
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
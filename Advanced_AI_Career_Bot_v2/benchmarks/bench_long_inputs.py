@@ -0,0 +1,113 @@
+"""
+Long Input Benchmark
+Scores profiles whose descriptions run past MAX_LENGTH tokens with each way
+of handling them: the original appended layout truncated at MAX_LENGTH, the
+"fit" layout (structured fields first for long descriptions), sliding
+windows, and the classifier run on the whole input at 512 tokens
+
+Reports per-query latency, the share of queries whose structured fields
+reach the classifier, and top-1 agreement with the 512-token classifier.
+Uses the model in CAREER_MODEL_DIR (run_benchmarks.py points it at the
+offline fixture, whose random weights make the agreement numbers
+meaningless; real models give the real trade-off).
+"""
+
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "streamlit_app"))
+
+import torch
+
+from utils import model_loader
+from utils.training_data import load_corpus
+
+SKILLS = ["Python", "SQL", "Docker", "React", "Communication", "Leadership"]
+
+def _profiles(count, description_tokens, seed=0):
+    """(description, skills, experience, education) with long descriptions"""
+    rng = random.Random(seed)
+    texts = [sample['text'] for sample in load_corpus()]
+    profiles = []
+    for i in range(count):
+        description = f"Profile {i}."
+        while len(model_loader._tokenizer(description)['input_ids']) < description_tokens:
+            description += " " + rng.choice(texts)
+        profiles.append((description, rng.sample(SKILLS, 3), "Intermediate", "Bachelor's Degree"))
+    return profiles
+
+def _per_query(queries, **options):
+    """Top-1 careers (classifier only) and mean milliseconds per query"""
+    model_loader.clear_token_cache()
+    careers = []
+    start = time.perf_counter()
+    for query in queries:
+        results = model_loader.get_career_recommendations_batch([query], top_k=1, use_hybrid=False, **options)
+        careers.append(results[0][0]['career'])
+    return careers, (time.perf_counter() - start) * 1000 / len(queries)
+
+def _full_length(queries, max_length=512):
+    """Top-1 careers and ms per query with the classifier run on the whole input"""
+    classes = model_loader._label_encoder.classes_
+    model_loader.clear_token_cache()
+    careers = []
+    start = time.perf_counter()
+    for query in queries:
+        encoding = model_loader.tokenize_queries([query], max_length=max_length)
+        with torch.no_grad():
+            logits = model_loader._model(encoding['input_ids'], encoding['attention_mask'])
+        careers.append(classes[int(logits.argmax(dim=1)[0])])
+    return careers, (time.perf_counter() - start) * 1000 / len(queries)
+
+def run(profiles=32, description_tokens=400):
+    """
+    Run the long input benchmark
+
+    Args:
+        profiles: Profiles scored per strategy
+        description_tokens: Minimum description length in tokens
+
+    Returns:
+        Per strategy: mean milliseconds per query, share of queries whose
+        structured fields fit in the classifier input, and top-1 agreement
+        with the 512-token classifier
+    """
+    if not model_loader.load_model():
+        raise RuntimeError("Model not available - set CAREER_MODEL_DIR")
+    model_loader.get_career_recommendations_batch(["warm up"], use_hybrid=False)
+
+    samples = _profiles(profiles, description_tokens)
+    reference, reference_ms = _full_length([
+        model_loader.build_enhanced_query(*profile, layout="appended") for profile in samples
+    ])
+    results = {
+        'profiles': profiles,
+        'full_512': {'ms_per_query': round(reference_ms, 2)},
+    }
+
+    strategies = {
+        'appended_truncate': ("appended", "truncate"),
+        'fit_truncate': ("fit", "truncate"),
+        'fit_window': ("fit", "window"),
+    }
+    for name, (layout, long_inputs) in strategies.items():
+        queries = [model_loader.build_enhanced_query(*profile, layout=layout) for profile in samples]
+        careers, ms = _per_query(queries, long_inputs=long_inputs)
+        # The fields end with the education; they reach the classifier when
+        # the text up to there fits in MAX_LENGTH tokens
+        kept = 0
+        for query, (_, _, _, education) in zip(queries, samples):
+            end = query.index("Education: ") + len(f"Education: {education}.")
+            kept += len(model_loader._tokenizer(query[:end])['input_ids']) <= model_loader.MAX_LENGTH
+        results[name] = {
+            'ms_per_query': round(ms, 2),
+            'fields_kept': round(kept / len(samples), 3) if long_inputs == "truncate" else 1.0,
+            'agreement_with_512': round(sum(c == r for c, r in zip(careers, reference)) / len(samples), 3),
+        }
+    return results
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,61 @@
+"""
+Catalog Lookup Benchmark
+Measures the per-call cost of the static catalog lookups the app makes on
+every rerun (resources, salaries, roadmaps, books, career payloads)
+"""
+
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "streamlit_app"))
+
+from utils.books_recommender import recommend_books, search_books
+from utils.career_payload import clear_payload_cache, get_career_payload
+from utils.resource_finder import get_learning_resources, get_salary_info
+from utils.roadmap_fetcher import fetch_career_roadmap
+
+# Exact catalog names, a partial match and an unknown career (fallback path)
+CAREERS = ["Data Scientist", "Backend Developer", "ML Engineer", "Underwater Basket Weaver"]
+
+# Book searches: title word, author, description word, no match
+BOOK_QUERIES = ["python", "Martin Fowler", "distributed", "zzz-no-match"]
+
+def _per_call_us(func, args_list, number, repeat):
+    """Best-of-repeat microseconds per call, averaged over args_list"""
+    def calls():
+        for args in args_list:
+            func(*args)
+    best = min(timeit.Timer(calls).repeat(repeat=repeat, number=number))
+    return round(best / (number * len(args_list)) * 1e6, 4)
+
+def run(number=500, repeat=5):
+    """
+    Run the catalog lookup benchmark
+
+    Args:
+        number: Passes over the inputs per timing sample
+        repeat: Timing samples (best is reported)
+
+    Returns:
+        Dictionary of per-call timings in microseconds
+    """
+    careers = [(c,) for c in CAREERS]
+    results = {
+        'learning_resources_us': _per_call_us(get_learning_resources, careers, number, repeat),
+        'salary_info_us': _per_call_us(get_salary_info, careers, number, repeat),
+        'fetch_roadmap_us': _per_call_us(fetch_career_roadmap, careers, number, repeat),
+        'recommend_books_us': _per_call_us(recommend_books, careers, number, repeat),
+        'search_books_us': _per_call_us(search_books, [(q,) for q in BOOK_QUERIES], number, repeat),
+    }
+
+    clear_payload_cache()
+    cold = timeit.Timer(lambda: [get_career_payload(c) for c in CAREERS]).timeit(number=1)
+    results['career_payload_cold_us'] = round(cold / len(CAREERS) * 1e6, 4)
+    results['career_payload_warm_us'] = _per_call_us(get_career_payload, careers, number, repeat)
+
+    return results
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,92 @@
+"""
+Model Benchmark
+Measures load_model time, single-query latency and batch throughput of the
+recommendation pipeline
+
+Uses the model in CAREER_MODEL_DIR (run_benchmarks.py points it at the
+offline fixture).
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "streamlit_app"))
+
+from utils import model_loader
+
+from timing import latency_summary, sample
+
+QUERIES = [
+    "I love analyzing data and building machine learning models with Python",
+    "I enjoy creating user interfaces with React, CSS and JavaScript",
+    "I automate deployments with Docker, Kubernetes and CI/CD pipelines",
+    "I design APIs and databases for backend services",
+    "I protect networks and run penetration tests",
+    "I build cross-platform mobile apps with Flutter",
+    "I manage cloud infrastructure on AWS with Terraform",
+    "I write clean, tested software in Java and C++",
+]
+
+def _unique_queries(count):
+    """Distinct queries, so the token cache does not hide tokenization cost"""
+    return [
+        model_loader.build_enhanced_query(QUERIES[i % len(QUERIES)], ["Python"], "Intermediate", f"Profile {i}")
+        for i in range(count)
+    ]
+
+def run(iterations=50, batch_queries=256, batch_size=32):
+    """
+    Run the model benchmark
+
+    Args:
+        iterations: Timed single-query calls (per mode)
+        batch_queries: Queries scored for the throughput measurement
+        batch_size: Queries per forward pass in batch mode
+
+    Returns:
+        Dictionary of load time, latency percentiles and throughput
+    """
+    start = time.perf_counter()
+    if not model_loader.load_model():
+        raise RuntimeError("Model not available - set CAREER_MODEL_DIR")
+    load_s = time.perf_counter() - start
+
+    results = {'load_model_s': round(load_s, 4)}
+
+    # Repeated query: served from the token cache after the first call
+    query = QUERIES[0]
+    hybrid = sample(lambda: model_loader.get_career_recommendations(query, top_k=5), iterations)
+    results.update({f'single_hybrid_{k}': v for k, v in latency_summary(hybrid).items()})
+
+    model_only = sample(lambda: model_loader.get_career_recommendations(query, top_k=5, use_hybrid=False), iterations)
+    results.update({f'single_model_only_{k}': v for k, v in latency_summary(model_only).items()})
+
+    # Fresh queries: includes tokenization
+    fresh = iter(_unique_queries(iterations + 3))
+    uncached = sample(lambda: model_loader.get_career_recommendations(next(fresh), top_k=5), iterations)
+    results.update({f'single_uncached_{k}': v for k, v in latency_summary(uncached).items()})
+
+    # Per-stage breakdown for one uncached query
+    timings = {}
+    model_loader.get_career_recommendations(_unique_queries(1)[0] + " stage breakdown", timings=timings)
+    results.update({f'stage_{stage}_ms': round(ms, 4) for stage, ms in timings.items()})
+
+    queries = _unique_queries(batch_queries)
+    model_loader.clear_token_cache()
+    start = time.perf_counter()
+    model_loader.get_career_recommendations_batch(queries, top_k=5, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+    results['batch_queries_per_sec'] = round(batch_queries / elapsed, 2)
+
+    start = time.perf_counter()
+    for q in queries[:batch_size]:
+        model_loader.get_career_recommendations(q + " loop", top_k=5)
+    elapsed = time.perf_counter() - start
+    results['loop_queries_per_sec'] = round(batch_size / elapsed, 2)
+
+    return results
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,78 @@
+"""
+OpenRouter Client Benchmark
+Measures the client-side overhead of OpenRouterAgent calls (prompt building,
+skills gap, JSON and HTTP handling) against a local stub server, compared to
+a bare requests.post of the same payload
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import requests
+
+sys.path.append(str(Path(__file__).parent.parent / "streamlit_app"))
+
+from utils.openrouter_agent import StreamingOpenRouterAgent
+
+from fixtures import OpenRouterStub
+from timing import latency_summary, sample
+
+SKILLS = ["Python", "SQL", "Pandas", "Git"]
+
+def run(iterations=100):
+    """
+    Run the OpenRouter client benchmark
+
+    Args:
+        iterations: Timed calls per method
+
+    Returns:
+        Dictionary of latency percentiles per call type and the client overhead
+        over a bare HTTP round trip
+    """
+    results = {}
+
+    with OpenRouterStub() as stub:
+        agent = StreamingOpenRouterAgent(api_key="bench-key")
+        agent.base_url = stub.url
+
+        payload = {
+            "model": agent.model,
+            "messages": [
+                {"role": "system", "content": agent.system_prompt},
+                {"role": "user", "content": "How do I become a data scientist?"}
+            ],
+            "temperature": 0.7,
+            "max_tokens": 1000
+        }
+
+        def raw_post():
+            response = requests.post(stub.url, headers=agent.headers, json=payload, timeout=60)
+            response.raise_for_status()
+            return response.json()['choices'][0]['message']['content']
+
+        calls = {
+            'raw_post': raw_post,
+            'career_advice': lambda: agent.get_career_advice("How do I become a data scientist?"),
+            'interview_questions': lambda: agent.generate_interview_questions("Data Scientist"),
+            'learning_plan': lambda: agent.create_learning_plan(
+                "Data Analyst", "Data Scientist", current_skills=SKILLS
+            ),
+            'stream_advice': lambda: "".join(agent.stream_career_advice("How do I become a data scientist?")),
+        }
+
+        for name, func in calls.items():
+            results.update({
+                f'{name}_{k}': v for k, v in latency_summary(sample(func, iterations)).items()
+            })
+
+        results['requests_served'] = stub.requests
+
+    results['career_advice_overhead_ms'] = round(
+        results['career_advice_p50_ms'] - results['raw_post_p50_ms'], 4
+    )
+    return results
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
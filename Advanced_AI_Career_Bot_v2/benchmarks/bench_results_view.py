@@ -0,0 +1,109 @@
+"""
+Results View Benchmark
+Measures the per-rerun cost of assembling five career cards, comparing the
+original per-card lookups against the memoized career payloads
+"""
+
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "streamlit_app"))
+
+from utils.resource_finder import get_learning_resources, get_salary_info
+from utils.career_payload import get_career_payloads, clear_payload_cache
+
+# Five recommendations as they would appear on screen
+RECOMMENDATIONS = [
+    {'career': 'Data Scientist', 'confidence': 91.2},
+    {'career': 'Machine Learning Engineer', 'confidence': 84.5},
+    {'career': 'Backend Developer', 'confidence': 61.0},
+    {'career': 'Full Stack Developer', 'confidence': 47.3},
+    {'career': 'Mobile Developer', 'confidence': 22.8},
+]
+
+class _ElementSink:
+    """Collects rendered elements the way st.markdown/st.metric would receive them"""
+
+    def __init__(self):
+        self.elements = []
+
+    def markdown(self, body):
+        self.elements.append(body)
+
+    def metric(self, label, value):
+        self.elements.append((label, value))
+
+def render_uncached(recommendations, st):
+    """Original results view: lookups and per-line markdown on every rerun"""
+    for i, rec in enumerate(recommendations, 1):
+        st.markdown(f"#{i} {rec['career']} Confidence: {rec['confidence']:.1f}%")
+
+        resources = get_learning_resources(rec['career'])
+        if resources['courses']:
+            st.markdown("**Recommended Courses:**")
+            for course in resources['courses'][:3]:
+                st.markdown(f"- {course}")
+        if resources['certifications']:
+            st.markdown("**Certifications:**")
+            for cert in resources['certifications'][:2]:
+                st.markdown(f"- {cert}")
+
+        salary_info = get_salary_info(rec['career'])
+        st.metric("Entry Level", salary_info['entry'])
+        st.metric("Mid Level", salary_info['mid'])
+        st.metric("Senior Level", salary_info['senior'])
+
+def render_payloads(recommendations, st):
+    """Payload results view: one cache lookup per card, pre-rendered markdown"""
+    payloads = get_career_payloads([rec['career'] for rec in recommendations])
+    for i, (rec, payload) in enumerate(zip(recommendations, payloads), 1):
+        st.markdown(f"#{i} {rec['career']} Confidence: {rec['confidence']:.1f}%")
+        if payload['resources_md']:
+            st.markdown(payload['resources_md'])
+        if payload['books_md']:
+            st.markdown("**Top Books:**\n" + payload['books_md'])
+        st.markdown(payload['roadmap_url'])
+
+        salary_info = payload['salary']
+        st.metric("Entry Level", salary_info['entry'])
+        st.metric("Mid Level", salary_info['mid'])
+        st.metric("Senior Level", salary_info['senior'])
+
+def _per_rerun_us(func, number, repeat):
+    """Best-of-repeat time per rerun in microseconds"""
+    timer = timeit.Timer(lambda: func(RECOMMENDATIONS, _ElementSink()))
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+def run(number=2000, repeat=5):
+    """
+    Run the results view benchmark
+
+    Args:
+        number: Reruns per timing sample
+        repeat: Timing samples (best is reported)
+
+    Returns:
+        Dictionary of per-rerun timings in microseconds
+    """
+    clear_payload_cache()
+    cold_timer = timeit.Timer(lambda: render_payloads(RECOMMENDATIONS, _ElementSink()))
+    cold_us = cold_timer.timeit(number=1) * 1e6
+
+    uncached_sink = _ElementSink()
+    render_uncached(RECOMMENDATIONS, uncached_sink)
+    payload_sink = _ElementSink()
+    render_payloads(RECOMMENDATIONS, payload_sink)
+
+    return {
+        'results_on_screen': len(RECOMMENDATIONS),
+        'uncached_rerun_us': _per_rerun_us(render_uncached, number, repeat),
+        'payload_cold_rerun_us': cold_us,
+        'payload_warm_rerun_us': _per_rerun_us(render_payloads, number, repeat),
+        'uncached_elements': len(uncached_sink.elements),
+        'payload_elements': len(payload_sink.elements),
+    }
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,115 @@
+"""
+Resume Pipeline Benchmark
+Measures the local resume pipeline on long synthetic resumes: skill
+matching with the Aho-Corasick matcher against one regex search per
+vocabulary skill (for the bundled vocabulary and a large synthetic one),
+batched against per-resume model scoring, and the size of the
+analyze_resume prompt with the compact summary against the full text
+
+Uses the model in CAREER_MODEL_DIR (run_benchmarks.py points it at the
+offline fixture) and a local OpenRouter stub.
+"""
+
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "streamlit_app"))
+
+from utils import model_loader
+from utils.openrouter_agent import OpenRouterAgent
+from utils.resume_pipeline import SkillMatcher, _normalize, extract_resume, get_skill_matcher, resume_query, score_resumes
+from utils.skill_gap import load_skills_mapping, mentions
+from utils.training_data import load_corpus
+
+from fixtures import OpenRouterStub
+
+def _resume(lines, seed=0):
+    """Resume with the usual sections, filled with dataset texts and skills"""
+    rng = random.Random(seed)
+    texts = [sample['text'] for sample in load_corpus()]
+    skills = sorted({skill for values in load_skills_mapping().values() for skill in values})
+    parts = [
+        "Alex Example", "alex@example.com | +1 555 0100", "",
+        "Summary", f"Engineer with {rng.randint(1, 15)} years of experience. {rng.choice(texts)}", "",
+        "Work Experience",
+    ]
+    for _ in range(lines):
+        parts.append(f"- {rng.choice(texts)} Used {', '.join(rng.sample(skills, 2))}.")
+    parts += ["", "Education", "B.Sc. in Computer Science, Example University", "",
+              "Skills: " + ", ".join(rng.sample(skills, 8))]
+    return "\n".join(parts)
+
+def _ms(func, repeat):
+    """Mean milliseconds per call of func"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+def _match_ms(text, vocabulary, repeat):
+    """Milliseconds to find the vocabulary's skills in text, per strategy"""
+    matcher = SkillMatcher(vocabulary)
+    lines = [_normalize(line) for line in text.splitlines()]
+    normalized = _normalize(text)
+    return {
+        'matcher_ms': round(_ms(lambda: [list(matcher.find(line)) for line in lines], repeat), 3),
+        'regex_per_skill_ms': round(_ms(lambda: [s for s in vocabulary if mentions(s, normalized)], repeat), 3),
+    }
+
+def run(resume_lines=200, resumes=16, repeat=5, large_vocabulary=2000):
+    """
+    Run the resume pipeline benchmark
+
+    Args:
+        resume_lines: Experience lines per synthetic resume
+        resumes: Resumes scored in the batch measurement
+        repeat: Repetitions of the extraction timings
+        large_vocabulary: Synthetic skills added for the scaling measurement
+
+    Returns:
+        Milliseconds of the whole extraction and of skill matching alone
+        (matcher and per-skill regex, for both vocabularies),
+        scoring milliseconds per resume (one batch and one call per
+        resume), and analyze_resume prompt characters (compact and full)
+    """
+    if not model_loader.load_model():
+        raise RuntimeError("Model not available - set CAREER_MODEL_DIR")
+
+    text = _resume(resume_lines)
+    vocabulary = list(get_skill_matcher().names.values())
+    results = {'resume_chars': len(text), 'vocabulary': len(vocabulary)}
+
+    results['extract_ms'] = round(_ms(lambda: extract_resume(text), repeat), 3)
+    results['bundled_vocabulary'] = _match_ms(text, vocabulary, repeat)
+    rng = random.Random(0)
+    synthetic = ["".join(rng.choice("abcdefghijklmnop") for _ in range(rng.randint(4, 12)))
+                 for _ in range(large_vocabulary)]
+    results['large_vocabulary'] = _match_ms(text, vocabulary + synthetic, 1)
+
+    batch = [_resume(resume_lines, seed=i) for i in range(resumes)]
+    score_resumes(batch[:1])  # warm up
+    model_loader.clear_token_cache()
+    results['batched_score_ms_per_resume'] = round(_ms(lambda: score_resumes(batch), 1) / resumes, 2)
+    model_loader.clear_token_cache()
+    results['single_score_ms_per_resume'] = round(_ms(
+        lambda: [model_loader.get_career_recommendations(resume_query(extract_resume(r))) for r in batch], 1
+    ) / resumes, 2)
+
+    prompts = []
+    with OpenRouterStub() as stub:
+        agent = OpenRouterAgent(api_key="bench-key")
+        agent.base_url = stub.url
+        advice = agent.get_career_advice
+        agent.get_career_advice = lambda prompt, **kwargs: (prompts.append(prompt), advice(prompt, **kwargs))[1]
+        agent.analyze_resume(text, "Data Scientist")
+        agent.analyze_resume(text, "Data Scientist", full_text=True)
+    results['compact_prompt_chars'] = len(prompts[0])
+    results['full_prompt_chars'] = len(prompts[1])
+    results['prompt_reduction'] = round(1 - len(prompts[0]) / len(prompts[1]), 3)
+    return results
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,76 @@
+"""
+Scoring Pool Scaling Benchmark
+Measures batch scoring throughput and per-worker memory for 1..N forked
+workers sharing one loaded model
+
+Uses the model in CAREER_MODEL_DIR (default: streamlit_app/models).
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "streamlit_app"))
+
+from utils import model_loader
+from utils.scoring_pool import ScoringPool, process_memory
+
+QUERIES = [
+    "I love analyzing data and building machine learning models with Python",
+    "I enjoy creating user interfaces with React, CSS and JavaScript",
+    "I automate deployments with Docker, Kubernetes and CI/CD pipelines",
+    "I design APIs and databases for backend services",
+    "I protect networks and run penetration tests",
+    "I build cross-platform mobile apps with Flutter",
+    "I manage cloud infrastructure on AWS with Terraform",
+    "I write clean, tested software in Java and C++",
+]
+
+def run(max_workers=None, num_queries=512, chunk_size=16):
+    """
+    Run the scaling benchmark
+
+    Args:
+        max_workers: Largest pool size to test (default: cpu_count)
+        num_queries: Queries scored per pool size
+        chunk_size: Queries per worker task
+
+    Returns:
+        Dictionary with parent memory and one result per pool size
+    """
+    if model_loader._model is None and not model_loader.load_model():
+        raise RuntimeError("Model not available - set CAREER_MODEL_DIR")
+
+    max_workers = max_workers or os.cpu_count() or 1
+    queries = [QUERIES[i % len(QUERIES)] for i in range(num_queries)]
+    results = []
+
+    for workers in range(1, max_workers + 1):
+        with ScoringPool(workers, chunk_size=chunk_size) as pool:
+            pool.score(queries[:chunk_size * workers])  # warm up every worker
+
+            start = time.perf_counter()
+            pool.score(queries)
+            elapsed = time.perf_counter() - start
+
+            memory = [process_memory(pid) for pid in pool.worker_pids()]
+
+        results.append({
+            'workers': workers,
+            'threads_per_worker': pool.threads_per_worker,
+            'queries_per_sec': round(num_queries / elapsed, 1),
+            'worker_rss_kb': [m['rss_kb'] for m in memory],
+            'worker_pss_kb': [m['pss_kb'] for m in memory],
+        })
+
+    return {
+        'num_queries': num_queries,
+        'parent': process_memory(os.getpid()),
+        'pools': results,
+    }
+
+if __name__ == "__main__":
+    workers_arg = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    print(json.dumps(run(max_workers=workers_arg), indent=2))
@@ -0,0 +1,98 @@
+"""
+Session Store Benchmark
+Measures saving and restoring a user's session (recommendations and chat
+history) with each session store backend, against recomputing the
+recommendations from scratch as a worker without the session must do
+
+Uses the model in CAREER_MODEL_DIR (run_benchmarks.py points it at the
+offline fixture).
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "streamlit_app"))
+
+from utils import model_loader
+from utils.chat_store import ChatStore
+from utils.session_store import (
+    MemorySessionStore, SQLiteSessionStore, RedisSessionStore, dumps, new_session_id
+)
+
+from fixtures import RedisStub
+from timing import latency_summary, sample
+
+PROFILE = "I love analyzing data and building machine learning models with Python"
+
+def _restore(store, session_id):
+    """What a fresh worker does for a returning session"""
+    recommendations = store.get(session_id, 'recommendations')
+    chat_store = store.get(session_id, 'chat_store')
+    if recommendations is None or chat_store is None:
+        raise RuntimeError("Session was not restored")
+    return recommendations, ChatStore.from_dict(chat_store, store=store)
+
+def _backend_results(store, recommendations, chat_store, iterations):
+    session_id = new_session_id()
+    store.set(session_id, 'recommendations', recommendations)
+
+    save = sample(lambda: store.set(session_id, 'chat_store', chat_store.to_dict()), iterations)
+    restore = sample(lambda: _restore(store, session_id), iterations)
+    return {
+        'save_p50_ms': latency_summary(save)['p50_ms'],
+        'restore_p50_ms': latency_summary(restore)['p50_ms'],
+        'restore_p95_ms': latency_summary(restore)['p95_ms'],
+    }
+
+def run(iterations=50, chat_messages=50, redis_latency=0.0005):
+    """
+    Run the session store benchmark
+
+    Args:
+        iterations: Timed saves/restores per backend
+        chat_messages: Messages in the saved chat history
+        redis_latency: Simulated network round trip to the Redis stand-in (seconds)
+
+    Returns:
+        Serialized session size, save/restore latency per backend and the
+        latency of recomputing the recommendations instead
+    """
+    if not model_loader.load_model():
+        raise RuntimeError("Model not available - set CAREER_MODEL_DIR")
+
+    # Distinct profiles, so recomputation is never served from a cache
+    profiles = iter([
+        model_loader.build_enhanced_query(PROFILE, ["Python"], "Intermediate", f"Profile {i}")
+        for i in range(iterations + 3)
+    ])
+    recompute = sample(lambda: model_loader.get_career_recommendations(next(profiles), top_k=5), iterations)
+    recommendations = model_loader.get_career_recommendations(PROFILE, top_k=5)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, RedisStub(latency=redis_latency) as redis:
+        chat_store = ChatStore(db_path=Path(tmp) / "chat_history.db")
+        for i in range(chat_messages):
+            chat_store.append("user" if i % 2 == 0 else "assistant", f"Message {i}: " + PROFILE * 3)
+
+        results['session_json_bytes'] = len(dumps(recommendations)[1:]) + len(json.dumps(chat_store.to_dict()))
+        results['session_stored_bytes'] = len(dumps(recommendations)) + len(dumps(chat_store.to_dict()))
+
+        backends = {
+            'memory': MemorySessionStore(),
+            'sqlite': SQLiteSessionStore(Path(tmp) / "sessions.db"),
+            'redis': RedisSessionStore(redis.url),
+        }
+        for name, store in backends.items():
+            results[name] = _backend_results(store, recommendations, chat_store, iterations)
+
+    recompute_p50 = latency_summary(recompute)['p50_ms']
+    results['recompute_p50_ms'] = recompute_p50
+    for name in backends:
+        results[name]['speedup_vs_recompute'] = round(recompute_p50 / results[name]['restore_p50_ms'], 1)
+
+    return results
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,119 @@
+"""
+Request Coalescing Benchmark
+Fires bursts of identical concurrent requests (interview questions for a
+popular career, recommendations for the same profile) and compares the work
+done with and without single-flight coalescing
+
+Uses the model in CAREER_MODEL_DIR (run_benchmarks.py points it at the
+offline fixture).
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "streamlit_app"))
+
+from utils import model_loader
+from utils.openrouter_agent import OpenRouterAgent, _completion_flight
+
+from fixtures import OpenRouterStub
+
+PROFILE = "I love analyzing data and building machine learning models with Python"
+
+def _burst(func, callers):
+    """Start `callers` threads calling func(i) at the same moment; returns wall seconds"""
+    barrier = threading.Barrier(callers)
+
+    def call(i):
+        barrier.wait()
+        func(i)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+def _llm(callers, llm_latency):
+    results = {}
+    with OpenRouterStub(latency=llm_latency) as stub:
+        # Sessions sharing one key (e.g., a deployment-wide OPENROUTER_API_KEY)
+        agents = [OpenRouterAgent(api_key="shared-key") for _ in range(callers)]
+        users = [OpenRouterAgent(api_key=f"user-{i}") for i in range(callers)]
+        for agent in agents + users:
+            agent.base_url = stub.url
+
+        # One session per thread, all asking for the same questions
+        _completion_flight.reset_stats()
+        coalesced_s = _burst(lambda i: agents[i].generate_interview_questions("Software Engineer"), callers)
+        results['coalesced_requests'] = stub.requests
+        results['coalesced_calls'] = _completion_flight.stats()['coalesced']
+        results['coalesced_wall_s'] = round(coalesced_s, 4)
+
+        # Users with their own keys never share a request
+        stub.requests = 0
+        _burst(lambda i: users[i].generate_interview_questions("Data Scientist"), callers)
+        results['own_key_requests'] = stub.requests
+
+        prompt = "Generate 10 technical questions for a Software Engineer interview."
+        payload = {
+            "model": agents[0].model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.7,
+            "max_tokens": 2000
+        }
+        stub.requests = 0
+        separate_s = _burst(lambda i: agents[i]._complete(payload), callers)
+        results['separate_requests'] = stub.requests
+        results['separate_wall_s'] = round(separate_s, 4)
+
+    return results
+
+def _recommendations(callers):
+    flight = model_loader._recommendation_flight
+    flight.reset_stats()
+    coalesced_s = _burst(lambda i: model_loader.get_career_recommendations(PROFILE, top_k=5), callers)
+    stats = flight.stats()
+
+    separate_s = _burst(
+        lambda i: model_loader.get_career_recommendations_batch([PROFILE], top_k=5)[0],
+        callers
+    )
+    return {
+        'coalesced_inferences': stats['executions'],
+        'coalesced_calls': stats['coalesced'],
+        'coalesced_wall_s': round(coalesced_s, 4),
+        'separate_inferences': callers,
+        'separate_wall_s': round(separate_s, 4),
+    }
+
+def run(callers=16, llm_latency=0.2):
+    """
+    Run the coalescing benchmark
+
+    Args:
+        callers: Concurrent identical requests per burst
+        llm_latency: Simulated OpenRouter response time in seconds
+
+    Returns:
+        Upstream requests / inferences and wall time per burst, with and
+        without coalescing
+    """
+    if not model_loader.load_model():
+        raise RuntimeError("Model not available - set CAREER_MODEL_DIR")
+    # Warm up tokenizer and model so the bursts compare steady-state work
+    model_loader.get_career_recommendations_batch([PROFILE], top_k=5)
+
+    return {
+        'callers': callers,
+        'llm': _llm(callers, llm_latency),
+        'recommendations': _recommendations(callers),
+    }
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
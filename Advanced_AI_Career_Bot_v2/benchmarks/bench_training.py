@@ -0,0 +1,118 @@
+"""
+Training Epoch Benchmark
+Times one CPU training epoch of the career classifier with three input
+pipelines: the notebook's per-item tokenization padded to max_length,
+pre-tokenized shuffled batches padded to their longest sample, and
+pre-tokenized length-bucketed batches. Also times frozen-backbone training:
+encoding the corpus once (fresh and cached) and one epoch of the head alone.
+
+The bundled datasets are short and uniform; a share of the samples joins
+several of them into job-description-length texts so batches mix lengths as
+with the full job descriptions dataset. Uses the encoder of the model in
+CAREER_MODEL_DIR (run_benchmarks.py points it at the offline fixture).
+"""
+
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "streamlit_app"))
+
+import torch
+import torch.nn as nn
+from torch.utils.data import DataLoader
+from transformers import AutoTokenizer, get_linear_schedule_with_warmup
+
+from utils import model_loader
+from utils.trainer import TRAIN_CONFIG, encode_features, make_loader, train_epoch, train_head
+from utils.training_data import TokenizedDataset, load_corpus, make_collate, pretokenize
+
+from bench_training_data import _PerItemDataset
+
+def _corpus(samples, long_fraction, seed=0):
+    """Bundled samples repeated to `samples`, some joined into long texts"""
+    rng = random.Random(seed)
+    corpus = load_corpus()
+    roles = sorted(set(sample['role'] for sample in corpus))
+    texts, labels = [], []
+    for i in range(samples):
+        sample = corpus[i % len(corpus)]
+        text = sample['text']
+        if rng.random() < long_fraction:
+            same_role = [s['text'] for s in corpus if s['role'] == sample['role']]
+            others = rng.sample([s['text'] for s in corpus], 4)
+            text = " ".join(same_role + others)
+        texts.append(text)
+        labels.append(roles.index(sample['role']))
+    return texts, labels, len(roles)
+
+def _epoch(base_model, num_classes, loader):
+    torch.manual_seed(0)
+    model = model_loader.CareerClassifier(base_model, num_classes, TRAIN_CONFIG['hidden_dim'], TRAIN_CONFIG['dropout'])
+    optimizer = torch.optim.AdamW(model.parameters(), lr=TRAIN_CONFIG['learning_rate'])
+    scheduler = get_linear_schedule_with_warmup(optimizer, 0, len(loader))
+    stats = train_epoch(model, loader, optimizer, scheduler, nn.CrossEntropyLoss(), accumulation_steps=1)
+    return {
+        'epoch_s': round(stats['seconds'], 4),
+        'padded_tokens': stats['padded_tokens'],
+        'padding_share': round(1 - stats['real_tokens'] / stats['padded_tokens'], 3),
+    }
+
+def _frozen(base_model, num_classes, corpus, labels, collate_fn, batch_size):
+    model = model_loader.CareerClassifier(base_model, num_classes, TRAIN_CONFIG['hidden_dim'], TRAIN_CONFIG['dropout'])
+    results = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for key in ('feature_s', 'cached_feature_s'):
+            start = time.perf_counter()
+            features = encode_features(model.base_model, corpus, collate_fn, batch_size, cache_dir=cache_dir)
+            results[key] = round(time.perf_counter() - start, 4)
+
+    config = {**TRAIN_CONFIG, 'batch_size': batch_size, 'head_epochs': 1}
+    indices = list(range(len(labels)))
+    history, _ = train_head(model, features, labels, indices, [], config)
+    results['head_epoch_s'] = round(history[0]['train_seconds'], 4)
+    return results
+
+def run(samples=1024, batch_size=32, max_length=128, long_fraction=0.25):
+    """
+    Run the training epoch benchmark
+
+    Args:
+        samples: Training samples per epoch
+        batch_size: Samples per batch
+        max_length: Truncation length
+        long_fraction: Share of samples joined into long texts
+
+    Returns:
+        Epoch time, padded tokens and padding share per pipeline, the epoch
+        speedups over the notebook pipeline, and frozen-backbone timings
+    """
+    with open(model_loader.METADATA_PATH, 'r') as f:
+        base_model = json.load(f)['model_config']['base_model']
+    tokenizer = AutoTokenizer.from_pretrained(base_model)
+    texts, labels, num_classes = _corpus(samples, long_fraction)
+
+    results = {'samples': samples, 'threads': torch.get_num_threads()}
+
+    per_item = DataLoader(_PerItemDataset(texts, labels, tokenizer, max_length), batch_size=batch_size, shuffle=True)
+    results['notebook'] = _epoch(base_model, num_classes, per_item)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        corpus = pretokenize(texts, tokenizer, max_length, cache_dir=cache_dir)
+        dataset = TokenizedDataset(corpus, labels)
+        collate_fn = make_collate(tokenizer)
+        for sampler, name in (('random', 'dynamic_padding'), ('bucket', 'bucketed')):
+            loader = make_loader(dataset, collate_fn, batch_size, shuffle=True, sampler=sampler)
+            results[name] = _epoch(base_model, num_classes, loader)
+        results['frozen_backbone'] = _frozen(base_model, num_classes, corpus, labels, collate_fn, batch_size)
+
+    notebook_s = results['notebook']['epoch_s']
+    results['dynamic_padding_speedup'] = round(notebook_s / results['dynamic_padding']['epoch_s'], 2)
+    results['bucketed_speedup'] = round(notebook_s / results['bucketed']['epoch_s'], 2)
+    return results
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,116 @@
+"""
+Training Data Benchmark
+Measures one epoch of the training input pipeline (no model): the notebook's
+per-item tokenization padded to max_length against the cached pre-tokenized
+corpus with per-batch dynamic padding
+
+Uses the tokenizer of the model in CAREER_MODEL_DIR (run_benchmarks.py points
+it at the offline fixture).
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "streamlit_app"))
+
+import torch
+from torch.utils.data import DataLoader, Dataset
+from transformers import AutoTokenizer
+
+from utils import model_loader
+from utils.training_data import TokenizedDataset, load_corpus, make_collate, pretokenize
+
+class _PerItemDataset(Dataset):
+    """The notebook's CareerDataset: tokenizes and pads every item on every epoch"""
+
+    def __init__(self, texts, labels, tokenizer, max_length):
+        self.texts = texts
+        self.labels = labels
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __getitem__(self, idx):
+        encoding = self.tokenizer(
+            str(self.texts[idx]),
+            add_special_tokens=True,
+            max_length=self.max_length,
+            padding='max_length',
+            truncation=True,
+            return_tensors='pt'
+        )
+        return {
+            'input_ids': encoding['input_ids'].flatten(),
+            'attention_mask': encoding['attention_mask'].flatten(),
+            'label': torch.tensor(self.labels[idx], dtype=torch.long)
+        }
+
+def _epoch_seconds(loader):
+    """Iterate a DataLoader once; returns (seconds, padded tokens produced)"""
+    start = time.perf_counter()
+    tokens = 0
+    for batch in loader:
+        tokens += batch['input_ids'].numel()
+    return time.perf_counter() - start, tokens
+
+def run(samples=4096, batch_size=32, max_length=128, epochs=3):
+    """
+    Run the training data benchmark
+
+    Args:
+        samples: Corpus size (the bundled datasets are repeated to reach it)
+        batch_size: Samples per batch
+        max_length: Truncation length
+        epochs: Epochs timed per pipeline (the mean is reported)
+
+    Returns:
+        Per-epoch input pipeline time and padded tokens for both pipelines,
+        plus the one-off pre-tokenization and cached load times
+    """
+    with open(model_loader.METADATA_PATH, 'r') as f:
+        base_model = json.load(f)['model_config']['base_model']
+    tokenizer = AutoTokenizer.from_pretrained(base_model)
+
+    corpus = load_corpus()
+    roles = sorted(set(sample['role'] for sample in corpus))
+    repeat = -(-samples // len(corpus))
+    texts = [sample['text'] for sample in corpus * repeat][:samples]
+    labels = [roles.index(sample['role']) for sample in corpus * repeat][:samples]
+
+    results = {'samples': len(texts)}
+
+    per_item = DataLoader(_PerItemDataset(texts, labels, tokenizer, max_length), batch_size=batch_size, shuffle=True)
+    timings = [_epoch_seconds(per_item) for _ in range(epochs)]
+    results['per_item_epoch_s'] = round(sum(t for t, _ in timings) / epochs, 4)
+    results['per_item_padded_tokens'] = timings[0][1]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        start = time.perf_counter()
+        pretokenize(texts, tokenizer, max_length, cache_dir=cache_dir)
+        results['pretokenize_s'] = round(time.perf_counter() - start, 4)
+
+        start = time.perf_counter()
+        tokenized = pretokenize(texts, tokenizer, max_length, cache_dir=cache_dir)
+        results['cached_load_s'] = round(time.perf_counter() - start, 4)
+
+        loader = DataLoader(
+            TokenizedDataset(tokenized, labels),
+            batch_size=batch_size,
+            shuffle=True,
+            collate_fn=make_collate(tokenizer)
+        )
+        timings = [_epoch_seconds(loader) for _ in range(epochs)]
+        results['pretokenized_epoch_s'] = round(sum(t for t, _ in timings) / epochs, 4)
+        results['pretokenized_padded_tokens'] = timings[0][1]
+        results['cache_bytes'] = int(tokenized.ids.nbytes + tokenized.offsets.nbytes)
+
+    results['epoch_speedup'] = round(results['per_item_epoch_s'] / results['pretokenized_epoch_s'], 1)
+    return results
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
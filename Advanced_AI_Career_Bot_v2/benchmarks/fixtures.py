@@ -0,0 +1,328 @@
+"""
+Benchmark Fixtures - Offline model, OpenRouter and Redis stand-ins
+Builds a tiny randomly initialized MiniLM-shaped model in the same layout
+load_model() reads, serves canned OpenRouter responses locally and runs a
+minimal in-process Redis-protocol server for the session store
+"""
+
+import csv
+import json
+import pickle
+import re
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import StreamRequestHandler, ThreadingTCPServer
+from pathlib import Path
+from typing import Dict, Optional
+
+STREAMLIT_APP_DIR = Path(__file__).parent.parent / "streamlit_app"
+DATASETS_DIR = STREAMLIT_APP_DIR / "datasets"
+
+sys.path.append(str(STREAMLIT_APP_DIR))
+
+# Default fixture location (outside the repo, reused across runs)
+DEFAULT_FIXTURE_DIR = Path(tempfile.gettempdir()) / "career_bot_bench_fixture"
+
+# Same shape as sentence-transformers/all-MiniLM-L6-v2
+MINILM_CONFIG = {
+    'hidden_size': 384,
+    'num_hidden_layers': 6,
+    'num_attention_heads': 12,
+    'intermediate_size': 1536,
+    'max_position_embeddings': 512
+}
+
+# Classifier head settings written to model_metadata.json
+HEAD_CONFIG = {
+    'max_length': 128,
+    'hidden_dim': 256,
+    'dropout': 0.3
+}
+
+SPECIAL_TOKENS = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+
+def _role_texts() -> Dict[str, list]:
+    """All dataset texts grouped by role"""
+    texts = {}
+    for csv_path in sorted(DATASETS_DIR.glob("*.csv")):
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                if not row.get('role'):
+                    continue
+                text = " ".join(v for k, v in row.items() if k != 'role' and v)
+                texts.setdefault(row['role'], []).append(text)
+    return texts
+
+def _build_vocab(texts: Dict[str, list]) -> list:
+    """Word-level WordPiece vocabulary covering the datasets"""
+    words = set()
+    for role_texts in texts.values():
+        for text in role_texts:
+            words.update(re.findall(r"\w+", text.lower()))
+
+    characters = list("abcdefghijklmnopqrstuvwxyz0123456789")
+    subwords = ["##" + c for c in characters]
+    punctuation = list(".,:;!?'\"()[]{}-/+&#%*")
+    return SPECIAL_TOKENS + sorted(words - set(characters)) + characters + subwords + punctuation
+
+def build_fixture(fixture_dir: Optional[Path] = None, seed: int = 0, force: bool = False) -> Path:
+    """
+    Build the offline benchmark model (once per fixture directory)
+
+    Args:
+        fixture_dir: Where to write base/ (the encoder) and models/ (app files)
+        seed: Random seed for weight initialization
+        force: Rebuild even if the fixture already exists
+
+    Returns:
+        Path of the models directory (use as CAREER_MODEL_DIR)
+    """
+    import numpy as np
+    import torch
+    from sentence_transformers import SentenceTransformer, models as st_models
+    from sklearn.preprocessing import LabelEncoder
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+
+    fixture_dir = Path(fixture_dir or DEFAULT_FIXTURE_DIR)
+    base_dir = fixture_dir / "base"
+    models_dir = fixture_dir / "models"
+    metadata_path = models_dir / "model_metadata.json"
+
+    if metadata_path.exists() and not force:
+        return models_dir
+
+    base_dir.mkdir(parents=True, exist_ok=True)
+    models_dir.mkdir(parents=True, exist_ok=True)
+
+    texts = _role_texts()
+    vocab = _build_vocab(texts)
+    (base_dir / "vocab.txt").write_text("\n".join(vocab), encoding='utf-8')
+
+    torch.manual_seed(seed)
+    tokenizer = BertTokenizerFast(vocab_file=str(base_dir / "vocab.txt"))
+    tokenizer.save_pretrained(base_dir)
+    BertModel(BertConfig(vocab_size=len(vocab), **MINILM_CONFIG)).save_pretrained(base_dir)
+
+    # Mean pooling + normalization, like all-MiniLM-L6-v2
+    transformer = st_models.Transformer(str(base_dir), max_seq_length=256)
+    pooling = st_models.Pooling(MINILM_CONFIG['hidden_size'], pooling_mode='mean')
+    sentence_model = SentenceTransformer(modules=[transformer, pooling, st_models.Normalize()])
+    sentence_model.save(str(base_dir))
+
+    # Import after the path setup above
+    from utils.model_loader import CareerClassifier
+
+    label_encoder = LabelEncoder().fit(sorted(texts))
+    classifier = CareerClassifier(
+        str(base_dir),
+        len(label_encoder.classes_),
+        hidden_dim=HEAD_CONFIG['hidden_dim'],
+        dropout=HEAD_CONFIG['dropout']
+    )
+    torch.save({'model_state_dict': classifier.state_dict()}, models_dir / "career_model_cpu.pth")
+
+    with open(models_dir / "label_encoder.pkl", 'wb') as f:
+        pickle.dump(label_encoder, f)
+
+    embeddings = sentence_model.encode([" ".join(texts[role]) for role in label_encoder.classes_])
+    np.save(models_dir / "career_embeddings.npy", embeddings)
+
+    metadata = {
+        'model_config': dict({'base_model': str(base_dir)}, **HEAD_CONFIG),
+        'num_classes': len(label_encoder.classes_),
+        'classes': label_encoder.classes_.tolist(),
+        'fixture': {'seed': seed, 'vocab_size': len(vocab), 'shape': MINILM_CONFIG}
+    }
+    with open(metadata_path, 'w') as f:
+        json.dump(metadata, f, indent=2)
+
+    return models_dir
+
+class _OpenRouterHandler(BaseHTTPRequestHandler):
+    """Answers chat completion requests with a canned response"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        request = json.loads(body or b"{}")
+        stub = self.server.stub
+        stub.requests += 1
+        if stub.latency:
+            time.sleep(stub.latency)
+
+        if request.get('stream'):
+            chunks = [
+                "data: " + json.dumps({'choices': [{'delta': {'content': word + " "}}]}) + "\n\n"
+                for word in stub.reply.split()
+            ]
+            data = ("".join(chunks) + "data: [DONE]\n\n").encode('utf-8')
+            content_type = 'text/event-stream'
+        else:
+            data = json.dumps({
+                'id': f"stub-{stub.requests}",
+                'model': request.get('model'),
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': stub.reply}}]
+            }).encode('utf-8')
+            content_type = 'application/json'
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+class OpenRouterStub:
+    """Local OpenRouter chat completions endpoint (use as a context manager)"""
+
+    def __init__(self, reply: str = "Stub career advice. " * 50, latency: float = 0.0):
+        """
+        Args:
+            reply: Assistant message returned for every request
+            latency: Simulated server time per request in seconds
+        """
+        self.reply = reply
+        self.latency = latency
+        self.requests = 0
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v1/chat/completions"
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _OpenRouterHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+class _RedisHandler(StreamRequestHandler):
+    """Executes RESP commands against the stub's hashes"""
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self):
+        stub = self.server.stub
+        while True:
+            args = self._read_command()
+            if args is None:
+                return
+            if stub.latency:
+                time.sleep(stub.latency)
+            with stub.lock:
+                stub.commands += 1
+                reply = stub.execute(args[0].upper(), args[1:])
+            self.wfile.write(reply)
+
+class RedisStub:
+    """
+    Local Redis-protocol server (use as a context manager)
+
+    Implements the commands RedisSessionStore uses: PING, AUTH, SELECT, HGET,
+    HSET, HDEL, DEL and EXPIRE, with expiry checked on access.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        """
+        Args:
+            latency: Simulated network round trip per command in seconds
+        """
+        self.latency = latency
+        self.commands = 0
+        self.lock = threading.Lock()
+        self._hashes = {}
+        self._expires = {}
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def _hash(self, key, create=False):
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at < time.time():
+            self._hashes.pop(key, None)
+            self._expires.pop(key, None)
+        if create:
+            return self._hashes.setdefault(key, {})
+        return self._hashes.get(key, {})
+
+    def execute(self, command: bytes, args: list) -> bytes:
+        """Run one command and return the encoded RESP reply"""
+        if command == b"PING":
+            return b"+PONG\r\n"
+        if command in (b"AUTH", b"SELECT"):
+            return b"+OK\r\n"
+        if command == b"HGET":
+            value = self._hash(args[0]).get(args[1])
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+        if command == b"HSET":
+            fields = self._hash(args[0], create=True)
+            added = 0
+            for field, value in zip(args[1::2], args[2::2]):
+                added += field not in fields
+                fields[field] = value
+            return b":%d\r\n" % added
+        if command == b"HDEL":
+            fields = self._hash(args[0])
+            return b":%d\r\n" % sum(fields.pop(field, None) is not None for field in args[1:])
+        if command == b"DEL":
+            deleted = sum(self._hashes.pop(key, None) is not None for key in args)
+            for key in args:
+                self._expires.pop(key, None)
+            return b":%d\r\n" % deleted
+        if command == b"EXPIRE":
+            if args[0] not in self._hashes:
+                return b":0\r\n"
+            self._expires[args[0]] = time.time() + int(args[1])
+            return b":1\r\n"
+        return b"-ERR unknown command '%s'\r\n" % command
+
+    def start(self):
+        self._server = ThreadingTCPServer(("127.0.0.1", 0), _RedisHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+if __name__ == "__main__":
+    print(build_fixture(Path(sys.argv[1]) if len(sys.argv) > 1 else None, force=True))
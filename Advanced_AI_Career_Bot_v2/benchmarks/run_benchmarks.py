@@ -0,0 +1,262 @@
+"""
+Run the benchmark suite and compare results between runs
+
+Examples:
+    python run_benchmarks.py run -o results.json
+    python run_benchmarks.py run --suite model --suite lookups --quick
+    python run_benchmarks.py compare baseline.json results.json --threshold 0.1
+
+By default the model suites use a tiny randomly initialized MiniLM-shaped
+model built offline (see fixtures.py); pass --model-dir to benchmark real
+model files instead.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Suite name -> benchmark module (each exposes run(**kwargs) -> Dict)
+SUITES = {
+    'cold_start': 'bench_cold_start',
+    'model': 'bench_model',
+    'lookups': 'bench_lookups',
+    'results_view': 'bench_results_view',
+    'openrouter': 'bench_openrouter',
+    'scoring_pool': 'bench_scoring_pool',
+    'load': 'bench_load',
+    'chat_history': 'bench_chat_history',
+    'session_store': 'bench_session_store',
+    'single_flight': 'bench_single_flight',
+    'training_data': 'bench_training_data',
+    'training': 'bench_training',
+    'cascade': 'bench_cascade',
+    'long_inputs': 'bench_long_inputs',
+    'resume': 'bench_resume',
+}
+
+# Run when no --suite is given (scoring_pool, load, training and long_inputs are slow)
+DEFAULT_SUITES = ['cold_start', 'model', 'lookups', 'results_view', 'openrouter', 'chat_history', 'session_store', 'single_flight', 'training_data', 'cascade', 'resume']
+
+# Suites that need a model
+MODEL_SUITES = {'cold_start', 'model', 'scoring_pool', 'load', 'session_store', 'single_flight', 'training_data', 'training', 'cascade', 'long_inputs', 'resume'}
+
+# Smaller workloads for --quick (smoke runs; numbers are noisier)
+QUICK_ARGS = {
+    'cold_start': {'repeat': 1},
+    'model': {'iterations': 10, 'batch_queries': 64},
+    'lookups': {'number': 50, 'repeat': 3},
+    'results_view': {'number': 200, 'repeat': 3},
+    'openrouter': {'iterations': 20},
+    'scoring_pool': {'num_queries': 64},
+    'load': {'levels': (1, 2), 'actions_per_user': 3},
+    'chat_history': {'iterations': 3},
+    'session_store': {'iterations': 10},
+    'single_flight': {'callers': 4},
+    'training_data': {'samples': 1024, 'epochs': 1},
+    'training': {'samples': 128},
+    'cascade': {'margins': (0.2,), 'candidates': (3,)},
+    'long_inputs': {'profiles': 8},
+    'resume': {'resumes': 4, 'repeat': 2},
+}
+
+# Default relative change treated as a regression
+DEFAULT_THRESHOLD = 0.10
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=Path(__file__).parent, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _environment(model_dir: Optional[Path]) -> Dict:
+    """Machine and library versions recorded with every run"""
+    versions = {}
+    for package in ('torch', 'transformers', 'sentence_transformers', 'numpy', 'requests', 'streamlit'):
+        try:
+            versions[package] = importlib.import_module(package).__version__
+        except ImportError:
+            versions[package] = None
+
+    return {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'model_dir': str(model_dir) if model_dir else None,
+        'versions': versions,
+    }
+
+def run_suites(
+    suites: List[str],
+    model_dir: Optional[Path] = None,
+    fixture_dir: Optional[Path] = None,
+    quick: bool = False,
+    log=lambda msg: print(msg, file=sys.stderr)
+) -> Dict:
+    """
+    Run benchmark suites
+
+    Args:
+        suites: Suite names (keys of SUITES)
+        model_dir: Model files to benchmark (default: build the offline fixture)
+        fixture_dir: Where the offline fixture is built/cached
+        quick: Use the smaller QUICK_ARGS workloads
+        log: Progress callback
+
+    Returns:
+        Dictionary with 'environment' and per-suite 'results'
+    """
+    if model_dir is None and MODEL_SUITES.intersection(suites):
+        from fixtures import build_fixture
+
+        log("Preparing offline model fixture...")
+        model_dir = build_fixture(fixture_dir)
+
+    if model_dir is not None:
+        # Must be set before model_loader is first imported
+        os.environ["CAREER_MODEL_DIR"] = str(model_dir)
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+    report = {'environment': dict(_environment(model_dir), quick=quick), 'results': {}}
+
+    for name in suites:
+        log(f"Running {name}...")
+        module = importlib.import_module(SUITES[name])
+        start = time.perf_counter()
+        report['results'][name] = module.run(**(QUICK_ARGS.get(name, {}) if quick else {}))
+        log(f"  done in {time.perf_counter() - start:.1f}s")
+
+    return report
+
+def _flatten(results: Dict, prefix: str = "") -> Dict[str, float]:
+    """Numeric metrics as 'suite.metric' -> value (lists are skipped)"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+def metric_direction(name: str) -> int:
+    """
+    Which way a metric should move
+
+    Returns:
+        -1 if lower is better (times), 1 if higher is better (throughput),
+        0 for informational metrics that are not judged
+    """
+    if name.endswith("_per_sec"):
+        return 1
+    if name.endswith(("_ms", "_us", "_s")):
+        return -1
+    return 0
+
+def compare_reports(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Compare two benchmark reports metric by metric
+
+    Args:
+        baseline: Report from the reference run
+        current: Report from the run being checked
+        threshold: Relative change (e.g., 0.1 = 10%) beyond which a metric is
+                   flagged as a regression or improvement
+
+    Returns:
+        One row per metric present in both runs with baseline, current,
+        relative change and status ("regression", "improved", "ok" or "info")
+    """
+    old = _flatten(baseline['results'])
+    new = _flatten(current['results'])
+
+    rows = []
+    for name in sorted(set(old) & set(new)):
+        before, after = old[name], new[name]
+        change = (after - before) / before if before else 0.0
+        direction = metric_direction(name)
+
+        if direction == 0:
+            status = "info"
+        elif change * direction < -threshold:
+            status = "regression"
+        elif change * direction > threshold:
+            status = "improved"
+        else:
+            status = "ok"
+
+        rows.append({'metric': name, 'baseline': before, 'current': after, 'change': change, 'status': status})
+
+    return rows
+
+def format_comparison(rows: List[Dict]) -> str:
+    """Render comparison rows as a plain-text table"""
+    width = max([len(row['metric']) for row in rows] + [6])
+    lines = [f"{'metric':<{width}}  {'baseline':>12}  {'current':>12}  {'change':>8}  status"]
+    for row in rows:
+        lines.append(
+            f"{row['metric']:<{width}}  {row['baseline']:>12.4g}  {row['current']:>12.4g}  "
+            f"{row['change']:>+8.1%}  {row['status']}"
+        )
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Career Bot benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run benchmarks and write JSON results")
+    run_parser.add_argument("--suite", action="append", choices=sorted(SUITES),
+                            help="Suite to run (repeatable; default: all but scoring_pool and load)")
+    run_parser.add_argument("-o", "--output", type=Path, help="Write results JSON here (default: stdout)")
+    run_parser.add_argument("--model-dir", type=Path, help="Benchmark these model files instead of the fixture")
+    run_parser.add_argument("--fixture-dir", type=Path, help="Where to build/cache the offline fixture")
+    run_parser.add_argument("--quick", action="store_true", help="Smaller workloads for a fast smoke run")
+
+    compare_parser = commands.add_parser("compare", help="Flag regressions between two result files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="Relative change flagged as regression (default: 0.10)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.current, 'r', encoding='utf-8') as f:
+            current = json.load(f)
+
+        rows = compare_reports(baseline, current, args.threshold)
+        print(format_comparison(rows))
+
+        regressions = [row['metric'] for row in rows if row['status'] == "regression"]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%}")
+        return 0
+
+    report = run_suites(args.suite or DEFAULT_SUITES, args.model_dir, args.fixture_dir, args.quick)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(output + "\n", encoding='utf-8')
+    else:
+        print(output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
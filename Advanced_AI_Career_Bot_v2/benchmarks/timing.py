@@ -0,0 +1,56 @@
+"""
+Benchmark Timing Helpers
+Shared sampling and percentile summaries for the benchmark suites
+"""
+
+import math
+import statistics
+import time
+from typing import Callable, Dict, List
+
+def _percentile(sorted_samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of pre-sorted samples"""
+    rank = max(0, min(len(sorted_samples) - 1, math.ceil(q * len(sorted_samples)) - 1))
+    return sorted_samples[rank]
+
+def sample(func: Callable, iterations: int, warmup: int = 3) -> List[float]:
+    """
+    Time repeated calls of a function
+
+    Args:
+        func: Zero-argument callable to time
+        iterations: Timed calls
+        warmup: Untimed calls made first
+
+    Returns:
+        Per-call durations in seconds
+    """
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def latency_summary(samples: List[float], unit: str = "ms") -> Dict[str, float]:
+    """
+    Summarize durations (in seconds) as mean/p50/p95/p99
+
+    Args:
+        samples: Durations in seconds
+        unit: "ms" or "us" (used as the metric name suffix)
+
+    Returns:
+        Dictionary like {'mean_ms': ..., 'p50_ms': ..., 'p95_ms': ..., 'p99_ms': ...}
+    """
+    scale = 1e3 if unit == "ms" else 1e6
+    ordered = sorted(samples)
+    return {
+        f'mean_{unit}': round(statistics.fmean(ordered) * scale, 4),
+        f'p50_{unit}': round(_percentile(ordered, 0.50) * scale, 4),
+        f'p95_{unit}': round(_percentile(ordered, 0.95) * scale, 4),
+        f'p99_{unit}': round(_percentile(ordered, 0.99) * scale, 4),
+    }
@@ -6,16 +6,22 @@ Enhanced with Multi-Source Training, OpenRouter Integration, and Roadmap.sh
 import streamlit as st
 import sys
 import os
+import hashlib
+import hmac
 from pathlib import Path
 
 # Add utils to path
 sys.path.append(str(Path(__file__).parent))
 
-from utils.model_loader import load_model, get_career_recommendations
-from utils.resource_finder import get_learning_resources, get_salary_info
-from utils.openrouter_agent import OpenRouterAgent
+from utils.model_loader import load_model, get_career_recommendations, build_enhanced_query
+from utils.career_payload import get_career_payloads
+from utils.openrouter_agent import StreamingOpenRouterAgent
 from utils.roadmap_fetcher import fetch_career_roadmap
 from utils.books_recommender import recommend_books
+from utils.chat_store import ChatStore, CHAT_WINDOW
+from utils.session_store import get_session_store, new_session_id, MemorySessionStore, SESSION_PARAM
+from utils.job_runner import get_job_runner, DONE, JOB_POLL_INTERVAL
+from utils import metrics
 import json
 
 # Page configuration
@@ -98,15 +104,94 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Initialize session state
+# Server-side session, found through a signed URL token so it survives
+# reconnecting to another worker. The token is replaced on every restore,
+# so a copied or logged link stops working once the session is picked up.
+session_store = get_session_store()
+if 'session_id' not in st.session_state:
+    session_id = session_store.redeem_token(st.query_params.get(SESSION_PARAM))
+    if session_id is None:
+        session_id = new_session_id()
+    st.query_params[SESSION_PARAM] = session_store.issue_token(session_id)
+    st.session_state.session_id = session_id
+
+# Older chat turns follow the session when the store is shared; the
+# per-process memory store spills them to the local chat database instead
+chat_pages = None if isinstance(session_store, MemorySessionStore) else session_store
+
+# Initialize session state (persisted values are looked up once per key)
 if 'model_loaded' not in st.session_state:
     st.session_state.model_loaded = False
 if 'recommendations' not in st.session_state:
-    st.session_state.recommendations = None
+    with metrics.timer("app.session_restore"):
+        st.session_state.recommendations = session_store.get(st.session_state.session_id, 'recommendations')
 if 'openrouter_agent' not in st.session_state:
     st.session_state.openrouter_agent = None
-if 'chat_history' not in st.session_state:
-    st.session_state.chat_history = []
+if 'chat_store' not in st.session_state:
+    st.session_state.chat_store = None  # set once the OpenRouter key is entered
+if 'chat_window' not in st.session_state:
+    st.session_state.chat_window = CHAT_WINDOW
+if 'coach_job' not in st.session_state:
+    st.session_state.coach_job = None
+if 'interview_job' not in st.session_state:
+    st.session_state.interview_job = None
+
+# LLM calls run in the background; the page polls their jobs
+job_runner = get_job_runner()
+
+def restore_chat(api_key):
+    """
+    Chat history of this session, resumed only for the OpenRouter key it was
+    held with (the session token alone does not reveal the conversation)
+    """
+    session_id = st.session_state.session_id
+    owner = hashlib.sha256(f"{session_id}:{api_key}".encode('utf-8')).hexdigest()
+    with metrics.timer("app.session_restore"):
+        saved = session_store.get(session_id, 'chat_store')
+    if saved is not None and hmac.compare_digest(str(saved.get('owner')), owner):
+        return ChatStore.from_dict(saved, store=chat_pages)
+    return ChatStore(session_id, store=chat_pages, owner=owner)
+
+def save_chat():
+    """Persist the chat history in the session store"""
+    session_store.set(st.session_state.session_id, 'chat_store', st.session_state.chat_store.to_dict())
+
+def job_output(job):
+    """Text of a finished job (its error message if it failed)"""
+    if job.status == DONE:
+        return job.text
+    return f"Unexpected error: {job.error}"
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def coach_reply():
+    """Stream the pending coach reply; reruns the page once it is done"""
+    job = st.session_state.coach_job
+    if job is None or job.done:
+        st.rerun()
+    
+    with st.chat_message("assistant"):
+        st.markdown(job.text or "Thinking...")
+    
+    if st.button("⏹️ Stop", key="coach_stop"):
+        job_runner.cancel(job)
+        if job.text:
+            st.session_state.chat_store.append("assistant", job.text + "\n\n*(stopped)*")
+            save_chat()
+        st.session_state.coach_job = None
+        st.rerun()
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def interview_progress():
+    """Wait for the pending interview questions; reruns the page once they are ready"""
+    job = st.session_state.interview_job
+    if job is None or job.done:
+        st.rerun()
+    
+    st.info("⏳ Generating interview questions... You can keep using the other tabs.")
+    if st.button("⏹️ Cancel", key="interview_cancel"):
+        job_runner.cancel(job)
+        st.session_state.interview_job = None
+        st.rerun()
 
 def main():
     # Header
@@ -141,7 +226,8 @@ def main():
         
         if api_key:
             if st.session_state.openrouter_agent is None:
-                st.session_state.openrouter_agent = OpenRouterAgent(api_key)
+                st.session_state.openrouter_agent = StreamingOpenRouterAgent(api_key)
+                st.session_state.chat_store = restore_chat(api_key)
                 st.success("✅ OpenRouter Agent Connected!")
         
         st.markdown("---")
@@ -155,6 +241,27 @@ def main():
         **Model:** Multi-Source Trained  
         **AI Agent:** OpenRouter  
         """)
+        
+        # Latency debug panel (only when metrics are enabled)
+        if metrics.is_enabled() and st.checkbox("🐞 Show latency breakdown"):
+            stats = metrics.snapshot()
+            if stats:
+                st.table([
+                    {
+                        "stage": stage,
+                        "count": s["count"],
+                        "p50 ms": f"{s['p50_ms']:.2f}",
+                        "p95 ms": f"{s['p95_ms']:.2f}",
+                        "p99 ms": f"{s['p99_ms']:.2f}"
+                    }
+                    for stage, s in stats.items()
+                ])
+            else:
+                st.caption("No timings recorded yet.")
+            
+            # Event counters (e.g., requests coalesced with an identical one in flight)
+            for event, count in metrics.counters().items():
+                st.caption(f"{event}: {count}")
     
     # Main content tabs
     tab1, tab2, tab3, tab4, tab5 = st.tabs([
@@ -211,15 +318,18 @@ def main():
                         try:
                             # Load model if not loaded
                             if not st.session_state.model_loaded:
-                                load_model()
+                                with metrics.timer("app.load_model"):
+                                    load_model()
                                 st.session_state.model_loaded = True
                             
                             # Create enhanced query
-                            enhanced_query = f"{user_description} Skills: {', '.join(skills)}. Experience: {experience}. Education: {education}."
+                            enhanced_query = build_enhanced_query(user_description, skills, experience, education)
                             
                             # Get recommendations
-                            recommendations = get_career_recommendations(enhanced_query, top_k=5)
+                            with metrics.timer("app.recommend"):
+                                recommendations = get_career_recommendations(enhanced_query, top_k=5)
                             st.session_state.recommendations = recommendations
+                            session_store.set(st.session_state.session_id, 'recommendations', recommendations)
                             
                             st.success("✅ Analysis complete! See your recommendations below.")
                         
@@ -262,40 +372,40 @@ def main():
             st.markdown("---")
             st.markdown("## 🎓 Your Career Recommendations")
             
-            for i, rec in enumerate(st.session_state.recommendations, 1):
-                with st.container():
-                    st.markdown(f"""
-                    <div class="career-card">
-                        <h2 style="margin:0; color:white;">#{i} {rec['career']}</h2>
-                        <div class="confidence-badge">Confidence: {rec['confidence']:.1f}%</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.markdown("### 📚 Learning Resources")
-                        resources = get_learning_resources(rec['career'])
+            with metrics.timer("app.lookup"):
+                payloads = get_career_payloads([rec['career'] for rec in st.session_state.recommendations])
+            
+            with metrics.timer("app.render_results"):
+                for i, (rec, payload) in enumerate(zip(st.session_state.recommendations, payloads), 1):
+                    with st.container():
+                        st.markdown(f"""
+                        <div class="career-card">
+                            <h2 style="margin:0; color:white;">#{i} {rec['career']}</h2>
+                            <div class="confidence-badge">Confidence: {rec['confidence']:.1f}%</div>
+                        </div>
+                        """, unsafe_allow_html=True)
                         
-                        if resources['courses']:
-                            st.markdown("**Recommended Courses:**")
-                            for course in resources['courses'][:3]:
-                                st.markdown(f"- {course}")
+                        col1, col2 = st.columns(2)
                         
-                        if resources['certifications']:
-                            st.markdown("**Certifications:**")
-                            for cert in resources['certifications'][:2]:
-                                st.markdown(f"- {cert}")
-                    
-                    with col2:
-                        st.markdown("### 💰 Salary Information")
-                        salary_info = get_salary_info(rec['career'])
+                        with col1:
+                            st.markdown("### 📚 Learning Resources")
+                            if payload['resources_md']:
+                                st.markdown(payload['resources_md'])
+                            
+                            if payload['books_md']:
+                                st.markdown("**Top Books:**\n" + payload['books_md'])
+                            
+                            st.markdown(f"🗺️ [Career roadmap on roadmap.sh]({payload['roadmap_url']})")
                         
-                        st.metric("Entry Level", salary_info['entry'])
-                        st.metric("Mid Level", salary_info['mid'])
-                        st.metric("Senior Level", salary_info['senior'])
-                    
-                    st.markdown("---")
+                        with col2:
+                            st.markdown("### 💰 Salary Information")
+                            salary_info = payload['salary']
+                            
+                            st.metric("Entry Level", salary_info['entry'])
+                            st.metric("Mid Level", salary_info['mid'])
+                            st.metric("Senior Level", salary_info['senior'])
+                        
+                        st.markdown("---")
     
     # Tab 2: Career Roadmap
     with tab2:
@@ -312,7 +422,8 @@ def main():
         
         if st.button("📖 Load Career Roadmap", use_container_width=True):
             with st.spinner(f"Loading roadmap for {selected_career}..."):
-                roadmap = fetch_career_roadmap(selected_career)
+                with metrics.timer("app.roadmap"):
+                    roadmap = fetch_career_roadmap(selected_career)
                 
                 if roadmap:
                     st.success(f"✅ Roadmap loaded for {selected_career}")
@@ -349,7 +460,8 @@ def main():
         )
         
         if st.button("📖 Get Book Recommendations", use_container_width=True):
-            books = recommend_books(career_for_books)
+            with metrics.timer("app.books"):
+                books = recommend_books(career_for_books)
             
             st.markdown(f"### Top Books for {career_for_books}")
             
@@ -384,39 +496,61 @@ def main():
             # Chat interface
             st.markdown("### Ask me anything about your career!")
             
-            # Display chat history
-            for message in st.session_state.chat_history:
+            chat_store = st.session_state.chat_store
+            
+            # A reply that finished in the background joins the history
+            coach_job = st.session_state.coach_job
+            if coach_job is not None and coach_job.done:
+                chat_store.append("assistant", job_output(coach_job))
+                save_chat()
+                st.session_state.coach_job = None
+            
+            # Older messages are paged in from the chat store on request
+            hidden = len(chat_store) - st.session_state.chat_window
+            if hidden > 0:
+                st.caption(f"{hidden} earlier messages hidden")
+                if st.button("⬆️ Show earlier messages", key="chat_show_earlier"):
+                    st.session_state.chat_window += CHAT_WINDOW
+                    st.rerun()
+            
+            # Display the latest messages only
+            for message in chat_store.recent(st.session_state.chat_window):
                 with st.chat_message(message["role"]):
                     st.markdown(message["content"])
             
-            # User input
-            user_input = st.chat_input("Ask about career paths, skills, salary, interview tips, etc.")
+            # User input (one question at a time)
+            user_input = st.chat_input(
+                "Ask about career paths, skills, salary, interview tips, etc.",
+                disabled=st.session_state.coach_job is not None
+            )
             
             if user_input:
                 # Add user message
-                st.session_state.chat_history.append({"role": "user", "content": user_input})
+                chat_store.append("user", user_input)
                 
                 with st.chat_message("user"):
                     st.markdown(user_input)
                 
-                # Get AI response
-                with st.chat_message("assistant"):
-                    with st.spinner("Thinking..."):
-                        response = st.session_state.openrouter_agent.get_career_advice(
-                            user_input,
-                            context=st.session_state.recommendations
-                        )
-                        st.markdown(response)
-                        
-                        # Add to history
-                        st.session_state.chat_history.append({
-                            "role": "assistant",
-                            "content": response
-                        })
+                # Get AI response in the background
+                st.session_state.coach_job = job_runner.submit(
+                    st.session_state.session_id,
+                    ("coach", user_input),
+                    st.session_state.openrouter_agent.stream_career_advice,
+                    user_input,
+                    context=st.session_state.recommendations
+                )
+            
+            if st.session_state.coach_job is not None:
+                coach_reply()
             
             # Clear chat button
             if st.button("🗑️ Clear Chat History"):
-                st.session_state.chat_history = []
+                if st.session_state.coach_job is not None:
+                    job_runner.cancel(st.session_state.coach_job)
+                    st.session_state.coach_job = None
+                chat_store.clear()
+                session_store.delete(st.session_state.session_id, 'chat_store')
+                st.session_state.chat_window = CHAT_WINDOW
                 st.rerun()
     
     # Tab 5: Interview Prep
@@ -439,11 +573,22 @@ def main():
             if not api_key:
                 st.warning("⚠️ Please enter your OpenRouter API key in the sidebar")
             else:
-                with st.spinner("Generating interview questions..."):
-                    prompt = f"Generate 10 {interview_type.lower()} for a {interview_career} interview. Include the questions and brief answer guidelines."
-                    
-                    questions = st.session_state.openrouter_agent.get_career_advice(prompt)
-                    st.markdown(questions)
+                prompt = f"Generate 10 {interview_type.lower()} for a {interview_career} interview. Include the questions and brief answer guidelines."
+                
+                # Same prompt while one is in flight -> same job
+                st.session_state.interview_job = job_runner.submit(
+                    st.session_state.session_id,
+                    ("interview", prompt),
+                    st.session_state.openrouter_agent.get_career_advice,
+                    prompt
+                )
+        
+        interview_job = st.session_state.interview_job
+        if interview_job is not None:
+            if interview_job.done:
+                st.markdown(job_output(interview_job))
+            else:
+                interview_progress()
         
         st.markdown("---")
         st.markdown("### 💡 Interview Tips")
@@ -471,4 +616,10 @@ def main():
             """)
 
 if __name__ == "__main__":
-    main()
+    if metrics.is_enabled():
+        metrics.start_server()
+    
+    with metrics.timer("app.rerun"):
+        main()
+    
+    metrics.maybe_dump()
@@ -0,0 +1,18 @@
+"""
+Score user profiles in bulk (nightly re-recommendation)
+
+Examples:
+    python batch_score.py profiles.csv results.jsonl
+    python batch_score.py profiles.jsonl results.parquet --batch-size 64 --workers 2
+"""
+
+import sys
+from pathlib import Path
+
+# Add utils to path
+sys.path.append(str(Path(__file__).parent))
+
+from utils.batch_scoring import main
+
+if __name__ == "__main__":
+    sys.exit(main())
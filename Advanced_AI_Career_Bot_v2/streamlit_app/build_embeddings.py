@@ -0,0 +1,21 @@
+"""
+Update the career similarity embeddings of a trained model
+
+Only careers that are new or whose texts changed are encoded again.
+
+Examples:
+    python build_embeddings.py
+    python build_embeddings.py --model-dir /srv/models/candidate --aggregation centroid
+    python build_embeddings.py --rebuild
+"""
+
+import sys
+from pathlib import Path
+
+# Add utils to path
+sys.path.append(str(Path(__file__).parent))
+
+from utils.career_embeddings import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+"""
+Distill the deployed career model into a smaller, faster student
+
+Writes career_model_student.pth next to the model and prints a report of
+latency and top-k agreement with the full model. Serve the student with
+CAREER_MODEL_VARIANT=student.
+
+Examples:
+    python distill.py
+    python distill.py --layers 3 --epochs 20
+"""
+
+import sys
+from pathlib import Path
+
+# Add utils to path
+sys.path.append(str(Path(__file__).parent))
+
+from utils.distillation import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+"""
+Score resumes with the local career model
+
+Extracts skills, sections, experience and education from plain-text resumes
+and scores them against the model in one batch, printing one JSON line per
+resume.
+
+Examples:
+    python score_resumes.py resume.txt
+    python score_resumes.py resumes/*.txt --top-k 3
+"""
+
+import sys
+from pathlib import Path
+
+# Add utils to path
+sys.path.append(str(Path(__file__).parent))
+
+from utils.resume_pipeline import main
+
+if __name__ == "__main__":
+    sys.exit(main())
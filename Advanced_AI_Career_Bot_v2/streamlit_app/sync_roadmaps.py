@@ -0,0 +1,19 @@
+"""
+Sync roadmap.sh roadmaps into the local roadmap store
+
+Examples:
+    python sync_roadmaps.py --source ~/developer-roadmap
+    python sync_roadmaps.py --http
+    python sync_roadmaps.py --http http://localhost:8000/roadmaps --slug frontend
+"""
+
+import sys
+from pathlib import Path
+
+# Add utils to path
+sys.path.append(str(Path(__file__).parent))
+
+from utils.roadmap_sync import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+"""
+Train the career classifier on CPU
+
+Examples:
+    python train.py
+    python train.py --output /srv/models/candidate --threads 8
+    python train.py --epochs 3 --bf16
+    python train.py --restart
+"""
+
+import sys
+from pathlib import Path
+
+# Add utils to path
+sys.path.append(str(Path(__file__).parent))
+
+from utils.trainer import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+"""
+Train early-exit heads for the deployed career model
+
+Writes career_model_exits.pth next to the model and prints a report of the
+layers run, agreement with the full model and latency saved per exit
+threshold. Enable early exit with CAREER_EXIT_THRESHOLD.
+
+Examples:
+    python train_exits.py
+    python train_exits.py --epochs 50 --thresholds 0.8 0.9
+"""
+
+import sys
+from pathlib import Path
+
+# Add utils to path
+sys.path.append(str(Path(__file__).parent))
+
+from utils.early_exit import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,345 @@
+"""
+Batch Scoring - Offline re-recommendation for many user profiles
+Streams profiles from CSV/JSONL, scores them in batches through the model
+loader and writes results incrementally with resumable checkpoints
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from .model_loader import build_enhanced_query, get_career_recommendations_batch
+
+# Defaults for profiles that leave fields empty (same as the app's widget defaults)
+DEFAULT_EXPERIENCE = "Beginner"
+DEFAULT_EDUCATION = "High School"
+
+# Seconds between progress reports
+PROGRESS_INTERVAL = 5.0
+
+def _split_skills(value) -> List[str]:
+    """Skills may be a JSON list or a comma/semicolon separated string"""
+    if isinstance(value, list):
+        return [str(s).strip() for s in value if str(s).strip()]
+    if not value:
+        return []
+    return [s.strip() for s in str(value).replace(';', ',').split(',') if s.strip()]
+
+def normalize_profile(raw: Dict, row_number: int) -> Dict:
+    """
+    Normalize an input row into a profile
+
+    Args:
+        raw: Row from the CSV/JSONL file
+        row_number: Zero-based row number (used when the row has no id)
+
+    Returns:
+        Profile with id (always a string, so output parts agree on its type),
+        description, skills, experience and education
+    """
+    profile_id = raw.get('id')
+    if profile_id is None:
+        profile_id = raw.get('user_id')
+    if profile_id is None:
+        profile_id = row_number
+    return {
+        'id': str(profile_id),
+        'description': raw.get('description') or raw.get('user_description') or '',
+        'skills': _split_skills(raw.get('skills')),
+        'experience': raw.get('experience') or DEFAULT_EXPERIENCE,
+        'education': raw.get('education') or DEFAULT_EDUCATION
+    }
+
+def read_profiles(path: Path, skip: int = 0) -> Iterator[Dict]:
+    """
+    Stream profiles from a CSV or JSONL file
+
+    Args:
+        path: Input file (.csv, .jsonl or .ndjson)
+        skip: Number of leading rows to skip (for resuming)
+
+    Yields:
+        Normalized profiles, one at a time
+    """
+    path = Path(path)
+
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.suffix.lower() == '.csv':
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+
+        for row_number, raw in enumerate(rows):
+            if row_number < skip:
+                continue
+            yield normalize_profile(raw, row_number)
+
+def profile_query(profile: Dict) -> str:
+    """Build the same enhanced query the app builds for a profile"""
+    return build_enhanced_query(
+        profile['description'],
+        profile['skills'],
+        profile['experience'],
+        profile['education']
+    )
+
+def _result_record(profile: Dict, recommendations: List[Dict]) -> Dict:
+    """Output record for one profile (plain Python types only)"""
+    return {
+        'id': profile['id'],
+        'recommendations': [
+            {
+                'career': str(rec['career']),
+                'confidence': round(float(rec['confidence']), 4),
+                'method': rec['method']
+            }
+            for rec in recommendations
+        ]
+    }
+
+class JsonlSink:
+    """Appends result records to a JSONL file"""
+
+    def __init__(self, path: Path, checkpoint: Optional[Dict] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a+b')
+        # Drop anything written after the last checkpoint (e.g., a partial batch)
+        self._file.truncate((checkpoint or {}).get('output_bytes', 0))
+        self._file.seek(0, os.SEEK_END)
+
+    def write(self, records: List[Dict]):
+        data = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        self._file.write(data.encode('utf-8'))
+        self._file.flush()
+
+    def state(self) -> Dict:
+        return {'output_bytes': self._file.tell()}
+
+    def close(self):
+        self._file.close()
+
+class ParquetSink:
+    """Writes result records as numbered Parquet part files in a directory"""
+
+    def __init__(self, path: Path, checkpoint: Optional[Dict] = None):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.parts = (checkpoint or {}).get('parts', 0)
+
+        # Remove parts written after the last checkpoint
+        for stale in self.path.glob("part-*.parquet"):
+            if int(stale.stem.split('-')[1]) >= self.parts:
+                stale.unlink()
+
+    def write(self, records: List[Dict]):
+        table = self._pa.Table.from_pylist(records)
+        self._pq.write_table(table, self.path / f"part-{self.parts:05d}.parquet")
+        self.parts += 1
+
+    def state(self) -> Dict:
+        return {'parts': self.parts}
+
+    def close(self):
+        pass
+
+def checkpoint_path(output_path: Path) -> Path:
+    """Checkpoint file stored next to the output"""
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.name + ".checkpoint.json")
+
+def load_checkpoint(output_path: Path, input_path: Path) -> Optional[Dict]:
+    """Load a checkpoint for this input/output pair, if any"""
+    try:
+        with open(checkpoint_path(output_path), 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    if checkpoint.get('input') != str(Path(input_path).resolve()):
+        return None
+    return checkpoint
+
+def save_checkpoint(output_path: Path, checkpoint: Dict):
+    """Atomically write the checkpoint file"""
+    path = checkpoint_path(output_path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+def _batches(profiles: Iterator[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    """Group a profile stream into lists of batch_size"""
+    batch = []
+    for profile in profiles:
+        batch.append(profile)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def run_batch(
+    input_path: Path,
+    output_path: Path,
+    output_format: Optional[str] = None,
+    batch_size: int = 32,
+    workers: int = 1,
+    top_k: int = 5,
+    use_hybrid: bool = True,
+    resume: bool = True,
+    score_fn: Optional[Callable] = None,
+    log: Callable[[str], None] = lambda msg: print(msg, file=sys.stderr)
+) -> Dict:
+    """
+    Score every profile in a CSV/JSONL file and write results incrementally
+
+    Memory stays bounded: at most ``2 * workers`` batches are in flight, and
+    each finished batch is written and checkpointed before more input is read.
+
+    Args:
+        input_path: Profiles file (.csv or .jsonl)
+        output_path: Output .jsonl file, or directory for Parquet parts
+        output_format: "jsonl" or "parquet" (default: from output_path suffix)
+        batch_size: Profiles per scoring batch
+        workers: Number of batches scored concurrently
+        top_k: Recommendations per profile
+        use_hybrid: Use both model prediction and embedding similarity
+        resume: Continue from the last checkpoint if one exists
+        score_fn: Scoring function taking a list of queries (default:
+                  model_loader.get_career_recommendations_batch)
+        log: Progress callback
+
+    Returns:
+        Run statistics (rows, seconds, rows_per_sec, resumed_from)
+    """
+    output_path = Path(output_path)
+    output_format = output_format or ('parquet' if output_path.suffix.lower() == '.parquet' else 'jsonl')
+    if score_fn is None:
+        def score_fn(queries):
+            return get_career_recommendations_batch(queries, top_k=top_k, use_hybrid=use_hybrid, batch_size=batch_size)
+
+    checkpoint = load_checkpoint(output_path, input_path) if resume else None
+    rows_done = checkpoint['rows_done'] if checkpoint else 0
+    sink_class = ParquetSink if output_format == 'parquet' else JsonlSink
+    sink = sink_class(output_path, checkpoint)
+
+    if rows_done:
+        log(f"Resuming after {rows_done} rows")
+
+    def score(batch):
+        return batch, score_fn([profile_query(p) for p in batch])
+
+    def flush(batch, results):
+        nonlocal rows_done
+        sink.write([_result_record(p, r) for p, r in zip(batch, results)])
+        rows_done += len(batch)
+        save_checkpoint(output_path, dict(
+            {'input': str(Path(input_path).resolve()), 'rows_done': rows_done},
+            **sink.state()
+        ))
+
+    resumed_from = rows_done
+    start = time.perf_counter()
+    last_report = start
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            pending = deque()
+            for batch in _batches(read_profiles(input_path, skip=rows_done), batch_size):
+                pending.append(executor.submit(score, batch))
+                if len(pending) >= 2 * max(1, workers):
+                    flush(*pending.popleft().result())
+
+                now = time.perf_counter()
+                if now - last_report >= PROGRESS_INTERVAL:
+                    scored = rows_done - resumed_from
+                    log(f"{rows_done} rows ({scored / (now - start):.1f} rows/sec)")
+                    last_report = now
+
+            while pending:
+                flush(*pending.popleft().result())
+    finally:
+        sink.close()
+
+    elapsed = time.perf_counter() - start
+    scored = rows_done - resumed_from
+    stats = {
+        'rows': scored,
+        'total_rows': rows_done,
+        'seconds': round(elapsed, 3),
+        'rows_per_sec': round(scored / elapsed, 2) if elapsed > 0 else 0.0,
+        'resumed_from': resumed_from
+    }
+    log(f"Scored {scored} rows in {elapsed:.1f}s ({stats['rows_per_sec']} rows/sec)")
+    return stats
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point (see batch_score.py)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score user profiles in bulk")
+    parser.add_argument("input", type=Path, help="Profiles file (.csv or .jsonl)")
+    parser.add_argument("output", type=Path, help="Output .jsonl file or Parquet directory")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], help="Output format (default: from output suffix)")
+    parser.add_argument("--batch-size", type=int, default=32, help="Profiles per batch")
+    parser.add_argument("--workers", type=int, default=1, help="Batches scored concurrently")
+    parser.add_argument("--processes", type=int, default=0,
+                        help="Score in a pool of N forked processes sharing the model (implies --workers N; "
+                             "0 scores in this process)")
+    parser.add_argument("--top-k", type=int, default=5, help="Recommendations per profile")
+    parser.add_argument("--no-hybrid", action="store_true", help="Use model predictions only")
+    parser.add_argument("--restart", action="store_true", help="Ignore any existing checkpoint")
+    args = parser.parse_args(argv)
+    if args.processes < 0:
+        parser.error("--processes must be 0 or more")
+
+    from .model_loader import load_model
+
+    if not load_model():
+        print("Error: could not load model files from models/", file=sys.stderr)
+        return 1
+
+    pool = None
+    score_fn = None
+    workers = args.workers
+    if args.processes:
+        from .scoring_pool import ScoringPool
+
+        pool = ScoringPool(args.processes)
+        workers = args.processes
+
+        def score_fn(queries):
+            return pool.score(queries, top_k=args.top_k, use_hybrid=not args.no_hybrid)
+
+    try:
+        stats = run_batch(
+            args.input,
+            args.output,
+            output_format=args.format,
+            batch_size=args.batch_size,
+            workers=workers,
+            top_k=args.top_k,
+            use_hybrid=not args.no_hybrid,
+            resume=not args.restart,
+            score_fn=score_fn
+        )
+    finally:
+        if pool is not None:
+            pool.close()
+    print(json.dumps(stats))
+    return 0
@@ -0,0 +1,274 @@
+"""
+Career Embeddings - Incremental builder for the similarity embeddings
+Maintains career_embeddings.npy (one sentence embedding per career, in the
+label encoder's class order) next to a manifest recording a content hash of
+each career's texts, so a rebuild only encodes careers that are new or whose
+texts changed
+
+Two aggregations are supported: 'first' joins a career's first texts into
+one input (as the Colab notebook does) and 'centroid' averages the
+embeddings of all its texts, encoded in streaming batches.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .training_data import DATASET_DIR, iter_corpus
+
+# Manifest stored next to the embeddings
+MANIFEST_NAME = "career_embeddings.json"
+
+AGGREGATIONS = ('first', 'centroid')
+
+# Texts joined per career by the 'first' aggregation (as in the notebook)
+FIRST_TEXTS = 5
+
+# Texts encoded per sentence model call by the 'centroid' aggregation
+ENCODE_BATCH_SIZE = 256
+
+def role_hashes(dataset_dir: Path, base_model: str, aggregation: str) -> Dict[str, str]:
+    """
+    Content hash of every career's embedding input (one streaming pass)
+
+    Args:
+        dataset_dir: Directory with the dataset CSV files
+        base_model: Sentence model (part of the hash)
+        aggregation: 'first' or 'centroid'
+
+    Returns:
+        Career -> hash of the texts its embedding is built from
+    """
+    digests = {}
+    counts = {}
+    for sample in iter_corpus(dataset_dir):
+        role = sample['role']
+        if role not in digests:
+            digests[role] = hashlib.sha256(f"{base_model}\0{aggregation}\0".encode('utf-8'))
+            counts[role] = 0
+        if aggregation == 'first' and counts[role] >= FIRST_TEXTS:
+            continue
+        digests[role].update(sample['text'].encode('utf-8'))
+        digests[role].update(b"\0")
+        counts[role] += 1
+    return {role: digest.hexdigest() for role, digest in digests.items()}
+
+def encode_roles(roles: List[str], dataset_dir: Path, sentence_model, aggregation: str) -> Dict[str, np.ndarray]:
+    """
+    Embed the given careers from the datasets
+
+    Args:
+        roles: Careers to encode
+        dataset_dir: Directory with the dataset CSV files
+        sentence_model: SentenceTransformer
+        aggregation: 'first' or 'centroid'
+
+    Returns:
+        Career -> embedding (careers without texts are left out)
+    """
+    wanted = set(roles)
+    if aggregation == 'first':
+        texts = {}
+        for sample in iter_corpus(dataset_dir):
+            if sample['role'] not in wanted:
+                continue
+            examples = texts.setdefault(sample['role'], [])
+            if len(examples) < FIRST_TEXTS:
+                examples.append(sample['text'])
+        names = list(texts)
+        vectors = sentence_model.encode([" ".join(texts[role]) for role in names]) if names else []
+        return dict(zip(names, vectors))
+
+    # Centroid: running sums over batches of texts, never the whole corpus
+    sums = {}
+    counts = {}
+    batch_texts, batch_roles = [], []
+
+    def flush():
+        vectors = sentence_model.encode(batch_texts, batch_size=64, normalize_embeddings=True)
+        for role, vector in zip(batch_roles, vectors):
+            if role in sums:
+                sums[role] += vector
+            else:
+                sums[role] = vector.astype(np.float64)
+            counts[role] = counts.get(role, 0) + 1
+        batch_texts.clear()
+        batch_roles.clear()
+
+    for sample in iter_corpus(dataset_dir):
+        if sample['role'] in wanted:
+            batch_texts.append(sample['text'])
+            batch_roles.append(sample['role'])
+            if len(batch_texts) >= ENCODE_BATCH_SIZE:
+                flush()
+    if batch_texts:
+        flush()
+    return {role: (sums[role] / counts[role]).astype(np.float32) for role in sums}
+
+def _load_existing(model_dir: Path) -> Dict[str, tuple]:
+    """Career -> (content hash, embedding) from a previous build, if any"""
+    try:
+        with open(model_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        embeddings = np.load(model_dir / "career_embeddings.npy")
+    except (FileNotFoundError, json.JSONDecodeError, ValueError):
+        return {}
+    if len(manifest.get('classes', [])) != len(embeddings):
+        return {}
+    return {
+        role: (manifest['hashes'].get(role), embeddings[i])
+        for i, role in enumerate(manifest['classes'])
+    }
+
+def build_embeddings(
+    classes: List[str],
+    base_model: str,
+    model_dir: Path,
+    dataset_dir: Path = DATASET_DIR,
+    aggregation: str = 'first',
+    rebuild: bool = False
+) -> Dict:
+    """
+    Create or update career_embeddings.npy in a model directory
+
+    Careers whose content hash matches the previous build keep their stored
+    embedding; only new or changed careers are encoded. The .npy and its
+    manifest are replaced atomically, so a running app keeps reading the
+    previous file until it reloads.
+
+    Args:
+        classes: Careers in label encoder order (rows of the output)
+        base_model: Sentence model used for the embeddings
+        model_dir: Directory holding career_embeddings.npy
+        dataset_dir: Directory with the dataset CSV files
+        aggregation: 'first' (notebook) or 'centroid'
+        rebuild: Encode every career regardless of the previous build
+
+    Returns:
+        Dict with the careers encoded, the number reused, careers with no
+        texts in the datasets (their previous embedding is kept if there is
+        one, else a zero vector) and careers in the datasets that are not in
+        classes (the classifier must be retrained to add them)
+    """
+    if aggregation not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation '{aggregation}' (expected one of {AGGREGATIONS})")
+
+    model_dir = Path(model_dir)
+    hashes = role_hashes(dataset_dir, base_model, aggregation)
+    existing = {} if rebuild else _load_existing(model_dir)
+    stale = [
+        role for role in classes
+        if role in hashes and existing.get(role, (None,))[0] != hashes[role]
+    ]
+
+    encoded = {}
+    if stale:
+        from sentence_transformers import SentenceTransformer
+
+        encoded = encode_roles(stale, dataset_dir, SentenceTransformer(base_model), aggregation)
+
+    vectors = []
+    reused = 0
+    missing = []
+    for role in classes:
+        if role not in hashes:
+            missing.append(role)
+        if role in encoded:
+            vectors.append(encoded[role])
+        elif role in existing:
+            vectors.append(existing[role][1])
+            reused += 1
+        else:
+            vectors.append(None)
+    dimension = next((len(v) for v in vectors if v is not None), 0)
+    embeddings = np.stack([
+        np.zeros(dimension, dtype=np.float32) if v is None else np.asarray(v, dtype=np.float32)
+        for v in vectors
+    ]) if classes else np.zeros((0, dimension), dtype=np.float32)
+
+    manifest = {
+        'base_model': base_model,
+        'aggregation': aggregation,
+        'classes': list(classes),
+        'hashes': {role: hashes[role] for role in classes if role in hashes},
+    }
+
+    model_dir.mkdir(parents=True, exist_ok=True)
+    embeddings_path = model_dir / "career_embeddings.npy"
+    tmp_path = embeddings_path.with_name(embeddings_path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        np.save(f, embeddings)
+    os.replace(tmp_path, embeddings_path)
+
+    manifest_path = model_dir / MANIFEST_NAME
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+    return {
+        'encoded': [role for role in classes if role in encoded],
+        'reused': reused,
+        'missing': missing,
+        'not_in_model': sorted(set(hashes) - set(classes)),
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point (see build_embeddings.py)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Update the career similarity embeddings of a model")
+    parser.add_argument("--model-dir", type=Path, help="Model directory (default: the app's models/)")
+    parser.add_argument("--datasets", type=Path, default=DATASET_DIR, help="Directory with the dataset CSV files")
+    parser.add_argument("--aggregation", choices=AGGREGATIONS,
+                        help="'first': first 5 texts joined (notebook); 'centroid': mean over all texts "
+                             "(default: as in the previous build, else 'first')")
+    parser.add_argument("--rebuild", action="store_true", help="Encode every career")
+    args = parser.parse_args(argv)
+
+    model_dir = args.model_dir
+    if model_dir is None:
+        from .model_loader import MODEL_DIR
+        model_dir = MODEL_DIR
+
+    try:
+        with open(model_dir / "model_metadata.json", 'r') as f:
+            metadata = json.load(f)
+        with open(model_dir / "label_encoder.pkl", 'rb') as f:
+            classes = pickle.load(f).classes_.tolist()
+    except (OSError, ValueError) as e:
+        print(f"Error: could not read the model in {model_dir}: {e}", file=sys.stderr)
+        return 1
+
+    config = metadata['model_config']
+    aggregation = args.aggregation or config.get('embedding_aggregation', 'first')
+    stats = build_embeddings(
+        classes,
+        config['base_model'],
+        model_dir,
+        dataset_dir=args.datasets,
+        aggregation=aggregation,
+        rebuild=args.rebuild
+    )
+
+    if config.get('embedding_aggregation', 'first') != aggregation:
+        config['embedding_aggregation'] = aggregation
+        tmp_path = model_dir / "model_metadata.json.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(metadata, f, indent=2)
+        os.replace(tmp_path, model_dir / "model_metadata.json")
+
+    print(json.dumps({**stats, 'aggregation': aggregation}))
+    if stats['not_in_model']:
+        print(
+            f"Note: {len(stats['not_in_model'])} career(s) in the datasets are not in the model; "
+            "retrain (e.g., train.py --frozen-backbone) to add them",
+            file=sys.stderr
+        )
+    return 0
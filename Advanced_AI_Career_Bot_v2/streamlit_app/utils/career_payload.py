@@ -0,0 +1,130 @@
+"""
+Career Payloads - Precomputed render payloads for the results view
+Assembles resources, salary, roadmap link and top books for a career once
+and serves them from a process-wide, version-stamped cache
+"""
+
+import hashlib
+import json
+import threading
+from typing import Dict, List
+
+from .resource_finder import LEARNING_RESOURCES, SALARY_INFO, get_learning_resources, get_salary_info
+from .roadmap_fetcher import ROADMAP_MAPPING, get_roadmap_url
+from .books_recommender import BOOKS_DATABASE, recommend_books
+
+# Number of items shown per section of a career card
+TOP_COURSES = 3
+TOP_CERTIFICATIONS = 2
+TOP_BOOKS = 3
+
+# Global variables for the payload cache
+_payload_cache = {}
+_payload_lock = threading.Lock()
+_catalog_version = None
+
+def get_catalog_version() -> str:
+    """
+    Get the version stamp of the catalogs that payloads are built from
+
+    The stamp is a short hash of the resource, salary, roadmap and book
+    catalogs. It is computed once per process, so a catalog edited at
+    runtime only invalidates previously built payloads after
+    clear_payload_cache() (or a restart).
+    """
+    global _catalog_version
+
+    if _catalog_version is None:
+        catalogs = [LEARNING_RESOURCES, SALARY_INFO, ROADMAP_MAPPING, BOOKS_DATABASE]
+        digest = hashlib.sha1(json.dumps(catalogs, sort_keys=True).encode('utf-8'))
+        _catalog_version = digest.hexdigest()[:12]
+
+    return _catalog_version
+
+def _bullet_list(items: List[str]) -> str:
+    """Render items as a markdown bullet list"""
+    return "\n".join(f"- {item}" for item in items)
+
+def build_career_payload(career: str) -> Dict:
+    """
+    Build the render payload for a career card
+
+    Args:
+        career: Career name
+
+    Returns:
+        Dictionary with top resources, salary ranges, roadmap URL, top books,
+        pre-rendered markdown blocks and the catalog version it was built from
+    """
+    resources = get_learning_resources(career)
+    courses = list(resources['courses'][:TOP_COURSES])
+    certifications = list(resources['certifications'][:TOP_CERTIFICATIONS])
+    books = [
+        {'title': book['title'], 'author': book['author']}
+        for book in recommend_books(career, count=TOP_BOOKS)
+    ]
+
+    resources_md = []
+    if courses:
+        resources_md.append("**Recommended Courses:**\n" + _bullet_list(courses))
+    if certifications:
+        resources_md.append("**Certifications:**\n" + _bullet_list(certifications))
+
+    return {
+        'career': career,
+        'version': get_catalog_version(),
+        'courses': courses,
+        'certifications': certifications,
+        'salary': dict(get_salary_info(career)),
+        'roadmap_url': get_roadmap_url(career),
+        'books': books,
+        'resources_md': "\n\n".join(resources_md),
+        'books_md': _bullet_list(f"*{b['title']}* - {b['author']}" for b in books)
+    }
+
+def get_career_payload(career: str) -> Dict:
+    """
+    Get the cached render payload for a career, building it on first use
+
+    Args:
+        career: Career name
+
+    Returns:
+        Payload dictionary (shared across sessions - treat as read-only)
+    """
+    key = (career, get_catalog_version())
+    payload = _payload_cache.get(key)
+
+    if payload is None:
+        with _payload_lock:
+            payload = _payload_cache.get(key)
+            if payload is None:
+                payload = build_career_payload(career)
+                _payload_cache[key] = payload
+
+    return payload
+
+def get_career_payloads(careers: List[str]) -> List[Dict]:
+    """Get payloads for several careers (e.g., all recommendations on screen)"""
+    return [get_career_payload(career) for career in careers]
+
+def warm_payload_cache(careers: List[str]) -> int:
+    """
+    Prebuild payloads for a list of careers
+
+    Args:
+        careers: Careers to prebuild (e.g., get_all_careers())
+
+    Returns:
+        Number of payloads in the cache afterwards
+    """
+    get_career_payloads(careers)
+    return len(_payload_cache)
+
+def clear_payload_cache():
+    """Drop all cached payloads and recompute the catalog version"""
+    global _catalog_version
+
+    with _payload_lock:
+        _payload_cache.clear()
+        _catalog_version = None
@@ -0,0 +1,260 @@
+"""
+Chat Store - Bounded, compacting chat history per session
+Keeps the most recent messages in memory and spills older turns, compressed,
+to SQLite keyed by session so long conversations stay cheap to hold and render.
+With a shared session store, older turns are spilled to that store instead,
+so they follow the session to any worker or host.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from collections import deque
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .session_store import SessionStore
+
+# SQLite file for spilled messages (shared by all sessions); defaults to the
+# user's data directory, outside the source tree and private to the user
+CHAT_DB_PATH = Path(os.environ.get(
+    "CAREER_CHAT_DB",
+    Path(os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share") / "career_bot" / "chat_history.db"
+))
+
+# Spilled messages older than this are deleted when a process first opens the file
+CHAT_RETENTION_DAYS = float(os.environ.get("CAREER_CHAT_RETENTION_DAYS", "30"))
+
+# Messages kept in memory per session before older ones are spilled
+CHAT_MEMORY_LIMIT = 50
+
+# Messages rendered per page in the chat view
+CHAT_WINDOW = 20
+
+# Session store values holding spilled turns ("chat_turns:<first seq>")
+PAGE_KEY = "chat_turns:{}"
+
+# Serializes schema creation per database file
+_schema_lock = threading.Lock()
+_schema_ready = set()
+
+def _create_private(db_path: Path):
+    """Create the database file readable by its owner only (SQLite's journal follows its mode)"""
+    db_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    try:
+        os.close(os.open(db_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+    except FileExistsError:
+        pass
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    """Open the chat database, creating the table and purging old messages on first use"""
+    if db_path not in _schema_ready:
+        _create_private(db_path)
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    if db_path not in _schema_ready:
+        with _schema_lock:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS chat_messages (
+                    session_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    role TEXT NOT NULL,
+                    content BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (session_id, seq)
+                ) WITHOUT ROWID
+            """)
+            _purge(conn, CHAT_RETENTION_DAYS)
+            conn.commit()
+            _schema_ready.add(db_path)
+    return conn
+
+def _purge(conn: sqlite3.Connection, max_age_days: float) -> int:
+    """Delete messages older than max_age_days (caller commits)"""
+    cutoff = time.time() - max_age_days * 86400
+    return conn.execute("DELETE FROM chat_messages WHERE created_at < ?", (cutoff,)).rowcount
+
+class ChatStore:
+    """Chat history for one session: recent messages in memory, older ones in SQLite or the session store"""
+
+    def __init__(
+        self,
+        session_id: Optional[str] = None,
+        db_path: Optional[Path] = None,
+        memory_limit: int = CHAT_MEMORY_LIMIT,
+        store: Optional[SessionStore] = None,
+        owner: Optional[str] = None
+    ):
+        """
+        Args:
+            session_id: Key for this conversation (default: a new random id)
+            db_path: SQLite file for older messages (default: CHAT_DB_PATH)
+            memory_limit: Messages kept in memory before compacting
+            store: Session store for older messages instead of db_path; they
+                   are kept with the session of that id and expire with it
+            owner: Opaque id of whoever may resume the conversation (see
+                   from_dict); not checked here
+        """
+        self.session_id = session_id or uuid.uuid4().hex
+        self.db_path = Path(db_path or CHAT_DB_PATH)
+        self.store = store
+        self.owner = owner
+        self.memory_limit = max(2, memory_limit)
+        self._recent = deque()
+        self._spilled = 0  # messages with seq < _spilled are spilled
+        self._pages = []  # first seq of each page spilled to the session store
+        self._lock = threading.Lock()
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable state, for a session store (spilled turns stay where they are)"""
+        with self._lock:
+            return {
+                'session_id': self.session_id,
+                'owner': self.owner,
+                'memory_limit': self.memory_limit,
+                'recent': list(self._recent),
+                'spilled': self._spilled,
+                'pages': list(self._pages),
+            }
+
+    @classmethod
+    def from_dict(
+        cls,
+        data: Dict,
+        db_path: Optional[Path] = None,
+        store: Optional[SessionStore] = None
+    ) -> "ChatStore":
+        """
+        Resume a conversation saved with to_dict()
+
+        Args:
+            data: Result of to_dict()
+            db_path: SQLite file the older messages were spilled to
+            store: Session store the older messages were spilled to
+
+        Returns:
+            ChatStore continuing the conversation
+        """
+        chat_store = cls(data['session_id'], db_path=db_path, memory_limit=data['memory_limit'],
+                         store=store, owner=data.get('owner'))
+        chat_store._recent.extend(data['recent'])
+        chat_store._spilled = data['spilled']
+        chat_store._pages = list(data['pages'])
+        return chat_store
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._recent)
+
+    def append(self, role: str, content: str):
+        """
+        Add a message, compacting the oldest half when over the limit
+
+        Args:
+            role: "user" or "assistant"
+            content: Message text
+        """
+        with self._lock:
+            self._recent.append({"role": role, "content": content})
+            if len(self._recent) > self.memory_limit:
+                self._spill(len(self._recent) - self.memory_limit // 2)
+
+    def _spill(self, count: int):
+        """Move the oldest `count` in-memory messages out of memory (lock held)"""
+        messages = [self._recent.popleft() for _ in range(count)]
+
+        if self.store is not None:
+            # One value per spill; the store compresses it
+            self.store.set(self.session_id, PAGE_KEY.format(self._spilled), messages)
+            self._pages.append(self._spilled)
+        else:
+            now = time.time()
+            rows = [
+                (
+                    self.session_id,
+                    seq,
+                    message["role"],
+                    zlib.compress(message["content"].encode("utf-8")),
+                    now
+                )
+                for seq, message in enumerate(messages, self._spilled)
+            ]
+            with closing(_connect(self.db_path)) as conn:
+                conn.executemany("INSERT OR REPLACE INTO chat_messages VALUES (?, ?, ?, ?, ?)", rows)
+                conn.commit()
+        self._spilled += count
+
+    def _load(self, start: int, stop: int) -> List[Dict[str, str]]:
+        """Spilled messages with start <= seq < stop, oldest first"""
+        if start >= stop:
+            return []
+
+        if self.store is not None:
+            with self._lock:
+                bounds = list(zip(self._pages, self._pages[1:] + [self._spilled]))
+            messages = []
+            for first, end in bounds:
+                if end > start and first < stop:
+                    page = self.store.get(self.session_id, PAGE_KEY.format(first)) or []
+                    messages.extend(page[max(0, start - first):stop - first])
+            return messages
+
+        with closing(_connect(self.db_path)) as conn:
+            rows = conn.execute(
+                "SELECT role, content FROM chat_messages "
+                "WHERE session_id = ? AND seq >= ? AND seq < ? ORDER BY seq",
+                (self.session_id, start, stop)
+            ).fetchall()
+        return [{"role": role, "content": zlib.decompress(content).decode("utf-8")} for role, content in rows]
+
+    def recent(self, count: int = CHAT_WINDOW) -> List[Dict[str, str]]:
+        """
+        The last `count` messages, oldest first
+
+        Served from memory when possible; older messages are paged in only
+        when the window reaches back past the in-memory ones.
+        """
+        with self._lock:
+            recent = list(self._recent)
+            spilled = self._spilled
+
+        if count <= len(recent):
+            return recent[len(recent) - count:]
+
+        start = max(0, spilled - (count - len(recent)))
+        return self._load(start, spilled) + recent
+
+    def clear(self):
+        """Delete the whole conversation, in memory and wherever it was spilled"""
+        with self._lock:
+            self._recent.clear()
+            if self.store is not None:
+                for first in self._pages:
+                    self.store.delete(self.session_id, PAGE_KEY.format(first))
+            elif self._spilled:
+                with closing(_connect(self.db_path)) as conn:
+                    conn.execute("DELETE FROM chat_messages WHERE session_id = ?", (self.session_id,))
+                    conn.commit()
+            self._spilled = 0
+            self._pages = []
+
+def purge_chat_history(max_age_days: float = 30, db_path: Optional[Path] = None) -> int:
+    """
+    Delete spilled messages older than max_age_days for all sessions
+
+    Runs automatically (with CHAT_RETENTION_DAYS) the first time a process
+    opens the file; call it directly to purge a long-running process's file.
+
+    Returns:
+        Number of messages deleted
+    """
+    db_path = Path(db_path or CHAT_DB_PATH)
+    if not db_path.exists():
+        return 0
+
+    with closing(_connect(db_path)) as conn:
+        deleted = _purge(conn, max_age_days)
+        conn.commit()
+    return deleted
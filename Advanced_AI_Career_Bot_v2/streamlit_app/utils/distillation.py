@@ -0,0 +1,285 @@
+"""
+Distillation - Train a smaller student model from the deployed classifier
+The student (model_loader.StudentClassifier) keeps a few evenly spaced layers
+of the fine-tuned encoder and learns from the teacher on the merged corpus:
+the classifier's softened logits, the true labels, and the sentence model's
+embeddings (so one student pass replaces both teacher encoders at inference)
+
+Run it with distill.py (see docs/TRAINING.md); select the student with
+CAREER_MODEL_VARIANT=student.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+from . import model_loader
+from .trainer import configure_threads, load_training_data, make_loader, split_indices
+from .training_data import DATASET_DIR, TokenizedDataset, make_collate, pretokenize
+
+# Student defaults
+DISTILL_CONFIG = {
+    'num_layers': 2,
+    'batch_size': 32,
+    'learning_rate': 1e-4,
+    'weight_decay': 0.01,
+    'num_epochs': 10,
+    'temperature': 2.0,
+    # Loss = alpha * soft-label KL + (1 - alpha) * hard-label CE + beta * embedding cosine loss
+    'alpha': 0.7,
+    'beta': 1.0,
+}
+
+def student_layers(teacher_layers: int, num_layers: int) -> List[int]:
+    """Evenly spaced teacher layers copied into the student (always includes the last)"""
+    if num_layers >= teacher_layers:
+        return list(range(teacher_layers))
+    step = teacher_layers / num_layers
+    return [int(round(step * (i + 1))) - 1 for i in range(num_layers)]
+
+def init_student(teacher: nn.Module, base_model: str, num_classes: int, num_layers: int,
+                 embedding_dim: int) -> model_loader.StudentClassifier:
+    """
+    Student initialized from the teacher: embeddings, selected encoder layers
+    and classifier head are copied; the embedding head starts as identity
+    """
+    student = model_loader.StudentClassifier(
+        base_model,
+        num_classes,
+        num_layers=num_layers,
+        hidden_dim=teacher.classifier[0].out_features,
+        dropout=teacher.dropout.p,
+        embedding_dim=embedding_dim
+    )
+    teacher_state = teacher.base_model.state_dict()
+    layers = student_layers(teacher.base_model.config.num_hidden_layers, num_layers)
+    state = {}
+    for key in student.base_model.state_dict():
+        source = key
+        if key.startswith("encoder.layer."):
+            index, rest = key[len("encoder.layer."):].split(".", 1)
+            source = f"encoder.layer.{layers[int(index)]}.{rest}"
+        state[key] = teacher_state[source]
+    student.base_model.load_state_dict(state)
+    student.classifier.load_state_dict(teacher.classifier.state_dict())
+
+    with torch.no_grad():
+        head = student.embedding_head
+        head.weight.zero_()
+        head.bias.zero_()
+        size = min(head.in_features, head.out_features)
+        head.weight[:size, :size] = torch.eye(size)
+    return student
+
+def teacher_targets(texts: List[str], corpus, collate_fn, batch_size: int = 64) -> Dict[str, torch.Tensor]:
+    """Teacher logits and sentence embeddings of every sample (computed once)"""
+    loader = make_loader(TokenizedDataset(corpus, np.zeros(len(corpus), dtype=np.int64)),
+                         collate_fn, batch_size, shuffle=False)
+    logits = torch.zeros((len(corpus), model_loader._metadata['num_classes']))
+    with torch.no_grad():
+        for indices, batch in zip(loader.batch_sampler, loader):
+            logits[indices] = model_loader._model(batch['input_ids'], batch['attention_mask'])
+    embeddings = model_loader._sentence_model.encode(texts, batch_size=batch_size, convert_to_tensor=True)
+    return {'logits': logits, 'embeddings': embeddings.float()}
+
+def distill_epoch(student, loader, targets, optimizer, config) -> Dict[str, float]:
+    """One distillation epoch; returns the mean loss terms and seconds"""
+    student.train()
+    temperature = config['temperature']
+    totals = {'kl': 0.0, 'ce': 0.0, 'cosine': 0.0}
+    seen = 0
+    start = time.perf_counter()
+
+    for indices, batch in zip(loader.batch_sampler, loader):
+        positions = loader.dataset.indices[indices]
+        logits, embeddings = student.classify_and_embed(batch['input_ids'], batch['attention_mask'])
+        soft = F.kl_div(
+            F.log_softmax(logits / temperature, dim=1),
+            F.softmax(targets['logits'][positions] / temperature, dim=1),
+            reduction='batchmean'
+        ) * temperature ** 2
+        hard = F.cross_entropy(logits, batch['label'])
+        cosine = (1 - F.cosine_similarity(embeddings, targets['embeddings'][positions], dim=1)).mean()
+        loss = config['alpha'] * soft + (1 - config['alpha']) * hard + config['beta'] * cosine
+
+        optimizer.zero_grad()
+        loss.backward()
+        torch.nn.utils.clip_grad_norm_(student.parameters(), 1.0)
+        optimizer.step()
+
+        for name, value in (('kl', soft), ('ce', hard), ('cosine', cosine)):
+            totals[name] += value.item() * len(indices)
+        seen += len(indices)
+
+    stats = {name: total / max(seen, 1) for name, total in totals.items()}
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+def distill(
+    config: Optional[Dict] = None,
+    dataset_dir: Path = DATASET_DIR,
+    seed: int = 42,
+    log: Optional[Callable[[Dict], None]] = None
+) -> Dict:
+    """
+    Distill the deployed model (MODEL_DIR) into a student and save it next
+    to the teacher as career_model_student.pth
+
+    Args:
+        config: Overrides of DISTILL_CONFIG
+        dataset_dir: Directory with the dataset CSV files
+        seed: Seed of initialization and batch order
+        log: Called with each epoch's stats
+
+    Returns:
+        Dict with the student config, per-epoch history and the texts of
+        the validation split (for the agreement report)
+    """
+    config = {**DISTILL_CONFIG, **(config or {})}
+    torch.manual_seed(seed)
+
+    if not model_loader.load_model(variant="full"):
+        raise ValueError(f"Could not load the teacher model from {model_loader.MODEL_DIR}")
+    teacher = model_loader._model
+    classes = model_loader._label_encoder.classes_.tolist()
+    base_model = model_loader._metadata['model_config']['base_model']
+    max_length = model_loader._metadata['model_config'].get('max_length', model_loader.MAX_LENGTH)
+
+    data = load_training_data(dataset_dir)
+    # Labels follow the teacher's classes; careers it does not know are skipped
+    index = {role: i for i, role in enumerate(classes)}
+    keep = [i for i, label in enumerate(data['labels']) if data['classes'][label] in index]
+    texts = [data['texts'][i] for i in keep]
+    labels = [index[data['classes'][data['labels'][i]]] for i in keep]
+    if not texts:
+        raise ValueError(f"No training samples for the model's careers in {dataset_dir}")
+
+    tokenizer = model_loader._tokenizer
+    corpus = pretokenize(texts, tokenizer, max_length)
+    collate_fn = make_collate(tokenizer)
+    targets = teacher_targets(texts, corpus, collate_fn)
+
+    student = init_student(teacher, base_model, len(classes), config['num_layers'], targets['embeddings'].shape[1])
+    train_idx, val_idx = split_indices(texts, labels, 0.15)
+    loader = make_loader(TokenizedDataset(corpus, labels, train_idx), collate_fn, config['batch_size'], seed=seed)
+    optimizer = torch.optim.AdamW(student.parameters(), lr=config['learning_rate'], weight_decay=config['weight_decay'])
+
+    history = []
+    for epoch in range(config['num_epochs']):
+        loader.batch_sampler.set_epoch(epoch)
+        stats = {'epoch': epoch + 1, **distill_epoch(student, loader, targets, optimizer, config)}
+        history.append(stats)
+        if log:
+            log(stats)
+
+    student.eval()
+    student_config = {
+        'num_layers': config['num_layers'],
+        'hidden_dim': student.classifier[0].out_features,
+        'dropout': student.dropout.p,
+        'embedding_dim': student.embedding_head.out_features,
+    }
+    tmp_path = model_loader.STUDENT_PATH.with_name(model_loader.STUDENT_PATH.name + ".tmp")
+    torch.save({
+        'model_state_dict': student.state_dict(),
+        'student_config': student_config,
+        'distill_config': config,
+        'history': history,
+    }, tmp_path)
+    tmp_path.replace(model_loader.STUDENT_PATH)
+
+    return {
+        'student_config': student_config,
+        'history': history,
+        'validation_texts': [texts[i] for i in val_idx],
+        'texts': texts,
+    }
+
+def _latency(queries: List[str], top_k: int) -> Dict:
+    """Recommendations per query, and single-query and batched latency"""
+    model_loader.get_career_recommendations_batch(queries[:1], top_k=top_k)  # warm up
+    results = []
+    single_ms = []
+    for query in queries:
+        start = time.perf_counter()
+        results.extend(model_loader.get_career_recommendations_batch([query], top_k=top_k))
+        single_ms.append((time.perf_counter() - start) * 1000)
+    model_loader.clear_token_cache()
+    start = time.perf_counter()
+    model_loader.get_career_recommendations_batch(queries, top_k=top_k)
+    batch_ms = (time.perf_counter() - start) * 1000
+    single_ms.sort()
+    return {
+        'results': results,
+        'p50_ms': round(single_ms[len(single_ms) // 2], 2),
+        'mean_ms': round(sum(single_ms) / len(single_ms), 2),
+        'batch_ms_per_query': round(batch_ms / len(queries), 2),
+    }
+
+def agreement_report(queries: List[str], top_k: int = 5) -> Dict:
+    """
+    Compare the full model and the student on the same queries
+
+    Loads each variant from MODEL_DIR in turn (the full model is loaded
+    again at the end).
+
+    Returns:
+        Latency per variant, the student's speedup, and top-k agreement:
+        the share of queries with the same top career and the mean overlap
+        of the top-k careers
+    """
+    report = {'queries': len(queries), 'top_k': top_k}
+    careers = {}
+    for variant in ("full", "student"):
+        if not model_loader.load_model(variant=variant):
+            raise ValueError(f"Could not load the {variant} model")
+        measured = _latency(queries, top_k)
+        careers[variant] = [[rec['career'] for rec in recs] for recs in measured.pop('results')]
+        report[variant] = measured
+    model_loader.load_model(variant="full")
+
+    pairs = list(zip(careers['full'], careers['student']))
+    report['top1_agreement'] = round(sum(t[:1] == s[:1] for t, s in pairs) / len(pairs), 3)
+    report[f'top{top_k}_overlap'] = round(
+        sum(len(set(t) & set(s)) / max(len(t), 1) for t, s in pairs) / len(pairs), 3
+    )
+    report['speedup'] = round(report['full']['p50_ms'] / report['student']['p50_ms'], 2)
+    return report
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point (see distill.py)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Distill the deployed career model into a smaller student")
+    parser.add_argument("--datasets", type=Path, default=DATASET_DIR, help="Directory with the dataset CSV files")
+    parser.add_argument("--layers", type=int, default=DISTILL_CONFIG['num_layers'], help="Student encoder layers")
+    parser.add_argument("--epochs", type=int, default=DISTILL_CONFIG['num_epochs'], help="Distillation epochs")
+    parser.add_argument("--batch-size", type=int, default=DISTILL_CONFIG['batch_size'], help="Samples per batch")
+    parser.add_argument("--threads", type=int, help="Intra-op threads (default: all cores)")
+    parser.add_argument("--top-k", type=int, default=5, help="Recommendations compared in the report")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args(argv)
+
+    configure_threads(args.threads)
+    config = {'num_layers': args.layers, 'num_epochs': args.epochs, 'batch_size': args.batch_size}
+
+    def log(stats):
+        print(json.dumps({k: round(v, 4) if isinstance(v, float) else v for k, v in stats.items()}))
+
+    try:
+        result = distill(config, dataset_dir=args.datasets, seed=args.seed, log=log)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    # Report on held-out texts when there are enough, else on all texts
+    queries = result['validation_texts'] if len(result['validation_texts']) >= 50 else result['texts']
+    print(json.dumps(agreement_report(queries, top_k=args.top_k)))
+    return 0
@@ -0,0 +1,290 @@
+"""
+Early Exit - Train exit heads on the intermediate layers of the classifier
+Each head (model_loader.ExitHeads) classifies from the [CLS] state of one
+encoder layer of the frozen, deployed model. At inference a query stops at
+the first layer whose head is confident enough, so easy queries skip the
+remaining layers.
+
+Heads learn from the full model's softened logits and the true labels, so
+an early exit tends to give the answer the full model would have given.
+Run it with train_exits.py (see docs/TRAINING.md); enable it with
+CAREER_EXIT_THRESHOLD or the exit_threshold argument.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+from . import model_loader
+from .trainer import configure_threads, load_training_data, split_indices
+from .training_data import DATASET_DIR, LengthBucketSampler, make_collate, pretokenize
+
+# Exit head defaults
+EXIT_CONFIG = {
+    'head_dim': 128,
+    'batch_size': 64,
+    'learning_rate': 1e-3,
+    'num_epochs': 30,
+    'temperature': 2.0,
+    # Loss = alpha * soft-label KL + (1 - alpha) * hard-label CE
+    'alpha': 0.7,
+}
+
+# Thresholds compared by the report
+REPORT_THRESHOLDS = (0.5, 0.7, 0.8, 0.9, 0.95)
+
+def layer_states(corpus, collate_fn, batch_size: int = 64) -> Dict[str, torch.Tensor]:
+    """
+    [CLS] state after every encoder layer and the full model's logits for
+    every sample (one encoder pass)
+
+    Returns:
+        Dict with 'states' (layers, samples, hidden size) and 'logits'
+        (samples, classes)
+    """
+    model = model_loader._model
+    num_layers = model.base_model.config.num_hidden_layers
+    states = torch.zeros((num_layers, len(corpus), model.base_model.config.hidden_size))
+    logits = torch.zeros((len(corpus), model_loader._metadata['num_classes']))
+
+    # Length order keeps padding minimal
+    batches = LengthBucketSampler(corpus.lengths, batch_size, shuffle=False)
+    with torch.inference_mode():
+        for batch in batches:
+            padded = collate_fn([(corpus[i], 0) for i in batch])
+            output = model.base_model(
+                input_ids=padded['input_ids'],
+                attention_mask=padded['attention_mask'],
+                output_hidden_states=True
+            )
+            for layer in range(num_layers):
+                states[layer, batch] = output.hidden_states[layer + 1][:, 0, :]
+            logits[batch] = model.classifier(output.last_hidden_state[:, 0, :])
+    return {'states': states, 'logits': logits}
+
+def train_exit_head(head, states, targets, labels, train_idx, val_idx, config, seed=42) -> Dict:
+    """
+    Train one exit head on cached layer states
+
+    Returns:
+        Dict with the final loss and, on the validation split, the head's
+        accuracy and its top-1 agreement with the full model
+    """
+    torch.manual_seed(seed)
+    temperature = config['temperature']
+    optimizer = torch.optim.AdamW(head.parameters(), lr=config['learning_rate'])
+    train_idx = torch.as_tensor(train_idx, dtype=torch.long)
+
+    head.train()
+    for _ in range(config['num_epochs']):
+        total = 0.0
+        for batch in train_idx[torch.randperm(len(train_idx))].split(config['batch_size']):
+            logits = head(states[batch])
+            soft = F.kl_div(
+                F.log_softmax(logits / temperature, dim=1),
+                F.softmax(targets[batch] / temperature, dim=1),
+                reduction='batchmean'
+            ) * temperature ** 2
+            hard = F.cross_entropy(logits, labels[batch])
+            loss = config['alpha'] * soft + (1 - config['alpha']) * hard
+
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            total += loss.item() * len(batch)
+    head.eval()
+
+    stats = {'loss': total / max(len(train_idx), 1)}
+    if len(val_idx):
+        val_idx = torch.as_tensor(val_idx, dtype=torch.long)
+        with torch.no_grad():
+            predicted = head(states[val_idx]).argmax(dim=1)
+        stats['val_accuracy'] = (predicted == labels[val_idx]).float().mean().item()
+        stats['val_agreement'] = (predicted == targets[val_idx].argmax(dim=1)).float().mean().item()
+    return stats
+
+def train_exits(
+    config: Optional[Dict] = None,
+    dataset_dir: Path = DATASET_DIR,
+    seed: int = 42,
+    log: Optional[Callable[[Dict], None]] = None
+) -> Dict:
+    """
+    Train exit heads for the deployed model (MODEL_DIR) and save them next
+    to it as career_model_exits.pth
+
+    Args:
+        config: Overrides of EXIT_CONFIG
+        dataset_dir: Directory with the dataset CSV files
+        seed: Seed of initialization and batch order
+        log: Called with each head's stats
+
+    Returns:
+        Dict with per-head history and the texts of the validation split
+        (for the exit report)
+    """
+    config = {**EXIT_CONFIG, **(config or {})}
+    torch.manual_seed(seed)
+
+    if not model_loader.load_model(variant="full"):
+        raise ValueError(f"Could not load the model from {model_loader.MODEL_DIR}")
+    model = model_loader._model
+    classes = model_loader._label_encoder.classes_.tolist()
+    max_length = model_loader._metadata['model_config'].get('max_length', model_loader.MAX_LENGTH)
+
+    data = load_training_data(dataset_dir)
+    # Labels follow the model's classes; careers it does not know are skipped
+    index = {role: i for i, role in enumerate(classes)}
+    keep = [i for i, label in enumerate(data['labels']) if data['classes'][label] in index]
+    texts = [data['texts'][i] for i in keep]
+    labels = [index[data['classes'][data['labels'][i]]] for i in keep]
+    if not texts:
+        raise ValueError(f"No training samples for the model's careers in {dataset_dir}")
+
+    tokenizer = model_loader._tokenizer
+    corpus = pretokenize(texts, tokenizer, max_length)
+    cached = layer_states(corpus, make_collate(tokenizer))
+    train_idx, val_idx = split_indices(texts, labels, 0.15)
+
+    # Every layer but the last, which already has the model's classifier
+    layers = list(range(model.base_model.config.num_hidden_layers - 1))
+    heads = model_loader.ExitHeads(
+        model.base_model.config.hidden_size,
+        len(classes),
+        layers,
+        head_dim=config['head_dim']
+    )
+    label_tensor = torch.as_tensor(labels, dtype=torch.long)
+    history = []
+    for layer, head in zip(layers, heads.heads):
+        start = time.perf_counter()
+        stats = train_exit_head(head, cached['states'][layer], cached['logits'], label_tensor,
+                                train_idx, val_idx, config, seed=seed)
+        stats = {'layer': layer + 1, **stats, 'seconds': time.perf_counter() - start}
+        history.append(stats)
+        if log:
+            log(stats)
+
+    exit_config = {'layers': layers, 'head_dim': config['head_dim']}
+    tmp_path = model_loader.EXITS_PATH.with_name(model_loader.EXITS_PATH.name + ".tmp")
+    torch.save({
+        'model_state_dict': heads.state_dict(),
+        'exit_config': exit_config,
+        'train_config': config,
+        'history': history,
+    }, tmp_path)
+    tmp_path.replace(model_loader.EXITS_PATH)
+
+    return {
+        'exit_config': exit_config,
+        'history': history,
+        'validation_texts': [texts[i] for i in val_idx],
+        'texts': texts,
+    }
+
+def _measure(queries: List[str], threshold: Optional[float]) -> Dict:
+    """Top career, layers run and classifier/end-to-end milliseconds per query"""
+    model = model_loader._model
+    careers, layers, classifier_ms, total_ms = [], [], [], []
+    for query in queries:
+        start = time.perf_counter()
+        encoding = model_loader.tokenize_queries([query])
+        with torch.no_grad():
+            if threshold is None:
+                model(encoding['input_ids'], encoding['attention_mask'])
+                layers.append(model.base_model.config.num_hidden_layers)
+            else:
+                _, run = model_loader._exit_heads(model, encoding['input_ids'], encoding['attention_mask'], threshold)
+                layers.append(int(run[0]))
+        classifier_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        results = model_loader.get_career_recommendations_batch([query], exit_threshold=threshold)
+        total_ms.append((time.perf_counter() - start) * 1000)
+        careers.append(results[0][0]['career'])
+    return {
+        'careers': careers,
+        'avg_layers': float(np.mean(layers)),
+        'classifier_ms': float(np.median(classifier_ms)),
+        'total_ms': float(np.median(total_ms)),
+    }
+
+def exit_report(queries: List[str], thresholds: Sequence[float] = REPORT_THRESHOLDS) -> Dict:
+    """
+    Compare early exit at several thresholds with the full classifier
+
+    Uses the model and exit heads currently loaded; EXIT_THRESHOLD is
+    ignored for the duration of the report.
+
+    Returns:
+        Per threshold: mean encoder layers run, top-1 agreement with the
+        full model, and the p50 classifier and end-to-end (hybrid
+        recommendation) latency with the share of it saved
+    """
+    if model_loader._exit_heads is None:
+        raise ValueError(f"No exit heads in {model_loader.MODEL_DIR} - run train_exits.py first")
+
+    default_threshold = model_loader.EXIT_THRESHOLD
+    model_loader.EXIT_THRESHOLD = None
+    try:
+        model_loader.get_career_recommendations_batch(queries[:1])  # warm up
+        full = _measure(queries, None)
+        measured = {threshold: _measure(queries, threshold) for threshold in thresholds}
+    finally:
+        model_loader.EXIT_THRESHOLD = default_threshold
+
+    report = {
+        'queries': len(queries),
+        'full': {key: round(value, 2) for key, value in full.items() if key != 'careers'},
+    }
+    for threshold, result in measured.items():
+        report[f'threshold={threshold}'] = {
+            'avg_layers': round(result['avg_layers'], 2),
+            'top1_agreement': round(
+                sum(a == b for a, b in zip(result['careers'], full['careers'])) / len(queries), 3
+            ),
+            'classifier_ms': round(result['classifier_ms'], 2),
+            'classifier_saved': round(1 - result['classifier_ms'] / full['classifier_ms'], 3),
+            'total_ms': round(result['total_ms'], 2),
+            'total_saved': round(1 - result['total_ms'] / full['total_ms'], 3),
+        }
+    return report
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point (see train_exits.py)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train early-exit heads for the deployed career model")
+    parser.add_argument("--datasets", type=Path, default=DATASET_DIR, help="Directory with the dataset CSV files")
+    parser.add_argument("--epochs", type=int, default=EXIT_CONFIG['num_epochs'], help="Epochs per exit head")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=list(REPORT_THRESHOLDS),
+                        help="Exit thresholds compared in the report")
+    parser.add_argument("--threads", type=int, help="Intra-op threads (default: all cores)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args(argv)
+
+    configure_threads(args.threads)
+
+    def log(stats):
+        print(json.dumps({k: round(v, 4) if isinstance(v, float) else v for k, v in stats.items()}))
+
+    try:
+        result = train_exits({'num_epochs': args.epochs}, dataset_dir=args.datasets, seed=args.seed, log=log)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    # Load the new heads, then report on held-out texts when there are
+    # enough, else on all texts
+    if not model_loader.load_model(variant="full"):
+        print(f"Error: could not reload the model from {model_loader.MODEL_DIR}", file=sys.stderr)
+        return 1
+    queries = result['validation_texts'] if len(result['validation_texts']) >= 50 else result['texts']
+    print(json.dumps(exit_report(queries, thresholds=args.thresholds)))
+    return 0
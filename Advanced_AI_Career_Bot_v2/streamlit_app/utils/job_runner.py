@@ -0,0 +1,228 @@
+"""
+Job Runner - Background execution of slow (LLM) actions
+Runs work submitted by the UI on a shared thread pool so the Streamlit script
+thread returns immediately and the page polls for results
+
+Each user (session) runs at most JOB_USER_LIMIT jobs at once; further jobs
+wait in that user's queue without holding a pool thread. Submitting a request
+that is already queued or running for the same user returns the existing job.
+Jobs can be cancelled; streaming jobs (functions returning an iterator of text
+chunks) expose partial output while they run and stop at the next chunk.
+"""
+
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional
+
+from . import metrics
+
+# Pool threads shared by all users
+JOB_WORKERS = int(os.environ.get("CAREER_JOB_WORKERS", "8"))
+
+# Jobs running at once per user
+JOB_USER_LIMIT = int(os.environ.get("CAREER_JOB_USER_LIMIT", "2"))
+
+# Seconds between UI polls of a running job
+JOB_POLL_INTERVAL = 0.5
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+class Job:
+    """One unit of background work and its (partial) result"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, owner: str, key: Hashable, func: Callable, args: tuple, kwargs: Dict):
+        self.id = next(Job._ids)
+        self.owner = owner
+        self.key = key
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.chunks = []
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        """Finished, failed or cancelled"""
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def text(self) -> str:
+        """Output so far (streaming jobs) or the result once done"""
+        if self.status == DONE and isinstance(self.result, str):
+            return self.result
+        return "".join(self.chunks)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job is done; returns False on timeout"""
+        return self._finished.wait(timeout)
+
+    def _run(self):
+        """Execute in a pool thread"""
+        self.started_at = time.time()
+        metrics.observe("jobs.queue_wait", (self.started_at - self.submitted_at) * 1000)
+        try:
+            output = self._func(*self._args, **self._kwargs)
+            if isinstance(output, str) or not hasattr(output, '__iter__'):
+                result = output
+            else:
+                # Streaming: collect chunks, stop early when cancelled
+                try:
+                    for chunk in output:
+                        self.chunks.append(chunk)
+                        if self.cancelled:
+                            break
+                finally:
+                    if hasattr(output, 'close'):
+                        output.close()
+                result = "".join(self.chunks)
+
+            if self.cancelled:
+                self.status = CANCELLED
+            else:
+                self.result = result
+                self.status = DONE
+        except Exception as e:
+            self.error = e
+            self.status = CANCELLED if self.cancelled else FAILED
+        finally:
+            self.finished_at = time.time()
+            metrics.observe("jobs.run", (self.finished_at - self.started_at) * 1000)
+            self._finished.set()
+
+class JobRunner:
+    """Thread pool with a per-user concurrency cap, deduplication and cancellation"""
+
+    def __init__(self, max_workers: int = JOB_WORKERS, user_limit: int = JOB_USER_LIMIT):
+        """
+        Args:
+            max_workers: Pool threads shared by all users
+            user_limit: Jobs running at once per user
+        """
+        self.user_limit = max(1, user_limit)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="career-job")
+        self._lock = threading.Lock()
+        self._active = {}   # (owner, key) -> queued or running job
+        self._running = {}  # owner -> running job count
+        self._pending = {}  # owner -> deque of queued jobs
+
+    def submit(self, owner: str, key: Hashable, func: Callable, *args, **kwargs) -> Job:
+        """
+        Run func(*args, **kwargs) in the background
+
+        Args:
+            owner: User the job belongs to (e.g., the session id)
+            key: Identifies the request; a queued or running job of the same
+                 owner with an equal key is returned instead of a new one
+            func: Work to run; may return a value or an iterator of text chunks
+
+        Returns:
+            The Job (poll job.done / job.text, or call job.wait())
+        """
+        with self._lock:
+            existing = self._active.get((owner, key))
+            if existing is not None and not existing.cancelled:
+                return existing
+
+            job = Job(owner, key, func, args, kwargs)
+            self._active[(owner, key)] = job
+            if self._running.get(owner, 0) < self.user_limit:
+                self._start(job)
+            else:
+                self._pending.setdefault(owner, deque()).append(job)
+        return job
+
+    def _start(self, job: Job):
+        """Hand a job to the pool (lock held)"""
+        self._running[job.owner] = self._running.get(job.owner, 0) + 1
+        job.status = RUNNING
+        self._executor.submit(self._execute, job)
+
+    def _execute(self, job: Job):
+        try:
+            job._run()
+        finally:
+            with self._lock:
+                self._release(job)
+                self._running[job.owner] -= 1
+                # Start the owner's next queued job, skipping cancelled ones
+                pending = self._pending.get(job.owner)
+                while pending:
+                    next_job = pending.popleft()
+                    if not next_job.cancelled:
+                        self._start(next_job)
+                        break
+                if not pending:
+                    self._pending.pop(job.owner, None)
+                if not self._running[job.owner]:
+                    del self._running[job.owner]
+
+    def _release(self, job: Job):
+        """Forget a job for deduplication (lock held)"""
+        if self._active.get((job.owner, job.key)) is job:
+            del self._active[(job.owner, job.key)]
+
+    def cancel(self, job: Job):
+        """
+        Cancel a job
+
+        Queued jobs never start. Running streaming jobs stop at the next
+        chunk; other running jobs finish in the background but their result
+        is discarded.
+        """
+        with self._lock:
+            job._cancelled.set()
+            self._release(job)
+            if job.status == QUEUED:
+                job.status = CANCELLED
+                job.finished_at = time.time()
+                job._finished.set()
+
+    def active_jobs(self, owner: str) -> List[Job]:
+        """Queued and running jobs of one user"""
+        with self._lock:
+            return [job for (job_owner, _), job in self._active.items() if job_owner == owner]
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs (pending jobs are cancelled)"""
+        with self._lock:
+            for pending in self._pending.values():
+                for job in pending:
+                    job._cancelled.set()
+                    job.status = CANCELLED
+                    job._finished.set()
+            self._pending.clear()
+        self._executor.shutdown(wait=wait)
+
+# Global runner instance (one per process)
+_runner = None
+_runner_lock = threading.Lock()
+
+def get_job_runner() -> JobRunner:
+    """Process-wide job runner"""
+    global _runner
+    if _runner is None:
+        with _runner_lock:
+            if _runner is None:
+                _runner = JobRunner()
+    return _runner
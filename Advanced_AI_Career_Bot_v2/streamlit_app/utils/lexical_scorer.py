@@ -0,0 +1,78 @@
+"""
+Lexical Scorer - TF-IDF first stage of the recommendation cascade
+Scores queries against one document per career (all of its dataset texts)
+with TF-IDF cosine similarity, a few hundred microseconds per query instead
+of a transformer pass. Cosines can be turned into career probabilities with
+a softmax whose temperature is fitted to the classifier's own probabilities.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from .training_data import DATASET_DIR, iter_corpus
+
+# Softmax temperature for probabilities() until calibrate() fits one
+DEFAULT_TEMPERATURE = 0.05
+
+# Temperatures tried by calibrate()
+TEMPERATURE_GRID = np.geomspace(0.005, 1.0, 60)
+
+class LexicalScorer:
+    """TF-IDF similarity between queries and career documents"""
+
+    def __init__(self, classes: List[str], samples: Iterable[Dict[str, str]]):
+        """
+        Args:
+            classes: Careers in label encoder order (columns of the scores)
+            samples: {'role', 'text'} dicts; careers not in classes are
+                     ignored, careers without samples always score 0
+        """
+        self.classes = list(classes)
+        index = {role: i for i, role in enumerate(self.classes)}
+        documents = [[] for _ in self.classes]
+        for sample in samples:
+            i = index.get(sample['role'])
+            if i is not None:
+                documents[i].append(sample['text'])
+
+        self.vectorizer = TfidfVectorizer(sublinear_tf=True, ngram_range=(1, 2), stop_words='english')
+        self.matrix = self.vectorizer.fit_transform([" ".join(texts) for texts in documents])
+        self.temperature = DEFAULT_TEMPERATURE
+
+    def scores(self, queries: List[str]) -> np.ndarray:
+        """Cosine similarity of every query to every career, shape (queries, classes)"""
+        # Rows are L2-normalized, so the dot product is the cosine
+        return (self.vectorizer.transform(queries) @ self.matrix.T).toarray()
+
+    def probabilities(self, scores: np.ndarray, temperature: float = None) -> np.ndarray:
+        """Softmax over careers of scores() at the (calibrated) temperature; rows sum to 1"""
+        logits = scores / (temperature or self.temperature)
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def calibrate(self, queries: List[str], target: np.ndarray) -> float:
+        """
+        Fit the temperature so probabilities() match another model's scale
+
+        Args:
+            queries: Texts to fit on
+            target: That model's probabilities for the texts, shape (queries, classes)
+
+        Returns:
+            The temperature, minimizing cross-entropy against target
+        """
+        scores = self.scores(queries)
+        target = np.asarray(target)
+
+        def loss(temperature):
+            return -(target * np.log(self.probabilities(scores, temperature) + 1e-12)).sum(axis=1).mean()
+
+        self.temperature = float(min(TEMPERATURE_GRID, key=loss))
+        return self.temperature
+
+def build_lexical_scorer(classes: List[str], dataset_dir: Path = DATASET_DIR) -> LexicalScorer:
+    """Scorer over the career texts of the bundled datasets"""
+    return LexicalScorer(classes, iter_corpus(dataset_dir))
@@ -0,0 +1,262 @@
+"""
+Latency Metrics - Lightweight per-stage timing for the recommendation pipeline
+Aggregates stage timings into in-process histograms (p50/p95/p99) and exposes
+them as Prometheus text via a dump file or a small HTTP endpoint
+
+Disabled by default; set CAREER_METRICS=1 to enable.
+"""
+
+import bisect
+import contextlib
+import math
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+
+# Histogram bucket upper bounds in milliseconds
+BUCKETS_MS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000]
+
+# Recent samples kept per stage for exact percentiles
+RESERVOIR_SIZE = 2048
+
+# Minimum seconds between automatic dump file writes
+DUMP_INTERVAL = 10.0
+
+# Interface the /metrics endpoint listens on (loopback unless opened up, e.g., 0.0.0.0)
+METRICS_HOST = os.environ.get("CAREER_METRICS_HOST", "127.0.0.1")
+
+METRIC_NAME = "career_bot_stage_latency_ms"
+COUNTER_NAME = "career_bot_events_total"
+
+# Global variables for the metrics registry
+_enabled = os.environ.get("CAREER_METRICS", "").lower() in ("1", "true", "yes")
+_stages = {}
+_counters = {}
+_lock = threading.Lock()
+_server = None
+_last_dump = 0.0
+_null_timer = contextlib.nullcontext()
+
+def is_enabled() -> bool:
+    """Whether metrics are being collected"""
+    return _enabled
+
+def enable():
+    """Start collecting metrics"""
+    global _enabled
+    _enabled = True
+
+def disable():
+    """Stop collecting metrics (timers become no-ops)"""
+    global _enabled
+    _enabled = False
+
+def reset():
+    """Drop all collected metrics"""
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+
+def observe(stage: str, ms: float):
+    """
+    Record one stage duration
+
+    Args:
+        stage: Stage name (e.g., "model.classifier")
+        ms: Duration in milliseconds
+    """
+    if not _enabled:
+        return
+
+    with _lock:
+        data = _stages.get(stage)
+        if data is None:
+            data = _stages[stage] = {
+                'count': 0,
+                'sum': 0.0,
+                'buckets': [0] * (len(BUCKETS_MS) + 1),
+                'samples': deque(maxlen=RESERVOIR_SIZE)
+            }
+        data['count'] += 1
+        data['sum'] += ms
+        data['buckets'][bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        data['samples'].append(ms)
+
+def increment(event: str, value: int = 1):
+    """
+    Count an event
+
+    Args:
+        event: Event name (e.g., "single_flight.recommendations.coalesced")
+        value: Amount to add
+    """
+    if not _enabled:
+        return
+
+    with _lock:
+        _counters[event] = _counters.get(event, 0) + value
+
+def counters() -> Dict[str, int]:
+    """Current event counts"""
+    with _lock:
+        return dict(sorted(_counters.items()))
+
+def record_timings(timings: Dict[str, float], prefix: str = ""):
+    """Record a dict of stage -> milliseconds (e.g., from get_career_recommendations)"""
+    if not _enabled:
+        return
+    for stage, ms in timings.items():
+        observe(prefix + stage, ms)
+
+class _StageTimer:
+    """Context manager timing one stage with a monotonic clock"""
+
+    __slots__ = ('stage', 'start')
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.stage, (time.perf_counter() - self.start) * 1000)
+        return False
+
+def timer(stage: str):
+    """
+    Time a block of code as a stage
+
+    Returns a shared no-op context manager when metrics are disabled.
+    """
+    if not _enabled:
+        return _null_timer
+    return _StageTimer(stage)
+
+def _percentile(sorted_samples, q: float) -> float:
+    """Nearest-rank percentile of pre-sorted samples"""
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, min(len(sorted_samples) - 1, math.ceil(q * len(sorted_samples)) - 1))
+    return sorted_samples[rank]
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    """
+    Summarize collected metrics
+
+    Returns:
+        Dictionary mapping stage to count, mean and p50/p95/p99 in milliseconds
+        (percentiles over the most recent RESERVOIR_SIZE samples)
+    """
+    with _lock:
+        stages = dict((stage, (data['count'], data['sum'], sorted(data['samples'])))
+                      for stage, data in _stages.items())
+
+    summary = {}
+    for stage, (count, total, samples) in sorted(stages.items()):
+        summary[stage] = {
+            'count': count,
+            'mean_ms': total / count if count else 0.0,
+            'p50_ms': _percentile(samples, 0.50),
+            'p95_ms': _percentile(samples, 0.95),
+            'p99_ms': _percentile(samples, 0.99)
+        }
+    return summary
+
+def render_prometheus() -> str:
+    """Render all stages as a Prometheus text-format histogram, plus event counters"""
+    with _lock:
+        stages = dict((stage, (data['count'], data['sum'], list(data['buckets'])))
+                      for stage, data in _stages.items())
+        events = sorted(_counters.items())
+
+    lines = [
+        f"# HELP {METRIC_NAME} Recommendation pipeline stage latency in milliseconds",
+        f"# TYPE {METRIC_NAME} histogram"
+    ]
+    for stage, (count, total, buckets) in sorted(stages.items()):
+        cumulative = 0
+        for bound, bucket_count in zip(BUCKETS_MS + ['+Inf'], buckets):
+            cumulative += bucket_count
+            lines.append(f'{METRIC_NAME}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+        lines.append(f'{METRIC_NAME}_sum{{stage="{stage}"}} {total}')
+        lines.append(f'{METRIC_NAME}_count{{stage="{stage}"}} {count}')
+
+    if events:
+        lines.append(f"# HELP {COUNTER_NAME} Counted events (e.g., coalesced requests)")
+        lines.append(f"# TYPE {COUNTER_NAME} counter")
+        for event, value in events:
+            lines.append(f'{COUNTER_NAME}{{event="{event}"}} {value}')
+
+    return "\n".join(lines) + "\n"
+
+def dump(path: Path):
+    """Atomically write the Prometheus text to a file (e.g., for node_exporter's textfile collector)"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(render_prometheus())
+    os.replace(tmp_path, path)
+
+def maybe_dump():
+    """Write CAREER_METRICS_FILE if set, at most once every DUMP_INTERVAL seconds"""
+    global _last_dump
+
+    path = os.environ.get("CAREER_METRICS_FILE")
+    if not _enabled or not path:
+        return
+
+    now = time.monotonic()
+    if now - _last_dump >= DUMP_INTERVAL:
+        _last_dump = now
+        dump(Path(path))
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip('/') not in ('', '/metrics'):
+            self.send_error(404)
+            return
+        body = render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(port: Optional[int] = None, host: Optional[str] = None) -> Optional[int]:
+    """
+    Serve /metrics on a background thread (once per process)
+
+    Args:
+        port: Port to listen on (default: CAREER_METRICS_PORT; not started if unset)
+        host: Interface to bind (default: METRICS_HOST)
+
+    Returns:
+        The port being served, or None
+    """
+    global _server
+
+    if _server is not None:
+        return _server.server_address[1]
+
+    port = port if port is not None else os.environ.get("CAREER_METRICS_PORT")
+    if port is None or port == "":
+        return None
+
+    with _lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host or METRICS_HOST, int(port)), _MetricsHandler)
+            except OSError:
+                # Another worker process already serves this port
+                return None
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+
+    return _server.server_address[1]
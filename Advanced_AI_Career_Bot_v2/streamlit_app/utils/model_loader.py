@@ -5,21 +5,69 @@ Handles loading and inference of the trained model
 
 import torch
 import torch.nn as nn
-from transformers import AutoTokenizer, AutoModel
+from transformers import AutoConfig, AutoTokenizer, AutoModel
 from sentence_transformers import SentenceTransformer
 import numpy as np
 import pickle
 import json
+import os
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 import streamlit as st
 from sklearn.metrics.pairwise import cosine_similarity
 
+from . import metrics, profiling
+from .lexical_scorer import build_lexical_scorer
+from .training_data import iter_corpus
+from .single_flight import SingleFlight
+
 # Model paths
-MODEL_DIR = Path(__file__).parent.parent / "models"
+MODEL_DIR = Path(os.environ.get("CAREER_MODEL_DIR", Path(__file__).parent.parent / "models"))
 MODEL_PATH = MODEL_DIR / "career_model_cpu.pth"
 ENCODER_PATH = MODEL_DIR / "label_encoder.pkl"
 EMBEDDINGS_PATH = MODEL_DIR / "career_embeddings.npy"
 METADATA_PATH = MODEL_DIR / "model_metadata.json"
+STUDENT_PATH = MODEL_DIR / "career_model_student.pth"
+EXITS_PATH = MODEL_DIR / "career_model_exits.pth"
+
+# Model served by load_model(): "full" (fine-tuned classifier plus sentence
+# model) or "student" (distilled model, see distill.py)
+MODEL_VARIANTS = ("full", "student")
+MODEL_VARIANT = os.environ.get("CAREER_MODEL_VARIANT", "full")
+
+# Tokenization settings
+MAX_LENGTH = 128
+TOKEN_CACHE_SIZE = 1024
+
+# Layout of build_enhanced_query: "appended" (description, then the
+# structured fields), "fields_first", or "fit" (appended when it fits in
+# MAX_LENGTH tokens, else fields first so truncation only cuts the description)
+QUERY_LAYOUTS = ("appended", "fields_first", "fit")
+QUERY_LAYOUT = os.environ.get("CAREER_QUERY_LAYOUT", "fit")
+
+# Classifier inputs longer than MAX_LENGTH tokens: "truncate", or "window" to
+# classify overlapping MAX_LENGTH-token windows WINDOW_STRIDE tokens apart
+# (at most MAX_WINDOWS per query) and average their probabilities
+LONG_INPUT_MODES = ("truncate", "window")
+LONG_INPUTS = os.environ.get("CAREER_LONG_INPUTS", "truncate")
+WINDOW_STRIDE = 112
+MAX_WINDOWS = 8
+
+# Two-stage cascade (off unless set): queries whose TF-IDF top-1 score beats
+# the runner-up by CASCADE_MARGIN are answered lexically; the rest are scored
+# by the transformer among the CASCADE_CANDIDATES best lexical careers
+CASCADE_MARGIN = float(os.environ["CAREER_CASCADE_MARGIN"]) if os.environ.get("CAREER_CASCADE_MARGIN") else None
+CASCADE_CANDIDATES = int(os.environ["CAREER_CASCADE_CANDIDATES"]) if os.environ.get("CAREER_CASCADE_CANDIDATES") else None
+
+# Dataset texts the lexical confidences are calibrated on against the classifier
+LEXICAL_CALIBRATION_SAMPLES = 256
+
+# Early exit (off unless set; needs exit heads, see train_exits.py): the
+# classifier stops at the first layer whose exit head's top softmax
+# probability reaches EXIT_THRESHOLD
+EXIT_THRESHOLD = float(os.environ["CAREER_EXIT_THRESHOLD"]) if os.environ.get("CAREER_EXIT_THRESHOLD") else None
 
 class CareerClassifier(nn.Module):
     """Career classification model"""
@@ -44,6 +92,99 @@ class CareerClassifier(nn.Module):
         logits = self.classifier(pooled_output)
         return logits
 
+class StudentClassifier(nn.Module):
+    """
+    Distilled student: a shallower copy of the encoder with the classifier
+    head and a sentence-embedding head, so one pass yields both the class
+    logits and the query embedding for similarity search
+    """
+    def __init__(self, base_model_name, num_classes, num_layers=2, hidden_dim=256, dropout=0.3, embedding_dim=384):
+        super(StudentClassifier, self).__init__()
+        config = AutoConfig.from_pretrained(base_model_name, num_hidden_layers=num_layers)
+        self.base_model = AutoModel.from_config(config)
+        self.dropout = nn.Dropout(dropout)
+        self.classifier = nn.Sequential(
+            nn.Linear(config.hidden_size, hidden_dim),
+            nn.ReLU(),
+            nn.Dropout(dropout),
+            nn.Linear(hidden_dim, hidden_dim // 2),
+            nn.ReLU(),
+            nn.Dropout(dropout),
+            nn.Linear(hidden_dim // 2, num_classes)
+        )
+        self.embedding_head = nn.Linear(config.hidden_size, embedding_dim)
+    
+    def classify_and_embed(self, input_ids, attention_mask):
+        """Class logits and (mean-pooled) query embeddings"""
+        hidden = self.base_model(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+        logits = self.classifier(self.dropout(hidden[:, 0, :]))
+        mask = attention_mask.unsqueeze(-1).to(hidden.dtype)
+        pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+        return logits, self.embedding_head(pooled)
+    
+    def forward(self, input_ids, attention_mask):
+        return self.classify_and_embed(input_ids, attention_mask)[0]
+
+class ExitHeads(nn.Module):
+    """
+    Small classifiers on the [CLS] state of intermediate encoder layers of a
+    CareerClassifier; the last layer keeps the model's own classifier
+    """
+    def __init__(self, hidden_size, num_classes, layers, head_dim=128):
+        super(ExitHeads, self).__init__()
+        self.layers = list(layers)
+        self.heads = nn.ModuleList([
+            nn.Sequential(nn.Linear(hidden_size, head_dim), nn.Tanh(), nn.Linear(head_dim, num_classes))
+            for _ in self.layers
+        ])
+    
+    def forward(self, model, input_ids, attention_mask, threshold):
+        """
+        Classifier logits, stopping each query at the first exit head whose
+        top softmax probability reaches threshold
+        
+        Queries that exit are dropped from the batch, so later layers only
+        run for the rest.
+        
+        Args:
+            model: The CareerClassifier the heads were trained on
+            input_ids: Token ids (batch, length)
+            attention_mask: Attention mask (batch, length)
+            threshold: Exit confidence (0-1)
+        
+        Returns:
+            (logits, number of encoder layers run per query)
+        """
+        encoder = model.base_model
+        encoder_layers = encoder.encoder.layer
+        hidden = encoder.embeddings(input_ids=input_ids)
+        mask = (1.0 - attention_mask[:, None, None, :].to(hidden.dtype)) * torch.finfo(hidden.dtype).min
+        
+        logits = torch.zeros((len(input_ids), model.classifier[-1].out_features))
+        layers_run = torch.full((len(input_ids),), len(encoder_layers), dtype=torch.long)
+        active = torch.arange(len(input_ids))
+        exits = dict(zip(self.layers, self.heads))
+        
+        for depth, layer in enumerate(encoder_layers):
+            output = layer(hidden, attention_mask=mask)
+            hidden = output[0] if isinstance(output, tuple) else output
+            head = exits.get(depth)
+            if head is None or depth == len(encoder_layers) - 1:
+                continue
+            
+            head_logits = head(hidden[:, 0, :])
+            confident = torch.softmax(head_logits, dim=1).max(dim=1).values >= threshold
+            if confident.any():
+                logits[active[confident]] = head_logits[confident]
+                layers_run[active[confident]] = depth + 1
+                remaining = ~confident
+                active, hidden, mask = active[remaining], hidden[remaining], mask[remaining]
+                if not len(active):
+                    return logits, layers_run
+        
+        logits[active] = model.classifier(model.dropout(hidden[:, 0, :]))
+        return logits, layers_run
+
 # Global variables for model components
 _model = None
 _tokenizer = None
@@ -51,10 +192,33 @@ _label_encoder = None
 _career_embeddings = None
 _sentence_model = None
 _metadata = None
+_share_tokens = False
+_exit_heads = None
+_lexical_scorer = None
+_lexical_lock = threading.Lock()
+
+# LRU cache of token ids for repeated queries
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
 
-def load_model():
-    """Load all model components"""
-    global _model, _tokenizer, _label_encoder, _career_embeddings, _sentence_model, _metadata
+# Identical concurrent recommendation requests share one inference
+_recommendation_flight = SingleFlight("recommendations")
+
+def load_model(variant=None):
+    """
+    Load all model components
+    
+    Args:
+        variant: "full" or "student" (default: MODEL_VARIANT); anything
+                 else raises ValueError
+    """
+    global _model, _tokenizer, _label_encoder, _career_embeddings, _sentence_model, _metadata, _share_tokens, _lexical_scorer, _exit_heads
+    
+    variant = variant or MODEL_VARIANT
+    if variant not in MODEL_VARIANTS:
+        raise ValueError(f"Unknown model variant '{variant}' (expected one of {MODEL_VARIANTS})")
+    _lexical_scorer = None
+    _exit_heads = None
     
     try:
         # Load metadata
@@ -67,15 +231,40 @@ def load_model():
         with open(ENCODER_PATH, 'rb') as f:
             _label_encoder = pickle.load(f)
         
-        # Load embeddings
-        _career_embeddings = np.load(EMBEDDINGS_PATH)
+        # Load embeddings (memory-mapped so forked scoring workers share the pages)
+        _career_embeddings = np.load(EMBEDDINGS_PATH, mmap_mode='r')
+        
+        # Initialize tokenizer (Rust "fast" implementation)
+        _tokenizer = AutoTokenizer.from_pretrained(config['base_model'], use_fast=True)
+        if not _tokenizer.is_fast:
+            raise ValueError(f"No fast tokenizer available for {config['base_model']}")
         
-        # Initialize tokenizer
-        _tokenizer = AutoTokenizer.from_pretrained(config['base_model'])
+        clear_token_cache()
+        
+        if variant == "student":
+            # The student embeds queries itself; no sentence model needed
+            checkpoint = torch.load(STUDENT_PATH, map_location=torch.device('cpu'))
+            _model = StudentClassifier(
+                base_model_name=config['base_model'],
+                num_classes=_metadata['num_classes'],
+                **checkpoint['student_config']
+            )
+            _model.load_state_dict(checkpoint['model_state_dict'])
+            _model.eval()
+            _sentence_model = None
+            _share_tokens = False
+            return True
         
         # Initialize sentence model for similarity search
         _sentence_model = SentenceTransformer(config['base_model'])
         
+        # Share token ids with the sentence model when both use the same vocabulary
+        sentence_tokenizer = getattr(_sentence_model, 'tokenizer', None)
+        _share_tokens = (
+            sentence_tokenizer is not None
+            and sentence_tokenizer.get_vocab() == _tokenizer.get_vocab()
+        )
+        
         # Load model
         checkpoint = torch.load(MODEL_PATH, map_location=torch.device('cpu'))
         
@@ -89,75 +278,105 @@ def load_model():
         _model.load_state_dict(checkpoint['model_state_dict'])
         _model.eval()
         
+        # Exit heads are optional (trained separately with train_exits.py)
+        if EXITS_PATH.exists():
+            exits = torch.load(EXITS_PATH, map_location=torch.device('cpu'))
+            _exit_heads = ExitHeads(
+                _model.base_model.config.hidden_size,
+                _metadata['num_classes'],
+                **exits['exit_config']
+            )
+            _exit_heads.load_state_dict(exits['model_state_dict'])
+            _exit_heads.eval()
+        
         return True
     
     except Exception as e:
         st.error(f"Error loading model: {str(e)}")
         return False
 
-def get_career_recommendations(query, top_k=5, use_hybrid=True):
+def build_enhanced_query(description, skills, experience, education, layout=None):
     """
-    Get career recommendations for a given query
+    Build the enhanced query used for recommendations
+    
+    Long descriptions would push the structured fields past MAX_LENGTH, where
+    the classifier never sees them; the "fit" layout moves the fields in
+    front for those (and, before the model is loaded, for every query).
     
     Args:
-        query: User's career description/query
-        top_k: Number of recommendations to return
-        use_hybrid: Use both model prediction and embedding similarity
+        description: Free-text description of skills, interests and goals
+        skills: List of selected core skills
+        experience: Experience level (e.g., "Intermediate")
+        education: Education background
+        layout: "appended", "fields_first" or "fit" (default: QUERY_LAYOUT)
     
     Returns:
-        List of career recommendations with confidence scores
+        Query string combining the description with the structured fields
     """
-    global _model, _tokenizer, _label_encoder, _career_embeddings, _sentence_model
+    layout = layout or QUERY_LAYOUT
+    if layout not in QUERY_LAYOUTS:
+        raise ValueError(f"Unknown query layout '{layout}' (expected one of {QUERY_LAYOUTS})")
     
-    if _model is None:
-        raise ValueError("Model not loaded. Call load_model() first.")
+    fields = f"Skills: {', '.join(skills)}. Experience: {experience}. Education: {education}."
+    appended = f"{description} {fields}"
+    if layout == "appended":
+        return appended
+    if layout == "fit" and _tokenizer is not None:
+        encoded = _tokenizer(appended, add_special_tokens=True, truncation=True, max_length=MAX_LENGTH + 1)
+        if len(encoded['input_ids']) <= MAX_LENGTH:
+            return appended
+    return f"{fields} {description}"
+
+def _fuse_predictions(probabilities, similarities, top_k, candidates=None):
+    """
+    Combine model probabilities and embedding similarities for one query
+    
+    Args:
+        probabilities: Softmax probabilities over classes (1-D tensor)
+        similarities: Cosine similarities to career embeddings (1-D array), or None
+        top_k: Number of recommendations to return
+        candidates: Class indices to choose from (cascade), or None for all
     
+    Returns:
+        List of career recommendations sorted by confidence
+    """
+    classes = _label_encoder.classes_
     results = []
     
+    if candidates is not None:
+        # Renormalize over the candidates; other careers are never returned
+        mask = torch.zeros_like(probabilities)
+        mask[candidates] = 1
+        probabilities = probabilities * mask
+        probabilities = probabilities / probabilities.sum().clamp(min=1e-12)
+        if similarities is not None:
+            restricted = np.full_like(similarities, -np.inf)
+            restricted[candidates] = similarities[candidates]
+            similarities = restricted
+    
     # Method 1: Model-based prediction
-    encoding = _tokenizer(
-        query,
-        add_special_tokens=True,
-        max_length=128,
-        padding='max_length',
-        truncation=True,
-        return_tensors='pt'
-    )
+    limit = len(classes) if candidates is None else len(candidates)
+    top_probs, top_indices = torch.topk(probabilities, k=min(top_k * 2, limit))
     
-    with torch.no_grad():
-        outputs = _model(encoding['input_ids'], encoding['attention_mask'])
-        probabilities = torch.nn.functional.softmax(outputs, dim=1)[0]
-        
-        # Get top predictions
-        top_probs, top_indices = torch.topk(probabilities, k=min(top_k * 2, len(_label_encoder.classes_)))
-        
-        for prob, idx in zip(top_probs, top_indices):
-            career = _label_encoder.inverse_transform([idx.item()])[0]
-            results.append({
-                'career': career,
-                'confidence': prob.item() * 100,
-                'method': 'model'
-            })
+    for prob, idx in zip(top_probs.tolist(), top_indices.tolist()):
+        results.append({
+            'career': classes[idx],
+            'confidence': prob * 100,
+            'method': 'model'
+        })
     
     # Method 2: Embedding-based similarity (if hybrid mode)
-    if use_hybrid and _sentence_model is not None:
-        query_embedding = _sentence_model.encode([query])[0]
-        
-        # Calculate similarities
-        similarities = cosine_similarity(
-            query_embedding.reshape(1, -1),
-            _career_embeddings
-        )[0]
-        
-        # Get top similar careers
+    if similarities is not None:
+        by_career = dict((r['career'], r) for r in results)
         top_similar_indices = np.argsort(similarities)[-top_k*2:][::-1]
+        top_similar_indices = top_similar_indices[np.isfinite(similarities[top_similar_indices])]
         
         for idx in top_similar_indices:
-            career = _label_encoder.classes_[idx]
+            career = classes[idx]
             similarity_score = similarities[idx] * 100
             
             # Check if already in results
-            existing = next((r for r in results if r['career'] == career), None)
+            existing = by_career.get(career)
             if existing:
                 # Combine scores (weighted average)
                 existing['confidence'] = (existing['confidence'] * 0.6 + similarity_score * 0.4)
@@ -173,6 +392,388 @@ def get_career_recommendations(query, top_k=5, use_hybrid=True):
     results.sort(key=lambda x: x['confidence'], reverse=True)
     return results[:top_k]
 
+def clear_token_cache():
+    """Drop all cached token ids"""
+    with _token_cache_lock:
+        _token_cache.clear()
+
+def _token_ids(queries, max_length):
+    """Token ids per query, tokenizing only cache misses (in one batched call)"""
+    token_ids = [None] * len(queries)
+    misses = []
+    
+    with _token_cache_lock:
+        for i, query in enumerate(queries):
+            cached = _token_cache.get((query, max_length))
+            if cached is not None:
+                _token_cache.move_to_end((query, max_length))
+                token_ids[i] = cached
+            else:
+                misses.append(i)
+    
+    if misses:
+        encoded = _tokenizer(
+            [queries[i] for i in misses],
+            add_special_tokens=True,
+            max_length=max_length,
+            truncation=True,
+            padding=False
+        )['input_ids']
+        
+        with _token_cache_lock:
+            for i, ids in zip(misses, encoded):
+                token_ids[i] = tuple(ids)
+                _token_cache[(queries[i], max_length)] = token_ids[i]
+            while len(_token_cache) > TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+    
+    return token_ids
+
+def _pad(token_ids):
+    """Pad token id sequences to the longest one in the batch"""
+    longest = max(len(ids) for ids in token_ids)
+    input_ids = torch.full((len(token_ids), longest), _tokenizer.pad_token_id, dtype=torch.long)
+    attention_mask = torch.zeros((len(token_ids), longest), dtype=torch.long)
+    for i, ids in enumerate(token_ids):
+        input_ids[i, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+        attention_mask[i, :len(ids)] = 1
+    
+    return {'input_ids': input_ids, 'attention_mask': attention_mask}
+
+def _windows(token_ids, max_length, stride):
+    """
+    Split token id sequences into windows of at most max_length ids, stride
+    content tokens apart (the last one ends with the sequence), each with the
+    sequence's own [CLS] and [SEP]
+    
+    Returns:
+        (window id sequences, index of the sequence each window came from)
+    """
+    windows, owners = [], []
+    size = max_length - 2
+    for owner, ids in enumerate(token_ids):
+        if len(ids) <= max_length:
+            windows.append(ids)
+            owners.append(owner)
+            continue
+        content = ids[1:-1]
+        for start in list(range(0, len(content) - size, stride)) + [len(content) - size]:
+            windows.append(ids[:1] + content[start:start + size] + ids[-1:])
+            owners.append(owner)
+    return windows, owners
+
+def _pool_windows(values, owners, attention_mask, count):
+    """Mean of per-window rows for each query, weighted by window tokens"""
+    weights = attention_mask.sum(dim=1, keepdim=True).to(values.dtype)
+    totals = torch.zeros((count, 1), dtype=values.dtype).index_add_(0, owners, weights)
+    pooled = torch.zeros((count, values.shape[1]), dtype=values.dtype).index_add_(0, owners, values * weights)
+    return pooled / totals
+
+def tokenize_queries(queries, max_length=MAX_LENGTH, embedding_max_length=None, windows=False):
+    """
+    Tokenize queries once, reusing cached token ids for repeated inputs
+    
+    Queries are tokenized to the longest limit needed; the classifier
+    encoding is derived from the same ids by truncating and re-appending the
+    separator token, which is exactly what the tokenizer's truncation does.
+    
+    Args:
+        queries: List of query strings
+        max_length: Maximum number of tokens for the classifier
+        embedding_max_length: Maximum number of tokens for the sentence model
+                              (None: no separate embedding encoding)
+        windows: Also split queries longer than max_length into overlapping
+                 classifier windows (see LONG_INPUTS)
+    
+    Returns:
+        Dictionary with the classifier encoding ('input_ids', 'attention_mask'),
+        if requested the sentence model encoding under 'embedding', and, when
+        some query needs more than one window, the window encoding under
+        'windows' (with 'owners': the query index of every window)
+    """
+    full_length = max(max_length, embedding_max_length or 0)
+    if windows:
+        full_length = max(full_length, max_length + (MAX_WINDOWS - 1) * WINDOW_STRIDE)
+    token_ids = _token_ids(queries, full_length)
+    
+    classifier_ids = [
+        ids if len(ids) <= max_length else ids[:max_length - 1] + (_tokenizer.sep_token_id,)
+        for ids in token_ids
+    ]
+    encoding = _pad(classifier_ids)
+    
+    if embedding_max_length:
+        if embedding_max_length == max_length or all(len(ids) <= max_length for ids in token_ids):
+            encoding['embedding'] = dict(encoding)
+        else:
+            encoding['embedding'] = _pad([
+                ids if len(ids) <= embedding_max_length
+                else ids[:embedding_max_length - 1] + (_tokenizer.sep_token_id,)
+                for ids in token_ids
+            ])
+    
+    if windows and any(len(ids) > max_length for ids in token_ids):
+        window_ids, owners = _windows(token_ids, max_length, WINDOW_STRIDE)
+        encoding['windows'] = _pad(window_ids)
+        encoding['windows']['owners'] = torch.tensor(owners, dtype=torch.long)
+    
+    return encoding
+
+def get_lexical_scorer():
+    """TF-IDF scorer over the dataset texts of the loaded careers (built on first use)"""
+    global _lexical_scorer
+    
+    if _lexical_scorer is None:
+        with _lexical_lock:
+            if _lexical_scorer is None:
+                scorer = build_lexical_scorer(_label_encoder.classes_.tolist())
+                _lexical_scorer = calibrate_lexical_scorer(scorer, (sample['text'] for sample in iter_corpus()))
+    return _lexical_scorer
+
+def _classifier_probabilities(texts, batch_size=32):
+    """Plain classifier softmax for texts (no fusion, cascade or early exit), shape (texts, classes)"""
+    rows = []
+    with torch.no_grad():
+        for start in range(0, len(texts), batch_size):
+            encoding = tokenize_queries(texts[start:start + batch_size])
+            outputs = _model(encoding['input_ids'], encoding['attention_mask'])
+            rows.append(torch.nn.functional.softmax(outputs, dim=1).numpy())
+    return np.concatenate(rows)
+
+def calibrate_lexical_scorer(scorer, texts):
+    """
+    Put a lexical scorer's probabilities on the classifier's scale
+    
+    Fits the scorer's softmax temperature to the loaded classifier's
+    probabilities on up to LEXICAL_CALIBRATION_SAMPLES of the texts, spread
+    evenly, so lexical and model confidences read the same in the UI.
+    
+    Returns:
+        The scorer
+    """
+    texts = list(texts)
+    texts = texts[::max(1, len(texts) // LEXICAL_CALIBRATION_SAMPLES)][:LEXICAL_CALIBRATION_SAMPLES]
+    if texts:
+        scorer.calibrate(texts, _classifier_probabilities(texts))
+    return scorer
+
+def _lexical_stage(queries, top_k, margin, candidates):
+    """
+    First cascade stage for a batch of queries
+    
+    Returns:
+        (query index -> lexical recommendations for short-circuited queries,
+         query index -> candidate class indices for the rest, or None)
+    """
+    scorer = get_lexical_scorer()
+    scores = scorer.scores(queries)
+    probabilities = None
+    classes = _label_encoder.classes_
+    answered = {}
+    narrowed = {}
+    for i, row in enumerate(scores):
+        order = np.argsort(-row, kind='stable')
+        runner_up = row[order[1]] if len(order) > 1 else 0.0
+        if margin is not None and row[order[0]] > 0 and row[order[0]] - runner_up >= margin:
+            if probabilities is None:
+                probabilities = scorer.probabilities(scores)
+            # Calibrated probability like the model's; the raw cosine is kept apart
+            answered[i] = [
+                {
+                    'career': classes[idx],
+                    'confidence': probabilities[i, idx] * 100,
+                    'lexical_score': float(row[idx]),
+                    'method': 'lexical'
+                }
+                for idx in order[:top_k]
+            ]
+        elif candidates:
+            narrowed[i] = order[:max(candidates, top_k)]
+    return answered, narrowed
+
+def _add_timing(timings, stage, start):
+    """Accumulate elapsed milliseconds for a stage into a timings dict"""
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + (time.perf_counter() - start) * 1000
+
+def get_career_recommendations_batch(queries, top_k=5, use_hybrid=True, batch_size=32, timings=None,
+                                     cascade_margin=None, cascade_candidates=None, exit_threshold=None,
+                                     long_inputs=None):
+    """
+    Get career recommendations for several queries at once
+    
+    Queries are tokenized, classified and embedded in batches, which is much
+    cheaper per query than calling get_career_recommendations in a loop.
+    Each query is tokenized once and the ids are shared by the classifier and
+    the sentence embedding model.
+    
+    Args:
+        queries: List of user career descriptions/queries
+        top_k: Number of recommendations to return per query
+        use_hybrid: Use both model prediction and embedding similarity
+        batch_size: Number of queries per forward pass
+        timings: Optional dict that receives per-stage milliseconds
+                 (lexical, tokenize, classifier, embedding, similarity, fusion);
+                 when omitted, stages go to the metrics registry if enabled
+        cascade_margin: Answer queries from TF-IDF scores when the top career
+                        leads the runner-up by this much (None: CASCADE_MARGIN)
+        cascade_candidates: Let the transformer choose among this many top
+                            TF-IDF careers, at least top_k (None: CASCADE_CANDIDATES)
+        exit_threshold: Stop the classifier at the first exit head this
+                        confident (None: EXIT_THRESHOLD; ignored without
+                        exit heads)
+        long_inputs: "truncate" or "window" for queries longer than
+                     MAX_LENGTH tokens (None: LONG_INPUTS); windows of all
+                     queries in a batch share one classifier pass
+    
+    Returns:
+        List with one recommendation list per query, in input order
+    """
+    if _model is None:
+        raise ValueError("Model not loaded. Call load_model() first.")
+    
+    record_metrics = timings is None and metrics.is_enabled()
+    if record_metrics:
+        timings = {}
+    
+    margin = CASCADE_MARGIN if cascade_margin is None else cascade_margin
+    candidates = CASCADE_CANDIDATES if cascade_candidates is None else cascade_candidates
+    threshold = EXIT_THRESHOLD if exit_threshold is None else exit_threshold
+    long_inputs = long_inputs or LONG_INPUTS
+    if long_inputs not in LONG_INPUT_MODES:
+        raise ValueError(f"Unknown long input mode '{long_inputs}' (expected one of {LONG_INPUT_MODES})")
+    
+    all_results = []
+    
+    for start in range(0, len(queries), batch_size):
+        queries_in_batch = list(queries[start:start + batch_size])
+        batch_results = [None] * len(queries_in_batch)
+        narrowed = {}
+        
+        if margin is not None or candidates:
+            t0 = time.perf_counter()
+            answered, narrowed = _lexical_stage(queries_in_batch, top_k, margin, candidates)
+            for i, results in answered.items():
+                batch_results[i] = results
+            _add_timing(timings, 'lexical', t0)
+            if answered:
+                metrics.increment("cascade.short_circuit", len(answered))
+        
+        pending = [i for i, results in enumerate(batch_results) if results is None]
+        if not pending:
+            all_results.extend(batch_results)
+            continue
+        batch = [queries_in_batch[i] for i in pending]
+        
+        t0 = time.perf_counter()
+        embedding_max_length = None
+        if use_hybrid and _share_tokens:
+            embedding_max_length = _sentence_model.max_seq_length or MAX_LENGTH
+        encoding = tokenize_queries(
+            batch,
+            embedding_max_length=embedding_max_length,
+            windows=long_inputs == "window"
+        )
+        classifier_input = encoding.get('windows', encoding)
+        _add_timing(timings, 'tokenize', t0)
+        
+        t0 = time.perf_counter()
+        query_embeddings = None
+        embeddings = None
+        input_ids, attention_mask = classifier_input['input_ids'], classifier_input['attention_mask']
+        with torch.no_grad():
+            if isinstance(_model, StudentClassifier):
+                outputs, embeddings = _model.classify_and_embed(input_ids, attention_mask)
+            elif threshold is not None and _exit_heads is not None:
+                outputs, layers_run = _exit_heads(_model, input_ids, attention_mask, threshold)
+                metrics.increment("early_exit.queries", len(input_ids))
+                metrics.increment("early_exit.layers", int(layers_run.sum()))
+            else:
+                outputs = _model(input_ids, attention_mask)
+            probabilities = torch.nn.functional.softmax(outputs, dim=1)
+            if 'owners' in classifier_input:
+                owners = classifier_input['owners']
+                probabilities = _pool_windows(probabilities, owners, attention_mask, len(batch))
+                if embeddings is not None:
+                    embeddings = _pool_windows(embeddings, owners, attention_mask, len(batch))
+        if use_hybrid and embeddings is not None:
+            query_embeddings = embeddings.numpy()
+        _add_timing(timings, 'classifier', t0)
+        
+        similarities = None
+        if use_hybrid and query_embeddings is None and _sentence_model is not None:
+            t0 = time.perf_counter()
+            if _share_tokens:
+                with torch.no_grad():
+                    features = _sentence_model({
+                        'input_ids': encoding['embedding']['input_ids'],
+                        'attention_mask': encoding['embedding']['attention_mask']
+                    })
+                query_embeddings = features['sentence_embedding'].numpy()
+            else:
+                query_embeddings = _sentence_model.encode(batch, batch_size=len(batch))
+            _add_timing(timings, 'embedding', t0)
+        
+        if query_embeddings is not None:
+            t0 = time.perf_counter()
+            similarities = cosine_similarity(query_embeddings, _career_embeddings)
+            _add_timing(timings, 'similarity', t0)
+        
+        t0 = time.perf_counter()
+        for row, i in enumerate(pending):
+            batch_results[i] = _fuse_predictions(
+                probabilities[row],
+                similarities[row] if similarities is not None else None,
+                top_k,
+                narrowed.get(i)
+            )
+        all_results.extend(batch_results)
+        _add_timing(timings, 'fusion', t0)
+    
+    if record_metrics:
+        metrics.record_timings(timings, prefix="model.")
+    
+    return all_results
+
+@profiling.profiled("recommendations")
+def get_career_recommendations(query, top_k=5, use_hybrid=True, timings=None,
+                               cascade_margin=None, cascade_candidates=None, exit_threshold=None,
+                               long_inputs=None):
+    """
+    Get career recommendations for a given query
+    
+    Args:
+        query: User's career description/query
+        top_k: Number of recommendations to return
+        use_hybrid: Use both model prediction and embedding similarity
+        timings: Optional dict that receives per-stage milliseconds
+        cascade_margin: TF-IDF short-circuit margin (None: CASCADE_MARGIN)
+        cascade_candidates: Careers passed to the transformer (None: CASCADE_CANDIDATES)
+        exit_threshold: Early-exit confidence of the classifier (None: EXIT_THRESHOLD)
+        long_inputs: "truncate" or "window" (None: LONG_INPUTS)
+    
+    Returns:
+        List of career recommendations with confidence scores
+    """
+    options = dict(
+        top_k=top_k,
+        use_hybrid=use_hybrid,
+        cascade_margin=cascade_margin,
+        cascade_candidates=cascade_candidates,
+        exit_threshold=exit_threshold,
+        long_inputs=long_inputs
+    )
+    if timings is not None:
+        # Stage timings belong to one caller, so instrumented calls run alone
+        return get_career_recommendations_batch([query], timings=timings, **options)[0]
+    
+    results = _recommendation_flight.do(
+        (query, top_k, use_hybrid, cascade_margin, cascade_candidates, exit_threshold, long_inputs),
+        lambda: get_career_recommendations_batch([query], **options)[0]
+    )
+    # Coalesced callers get the same list; give each its own copy
+    return [dict(rec) for rec in results]
+
 def get_model_info():
     """Get model metadata and information"""
     global _metadata
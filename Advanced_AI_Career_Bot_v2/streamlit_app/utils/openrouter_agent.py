@@ -4,9 +4,27 @@ Provides intelligent career coaching using multiple LLM models
 """
 
 import requests
+import hashlib
 import json
+import os
 from typing import Optional, Dict, List
 
+from . import profiling
+from .resume_pipeline import extract_resume, format_resume_summary
+from .skill_gap import analyze_skill_gap, format_skill_gap
+from .single_flight import SingleFlight
+
+# Chat completions endpoint (override for proxies or local stubs)
+OPENROUTER_URL = os.environ.get("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1/chat/completions")
+
+# Identical concurrent completions (same model, messages and settings) share
+# one request, but only between callers using the same API key: the request
+# is billed to that key, so a caller never gets a reply paid for by another
+# user's key (nor one their own invalid or exhausted key could not get).
+# A failed request is retried by each waiting caller rather than handing
+# them its error.
+_completion_flight = SingleFlight("llm", share_errors=False)
+
 class OpenRouterAgent:
     """AI Agent powered by OpenRouter for career guidance"""
     
@@ -26,7 +44,7 @@ class OpenRouterAgent:
         """
         self.api_key = api_key
         self.model = model
-        self.base_url = "https://openrouter.ai/api/v1/chat/completions"
+        self.base_url = OPENROUTER_URL
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "HTTP-Referer": "https://github.com/advanced-ai-career-bot",
@@ -46,6 +64,7 @@ Provide practical, actionable advice tailored to the user's specific situation.
 Be encouraging, professional, and honest. If you don't know something, say so.
 Use examples and specific recommendations when possible."""
     
+    @profiling.profiled("llm_career_advice")
     def get_career_advice(
         self, 
         user_query: str, 
@@ -96,23 +115,32 @@ Use examples and specific recommendations when possible."""
                 "max_tokens": max_tokens
             }
             
-            response = requests.post(
+            key = (
                 self.base_url,
-                headers=self.headers,
-                json=payload,
-                timeout=60
+                hashlib.sha256(self.api_key.encode('utf-8')).hexdigest(),
+                json.dumps(payload, sort_keys=True)
             )
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            return result['choices'][0]['message']['content']
+            return _completion_flight.do(key, self._complete, payload)
         
         except requests.exceptions.RequestException as e:
             return f"Error communicating with AI: {str(e)}\n\nPlease check your API key and try again."
         except Exception as e:
             return f"Unexpected error: {str(e)}"
     
+    def _complete(self, payload: Dict) -> str:
+        """Send one chat completion request and return the reply text"""
+        response = requests.post(
+            self.base_url,
+            headers=self.headers,
+            json=payload,
+            timeout=60
+        )
+        
+        response.raise_for_status()
+        result = response.json()
+        
+        return result['choices'][0]['message']['content']
+    
     def generate_interview_questions(
         self, 
         career: str, 
@@ -141,11 +169,13 @@ Format clearly with numbers and sections."""
         
         return self.get_career_advice(prompt, max_tokens=2000)
     
+    @profiling.profiled("llm_learning_plan")
     def create_learning_plan(
         self,
         current_role: str,
         target_role: str,
-        timeframe: str = "6 months"
+        timeframe: str = "6 months",
+        current_skills: Optional[List[str]] = None
     ) -> str:
         """
         Create a personalized learning plan
@@ -154,10 +184,31 @@ Format clearly with numbers and sections."""
             current_role: User's current role/skills
             target_role: Desired career goal
             timeframe: Time available for learning
+            current_skills: Optional list of the user's skills. When given, the
+                            skills gap is computed locally and only the compact
+                            gap is sent to the LLM
         
         Returns:
             Structured learning plan
         """
+        gap = analyze_skill_gap(current_skills, target_role) if current_skills is not None else None
+        
+        # Careers without a skills mapping fall back to an LLM-side gap analysis
+        if gap and (gap['matched'] or gap['missing']):
+            prompt = f"""Create a {timeframe} learning plan for someone moving from {current_role} to {target_role}.
+
+Precomputed skills gap (already analyzed, do not repeat it):
+{format_skill_gap(gap)}
+
+Include:
+1. Monthly learning milestones covering the missing skills in the given order
+2. Practice exercises and projects
+3. Community/networking recommendations
+
+Be concise, actionable and realistic for the given timeframe."""
+            
+            return self.get_career_advice(prompt, max_tokens=1200)
+        
         prompt = f"""Create a detailed {timeframe} learning plan for someone transitioning from:
 Current: {current_role}
 Target: {target_role}
@@ -173,17 +224,54 @@ Make it actionable and realistic for the given timeframe."""
         
         return self.get_career_advice(prompt, max_tokens=2000)
     
-    def analyze_resume(self, resume_text: str, target_role: str) -> str:
+    def analyze_resume(
+        self,
+        resume_text: str,
+        target_role: str,
+        recommendations: Optional[List[Dict]] = None,
+        full_text: bool = False
+    ) -> str:
         """
         Analyze resume and provide feedback
         
         Args:
             resume_text: Text content of resume
             target_role: Target job role
+            recommendations: Optional local model recommendations for the
+                             resume (e.g., from resume_pipeline.score_resumes)
+            full_text: Send the whole resume instead of the locally
+                       extracted summary (also done when the summary would
+                       not be shorter than the resume)
         
         Returns:
             Resume analysis and improvement suggestions
         """
+        profile = None if full_text else extract_resume(resume_text)
+        summary = format_resume_summary(profile, recommendations) if profile else ""
+        
+        # Short resumes, and those with neither known headings nor skills,
+        # fall back to the full text
+        if profile and (profile['sections'] or profile['skills']) and len(summary) < len(resume_text):
+            gap = analyze_skill_gap(profile['skills'], target_role)
+            gap_text = format_skill_gap(gap) if gap['matched'] or gap['missing'] else "No skills mapping for this role"
+            prompt = f"""Review a resume for a {target_role} position. It was summarized locally (the full text is not included):
+
+{summary}
+
+Precomputed skills gap for the target role (already analyzed, do not repeat it):
+{gap_text}
+
+Provide:
+1. Strengths
+2. Areas for improvement
+3. Missing keywords/skills worth adding, if the candidate has them
+4. Structure suggestions based on the sections found
+5. Specific action items to improve the resume
+
+Be constructive, specific and concise."""
+            
+            return self.get_career_advice(prompt, max_tokens=1200)
+        
         prompt = f"""Analyze this resume for a {target_role} position:
 
 {resume_text}
@@ -256,11 +344,19 @@ Be specific and practical."""
 class StreamingOpenRouterAgent(OpenRouterAgent):
     """Extended agent with streaming support"""
     
-    def stream_career_advice(self, user_query: str, context: Optional[List[Dict]] = None):
+    @profiling.profiled("llm_career_advice_stream")
+    def stream_career_advice(
+        self,
+        user_query: str,
+        context: Optional[List[Dict]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000
+    ):
         """
         Stream career advice (for real-time responses)
         
-        Yields response chunks as they arrive
+        Same request as get_career_advice(), but yields response chunks as
+        they arrive
         """
         messages = [
             {"role": "system", "content": self.system_prompt}
@@ -272,7 +368,7 @@ class StreamingOpenRouterAgent(OpenRouterAgent):
                 context_str += f"{i}. {rec['career']} (Confidence: {rec['confidence']:.1f}%)\n"
             messages.append({
                 "role": "system",
-                "content": f"Context: {context_str}"
+                "content": f"Context: {context_str}\nUse this information to provide personalized advice."
             })
         
         messages.append({"role": "user", "content": user_query})
@@ -280,32 +376,37 @@ class StreamingOpenRouterAgent(OpenRouterAgent):
         payload = {
             "model": self.model,
             "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
             "stream": True
         }
         
         try:
-            response = requests.post(
+            # Closing the response (also when a cancelled job closes this
+            # generator) releases the connection right away
+            with requests.post(
                 self.base_url,
                 headers=self.headers,
                 json=payload,
                 stream=True,
                 timeout=60
-            )
-            
-            for line in response.iter_lines():
-                if line:
-                    line = line.decode('utf-8')
-                    if line.startswith('data: '):
-                        data = line[6:]
-                        if data != '[DONE]':
-                            try:
-                                chunk = json.loads(data)
-                                if 'choices' in chunk and len(chunk['choices']) > 0:
-                                    delta = chunk['choices'][0].get('delta', {})
-                                    if 'content' in delta:
-                                        yield delta['content']
-                            except json.JSONDecodeError:
-                                continue
+            ) as response:
+                response.raise_for_status()
+                
+                for line in response.iter_lines():
+                    if line:
+                        line = line.decode('utf-8')
+                        if line.startswith('data: '):
+                            data = line[6:]
+                            if data != '[DONE]':
+                                try:
+                                    chunk = json.loads(data)
+                                    if 'choices' in chunk and len(chunk['choices']) > 0:
+                                        delta = chunk['choices'][0].get('delta', {})
+                                        if 'content' in delta:
+                                            yield delta['content']
+                                except json.JSONDecodeError:
+                                    continue
         
         except Exception as e:
             yield f"Error: {str(e)}"
@@ -0,0 +1,283 @@
+"""
+Profiling Hooks - On-demand cProfile / stack sampling captures per request
+Wraps slow entry points (recommendations, LLM calls) and writes .pstats files
+or flamegraph-compatible collapsed stacks into a rotating directory
+
+Disabled by default. Configured once at import time from the environment:
+    CAREER_PROFILE=1          profile every call (or N to sample 1-in-N calls)
+    CAREER_PROFILE_MODE       "cprofile" (.pstats, default) or "sample" (.collapsed)
+    CAREER_PROFILE_DIR        output directory (default: <tmp>/career_bot_profiles)
+    CAREER_PROFILE_KEEP       number of captures kept (default: 50)
+    CAREER_PROFILE_MIN_MS     only keep captures slower than this (default: 0)
+
+Malformed values fall back to the defaults with a warning on stderr. When
+disabled, profiled() returns the wrapped function unchanged.
+"""
+
+import cProfile
+import functools
+import inspect
+import itertools
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Iterator
+
+# Seconds between stack samples in "sample" mode
+SAMPLE_INTERVAL = 0.005
+
+# Capture formats (CAREER_PROFILE_MODE)
+PROFILE_MODES = ("cprofile", "sample")
+
+def _warn(name: str, value: str, fallback):
+    print(f"Warning: ignoring {name}={value!r}, using {fallback!r}", file=sys.stderr)
+
+def _parse_rate(value: str) -> int:
+    """CAREER_PROFILE value -> sample every Nth call (0 = disabled)"""
+    value = value.strip().lower()
+    if value in ("", "0", "false", "no", "off"):
+        return 0
+    if value in ("1", "true", "yes", "on", "all"):
+        return 1
+    try:
+        return max(0, int(value))
+    except ValueError:
+        _warn("CAREER_PROFILE", value, 0)
+        return 0
+
+def _env_number(name: str, parse: Callable, default):
+    """Numeric environment value, or default (with a warning) if malformed"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return parse(value)
+    except ValueError:
+        _warn(name, value, default)
+        return default
+
+def _env_mode() -> str:
+    """CAREER_PROFILE_MODE, or "cprofile" (with a warning) if unknown"""
+    value = os.environ.get("CAREER_PROFILE_MODE", PROFILE_MODES[0])
+    if value.lower() in PROFILE_MODES:
+        return value.lower()
+    _warn("CAREER_PROFILE_MODE", value, PROFILE_MODES[0])
+    return PROFILE_MODES[0]
+
+# Global profiling configuration (read once; see module docstring)
+_rate = _parse_rate(os.environ.get("CAREER_PROFILE", ""))
+_mode = _env_mode()
+_directory = Path(os.environ.get("CAREER_PROFILE_DIR", Path(tempfile.gettempdir()) / "career_bot_profiles"))
+_keep = _env_number("CAREER_PROFILE_KEEP", int, 50)
+_min_ms = _env_number("CAREER_PROFILE_MIN_MS", float, 0.0)
+
+_sequence = itertools.count()
+# cProfile allows one active profiler per process, so captures never overlap
+_capture_lock = threading.Lock()
+_rotate_lock = threading.Lock()
+
+def is_enabled() -> bool:
+    """Whether profiled() wraps functions"""
+    return _rate > 0
+
+def profile_dir() -> Path:
+    """Directory captures are written to"""
+    return _directory
+
+class _StackSampler:
+    """Samples one thread's Python stack on a background thread"""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def _rotate():
+    """Delete the oldest captures beyond the keep limit"""
+    with _rotate_lock:
+        captures = sorted(
+            (p for p in _directory.iterdir() if p.suffix in ('.pstats', '.collapsed')),
+            key=lambda p: p.stat().st_mtime
+        )
+        for old in captures[:max(0, len(captures) - _keep)]:
+            try:
+                old.unlink()
+            except FileNotFoundError:
+                pass
+
+def _capture_path(name: str, elapsed_ms: float) -> Path:
+    """Unique, sortable file name for a capture"""
+    suffix = '.collapsed' if _mode == 'sample' else '.pstats'
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return _directory / f"{stamp}-{name}-{elapsed_ms:.0f}ms-{os.getpid()}-{next(_sequence)}{suffix}"
+
+class _Recorder:
+    """
+    One capture, recorded over one or more pieces of work
+
+    Each piece runs under the process-wide capture lock; pieces that find
+    the lock taken (another capture, or a nested profiled call) or another
+    profiler active run unprofiled.
+    """
+
+    def __init__(self):
+        self.elapsed_ms = 0.0
+        self.recorded = False
+        self._profile = None if _mode == 'sample' else cProfile.Profile()
+        self._stacks = Counter()
+
+    def run(self, func: Callable, *args, **kwargs):
+        """Call func, profiling the call if no other capture is running"""
+        if not _capture_lock.acquire(blocking=False):
+            return func(*args, **kwargs)
+
+        try:
+            if self._profile is None:
+                sampler = _StackSampler(threading.get_ident())
+                sampler.start()
+            else:
+                sampler = None
+                try:
+                    self._profile.enable()
+                except ValueError:
+                    # Another profiler (e.g., a debugger) is already active
+                    return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.elapsed_ms += (time.perf_counter() - start) * 1000
+                self.recorded = True
+                if sampler is not None:
+                    sampler.stop()
+                    self._stacks.update(sampler.stacks)
+                else:
+                    self._profile.disable()
+        finally:
+            _capture_lock.release()
+
+    def write(self, name: str):
+        """Write the capture (if anything was recorded and it was slow enough)"""
+        if not self.recorded or self.elapsed_ms < _min_ms:
+            return
+        try:
+            _directory.mkdir(parents=True, exist_ok=True)
+            path = _capture_path(name, self.elapsed_ms)
+            if self._profile is None:
+                # Collapsed stacks ("frame;frame;frame count" per line)
+                with open(path, 'w', encoding='utf-8') as f:
+                    for stack, count in self._stacks.most_common():
+                        f.write(f"{stack} {count}\n")
+            else:
+                self._profile.dump_stats(str(path))
+            _rotate()
+        except Exception:
+            # Profiling must never break the request (nor interpreter
+            # shutdown, when an abandoned stream is finalized late)
+            pass
+
+def capture(name: str, func: Callable, *args, **kwargs):
+    """
+    Call a function under the profiler and write the capture
+
+    Falls through to a plain call if another capture is already running
+    (including nested profiled calls).
+
+    Args:
+        name: Capture name used in the file name (e.g., "recommendations")
+        func: Function to call
+
+    Returns:
+        The function's return value
+    """
+    recorder = _Recorder()
+    try:
+        return recorder.run(func, *args, **kwargs)
+    finally:
+        recorder.write(name)
+
+def capture_iter(name: str, func: Callable, *args, **kwargs) -> Iterator:
+    """
+    Like capture(), for generator functions (e.g., streamed LLM replies)
+
+    Each step of the generator is profiled on its own and added to one
+    capture, written when the generator is exhausted or closed. The capture
+    lock is never held while the consumer has the item, so a slow or
+    abandoned stream does not block other captures.
+    """
+    recorder = _Recorder()
+    iterator = func(*args, **kwargs)
+    try:
+        while True:
+            try:
+                item = recorder.run(next, iterator)
+            except StopIteration:
+                return
+            yield item
+    finally:
+        iterator.close()
+        recorder.write(name)
+
+def profiled(name: str) -> Callable:
+    """
+    Decorator profiling 1-in-N calls of a function (per CAREER_PROFILE)
+
+    Calls are counted per decorated function. Generator functions are
+    profiled step by step into one capture (see capture_iter()).
+
+    Args:
+        name: Capture name used in the file name
+
+    Returns:
+        Decorator; returns the function unchanged when profiling is disabled
+    """
+    def decorator(func):
+        if not _rate:
+            return func
+
+        calls = itertools.count()
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                if next(calls) % _rate:
+                    return func(*args, **kwargs)
+                return capture_iter(name, func, *args, **kwargs)
+
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if next(calls) % _rate:
+                return func(*args, **kwargs)
+            return capture(name, func, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,367 @@
+"""
+Resume Pipeline - Local resume extraction for the recommender and the LLM
+Streams resume text line by line, tracks section headings and finds skill
+mentions with one Aho-Corasick pass per line over the skills_mapping
+vocabulary. The extracted profile is scored against the local model (many
+resumes in one batch) and condensed into a compact summary, which is what
+OpenRouterAgent.analyze_resume sends to the LLM instead of the whole resume.
+"""
+
+import json
+import re
+import sys
+from collections import deque
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from .skill_gap import load_skills_mapping
+
+# Section headings (a line holding just the heading, optionally "Heading: text")
+SECTION_HEADINGS = {
+    'summary': ('summary', 'professional summary', 'profile', 'objective', 'about me'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment', 'work history'),
+    'education': ('education', 'academic background'),
+    'skills': ('skills', 'technical skills', 'core competencies', 'technologies'),
+    'projects': ('projects', 'personal projects'),
+    'certifications': ('certifications', 'certificates', 'licenses'),
+}
+
+# Sections whose text describes the person (fed to the model as the description)
+DESCRIPTION_SECTIONS = ('summary', 'experience', 'projects')
+
+# Characters of description text kept for the model query and the LLM summary
+DESCRIPTION_CHARS = 1000
+SUMMARY_CHARS = 300
+
+# Skills passed to the model query and listed in the LLM summary
+MAX_SKILLS = 20
+
+# Highest degree wins; labels match the app's education options
+DEGREES = [
+    ("PhD", r"ph\.?\s?d|doctorate"),
+    ("Master's Degree", r"master'?s?|m\.?sc|mba|m\.?eng"),
+    ("Bachelor's Degree", r"bachelor'?s?|b\.?sc|b\.?eng|b\.?a\."),
+    ("Associate Degree", r"associate'?s? degree"),
+    ("High School", r"high school"),
+]
+
+# Years of experience -> the app's experience levels
+EXPERIENCE_LEVELS = [(2, "Beginner"), (5, "Intermediate"), (10, "Advanced")]
+
+_HEADING = re.compile(
+    r"^[#*\s]*(" + "|".join(
+        re.escape(name) for name in sorted(
+            (name for names in SECTION_HEADINGS.values() for name in names), key=len, reverse=True
+        )
+    ) + r")[*\s]*(?::\s*(.*))?$",
+    re.IGNORECASE
+)
+_SECTION_OF = {name: section for section, names in SECTION_HEADINGS.items() for name in names}
+_DEGREES = [(label, re.compile(r"(?<![a-z])(?:" + pattern + r")(?![a-z])")) for label, pattern in DEGREES]
+_YEARS = re.compile(r"(?<!\d)(\d{1,2})\+?\s*(?:years?|yrs?)\b")
+# Outside the education section, degrees only count on lines like these
+# (so "Scrum Master" is not a master's degree)
+_SCHOOL = re.compile(r"degree|universit|college|school|institute")
+# Contact lines (kept out of the description)
+_CONTACT = re.compile(r"@|https?://|www\.|\d[\d ().-]{7,}\d")
+
+# Global variable for the compiled skill matcher
+_skill_matcher = None
+
+def _normalize(text: str) -> str:
+    """Lower-case and collapse whitespace (as skill_gap does for skills)"""
+    return " ".join(text.lower().split())
+
+def _is_boundary(text: str, i: int, key: str) -> bool:
+    """Whether text[i] (or the edge of text) ends a mention of key; one-letter skills also stop at '&' ("R&D")"""
+    if i < 0 or i >= len(text):
+        return True
+    return not (text[i].isalnum() or (len(key) == 1 and text[i] == '&'))
+
+class SkillMatcher:
+    """Aho-Corasick automaton finding whole-word skill mentions in normalized text"""
+
+    def __init__(self, skills: Iterable[str]):
+        """
+        Args:
+            skills: Skill names; matching is case-insensitive and the first
+                    spelling of each skill is the one reported
+        """
+        self.names = {}
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for skill in skills:
+            key = _normalize(skill)
+            if not key or key in self.names:
+                continue
+            self.names[key] = skill.strip()
+            state = 0
+            for char in key:
+                if char not in self.goto[state]:
+                    self.goto[state][char] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = self.goto[state][char]
+            self.output[state].append(key)
+
+        # Failure links, breadth first; outputs include those of the fallback state
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find(self, text: str) -> Iterator[str]:
+        """
+        Skills mentioned in text as whole words/phrases, in order of their end
+
+        A mention inside a longer one ("APIs" in "Web APIs", "C" in "C++")
+        is not reported separately.
+
+        Args:
+            text: Normalized text (see _normalize)
+        """
+        goto, fail, output = self.goto, self.fail, self.output
+        spans = []
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+            for key in output[state]:
+                start = end - len(key) + 1
+                if _is_boundary(text, start - 1, key) and _is_boundary(text, end + 1, key):
+                    spans.append((start, end, key))
+
+        # Longest first among mentions starting together, then drop the ones
+        # ending within an earlier-starting mention
+        spans.sort(key=lambda span: (span[0], -span[1]))
+        kept = []
+        reach = -1
+        for start, end, key in spans:
+            if end > reach:
+                kept.append((end, key))
+                reach = end
+        for _, key in sorted(kept):
+            yield self.names[key]
+
+def get_skill_matcher() -> SkillMatcher:
+    """Matcher over every skill in skills_mapping.csv (compiled on first use)"""
+    global _skill_matcher
+
+    if _skill_matcher is None:
+        _skill_matcher = SkillMatcher(
+            skill for skills in load_skills_mapping().values() for skill in skills
+        )
+    return _skill_matcher
+
+def _experience_level(years: Optional[int]) -> str:
+    """Experience level for the largest number of years mentioned"""
+    if years is None:
+        return "Not specified"
+    for limit, level in EXPERIENCE_LEVELS:
+        if years < limit:
+            return level
+    return "Expert"
+
+def extract_resume(resume: Union[str, Iterable[str]], matcher: Optional[SkillMatcher] = None) -> Dict:
+    """
+    Extract a compact profile from a resume in one streaming pass
+
+    Args:
+        resume: Resume text, or an iterable of lines (e.g., an open file)
+        matcher: Skill matcher (default: the skills_mapping vocabulary)
+
+    Returns:
+        Dictionary with the skills found (first-mention order) and their
+        mention counts, line count per section, years of experience and
+        the matching experience level, highest education, a description
+        built from the summary/experience/projects text, and the resume's
+        size in characters
+    """
+    matcher = matcher or get_skill_matcher()
+    lines = resume.splitlines() if isinstance(resume, str) else resume
+
+    mentions = {}
+    sections = {}
+    section = None
+    description = []
+    described = 0
+    years = None
+    degree_rank = len(DEGREES)
+    characters = 0
+
+    for line in lines:
+        characters += len(line)
+        text = line.strip()
+        if not text:
+            continue
+
+        heading = _HEADING.match(text)
+        if heading:
+            section = _SECTION_OF[heading.group(1).lower()]
+            sections.setdefault(section, 0)
+            text = heading.group(2) or ""
+            if not text:
+                continue
+        if section:
+            sections[section] += 1
+
+        normalized = _normalize(text)
+        for skill in matcher.find(normalized):
+            mentions[skill] = mentions.get(skill, 0) + 1
+        for match in _YEARS.finditer(normalized):
+            years = max(years or 0, int(match.group(1)))
+        if section == 'education' or _SCHOOL.search(normalized):
+            for rank, (_, pattern) in enumerate(_DEGREES[:degree_rank]):
+                if pattern.search(normalized):
+                    degree_rank = rank
+                    break
+
+        # Untitled opening lines count as the summary, except contact details
+        if section is None and _CONTACT.search(text):
+            continue
+        if (section or 'summary') in DESCRIPTION_SECTIONS and described < DESCRIPTION_CHARS:
+            description.append(text[:DESCRIPTION_CHARS - described])
+            described += len(description[-1]) + 1
+
+    return {
+        'skills': list(mentions),
+        'skill_mentions': mentions,
+        'sections': sections,
+        'years_experience': years,
+        'experience_level': _experience_level(years),
+        'education': DEGREES[degree_rank][0] if degree_rank < len(DEGREES) else "Not specified",
+        'description': " ".join(description),
+        'characters': characters,
+    }
+
+def resume_query(profile: Dict) -> str:
+    """Enhanced query for an extracted profile (same layout as the app's)"""
+    from .model_loader import build_enhanced_query
+
+    return build_enhanced_query(
+        profile['description'],
+        profile['skills'][:MAX_SKILLS],
+        profile['experience_level'],
+        profile['education']
+    )
+
+def score_resumes(resumes: List[Union[str, Iterable[str]]], top_k: int = 5, **options) -> List[Dict]:
+    """
+    Extract and score several resumes with one batched model call
+
+    Args:
+        resumes: Resume texts or line iterables
+        top_k: Recommendations per resume
+        **options: Further get_career_recommendations_batch arguments
+
+    Returns:
+        One {'profile', 'recommendations'} dict per resume, in input order
+    """
+    from .model_loader import get_career_recommendations_batch
+
+    profiles = [extract_resume(resume) for resume in resumes]
+    recommendations = get_career_recommendations_batch(
+        [resume_query(profile) for profile in profiles], top_k=top_k, **options
+    )
+    return [
+        {'profile': profile, 'recommendations': recs}
+        for profile, recs in zip(profiles, recommendations)
+    ]
+
+def format_resume_summary(profile: Dict, recommendations: Optional[List[Dict]] = None) -> str:
+    """
+    Format an extracted profile as a compact text block for LLM prompts
+
+    Args:
+        profile: Result of extract_resume
+        recommendations: Local model recommendations for the resume, if any
+
+    Returns:
+        Compact multi-line summary of the resume
+    """
+    lines = []
+    if profile['sections']:
+        lines.append("Sections: " + ", ".join(
+            f"{section} ({count} lines)" for section, count in profile['sections'].items()
+        ))
+    else:
+        lines.append("Sections: no standard headings found")
+
+    years = profile['years_experience']
+    lines.append(
+        f"Experience: {profile['experience_level']}"
+        + (f" ({years} years mentioned)" if years is not None else "")
+    )
+    lines.append(f"Education: {profile['education']}")
+
+    skills = sorted(profile['skill_mentions'].items(), key=lambda item: -item[1])[:MAX_SKILLS]
+    if skills:
+        lines.append(f"Skills found ({len(profile['skills'])}): " + ", ".join(
+            f"{skill} x{count}" if count > 1 else skill for skill, count in skills
+        ))
+    else:
+        lines.append("Skills found: none from the skills vocabulary")
+
+    if recommendations:
+        lines.append("Local model best fits: " + ", ".join(
+            f"{rec['career']} ({float(rec['confidence']):.0f}%)" for rec in recommendations
+        ))
+
+    summary = profile['description'][:SUMMARY_CHARS]
+    if summary:
+        lines.append(f"Opening text: {summary}")
+    lines.append(f"Resume length: {profile['characters']} characters")
+
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point (see score_resumes.py)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Extract and score resumes with the local career model")
+    parser.add_argument("resumes", type=Path, nargs="+", help="Plain-text resume files")
+    parser.add_argument("--top-k", type=int, default=5, help="Recommendations per resume")
+    args = parser.parse_args(argv)
+
+    from .model_loader import load_model
+
+    if not load_model():
+        print("Error: could not load the career model", file=sys.stderr)
+        return 1
+
+    try:
+        with ExitStack() as stack:
+            files = [stack.enter_context(open(path, 'r', encoding='utf-8', errors='replace')) for path in args.resumes]
+            results = score_resumes(files, top_k=args.top_k)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    for path, result in zip(args.resumes, results):
+        profile = result['profile']
+        print(json.dumps({
+            'file': str(path),
+            'skills': profile['skills'],
+            'experience_level': profile['experience_level'],
+            'education': profile['education'],
+            'recommendations': [
+                {'career': str(rec['career']), 'confidence': round(float(rec['confidence']), 2), 'method': rec['method']}
+                for rec in result['recommendations']
+            ],
+            'summary_chars': len(format_resume_summary(profile, result['recommendations'])),
+            'resume_chars': profile['characters'],
+        }))
+    return 0
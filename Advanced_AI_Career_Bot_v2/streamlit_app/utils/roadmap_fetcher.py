@@ -6,6 +6,9 @@ Fetches career roadmaps and learning paths from roadmap.sh
 import requests
 from typing import Dict, List, Optional
 import json
+import re
+from collections import deque
+from pathlib import Path
 
 # Roadmap mapping
 ROADMAP_MAPPING = {
@@ -23,6 +26,16 @@ ROADMAP_MAPPING = {
     "Blockchain Developer": "blockchain"
 }
 
+# Local store of roadmaps synced from roadmap.sh (written by sync_roadmaps.py)
+ROADMAP_STORE_PATH = Path(__file__).parent.parent / "datasets" / "roadmap_store.json"
+
+# Roadmaps that build on other roadmaps (career -> prerequisite roadmaps, in order)
+ROADMAP_PREREQUISITES = {
+    "Full Stack Developer": ["Frontend Developer", "Backend Developer"],
+    "Machine Learning Engineer": ["Data Scientist"],
+    "AI Engineer": ["Data Scientist"]
+}
+
 # Roadmap.sh content (curated from roadmap.sh)
 ROADMAP_CONTENT = {
     "Frontend Developer": {
@@ -425,6 +438,10 @@ ROADMAP_CONTENT = {
     }
 }
 
+# Global variables for the synced store and the compiled roadmap graph
+_roadmap_store = None
+_roadmap_graph = None
+
 def fetch_career_roadmap(career: str) -> Optional[Dict]:
     """
     Fetch career roadmap from curated content
@@ -444,6 +461,12 @@ def fetch_career_roadmap(career: str) -> Optional[Dict]:
         if career.lower() in key.lower() or key.lower() in career.lower():
             return ROADMAP_CONTENT[key]
     
+    # Use content synced from roadmap.sh (local store only, never the network)
+    slug = ROADMAP_MAPPING.get(career)
+    store = load_roadmap_store()
+    if slug and slug in store:
+        return store[slug]['roadmap']
+    
     # Return generic tech roadmap structure
     return {
         "title": f"{career} Roadmap",
@@ -493,6 +516,48 @@ def fetch_career_roadmap(career: str) -> Optional[Dict]:
         ]
     }
 
+def load_roadmap_store() -> Dict:
+    """
+    Load the local roadmap.sh store, reading it from disk once
+    
+    Returns:
+        Dictionary mapping roadmap.sh slugs to synced entries (empty if the
+        store has not been created yet)
+    """
+    global _roadmap_store
+    
+    if _roadmap_store is None:
+        try:
+            with open(ROADMAP_STORE_PATH, 'r', encoding='utf-8') as f:
+                _roadmap_store = json.load(f).get('roadmaps', {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            _roadmap_store = {}
+    
+    return _roadmap_store
+
+def reload_roadmap_store():
+    """Drop the in-memory store and compiled graph so they are rebuilt on next use"""
+    global _roadmap_store, _roadmap_graph
+    
+    _roadmap_store = None
+    _roadmap_graph = None
+
+def get_roadmap_content() -> Dict:
+    """
+    Get curated roadmap content merged with roadmaps synced from roadmap.sh
+    
+    Curated content takes precedence; synced roadmaps fill in careers that
+    only have a slug in ROADMAP_MAPPING.
+    """
+    content = dict(ROADMAP_CONTENT)
+    store = load_roadmap_store()
+    
+    for career, slug in ROADMAP_MAPPING.items():
+        if career not in content and slug in store:
+            content[career] = store[slug]['roadmap']
+    
+    return content
+
 def get_roadmap_url(career: str) -> str:
     """Get the roadmap.sh URL for a career"""
     slug = ROADMAP_MAPPING.get(career, "")
@@ -502,4 +567,257 @@ def get_roadmap_url(career: str) -> str:
 
 def get_all_roadmaps() -> List[str]:
     """Get list of all available roadmaps"""
-    return list(ROADMAP_CONTENT.keys())
+    return list(get_roadmap_content().keys())
+
+def _topic_key(topic: str) -> str:
+    """Normalize a topic label into its graph node key"""
+    return " ".join(re.findall(r"[a-z0-9#+.]+", topic.lower())).strip(". ")
+
+def _topic_words(topic: str) -> List[str]:
+    """Split a topic into index words"""
+    return [w.strip(".") for w in re.findall(r"[a-z0-9#+.]+", topic.lower()) if w.strip(".")]
+
+def _resolve_roadmap(career: str, names) -> Optional[str]:
+    """Resolve a career name against roadmap names (direct, then partial match)"""
+    if career in names:
+        return career
+    for name in names:
+        if career.lower() in name.lower() or name.lower() in career.lower():
+            return name
+    return None
+
+def compile_roadmap_graph(content: Optional[Dict] = None) -> Dict:
+    """
+    Compile roadmap content into a graph with a topic-level index
+    
+    Topic nodes are shared across roadmaps, consecutive sections of a roadmap
+    are linked as prerequisite edges, and every topic is indexed back to the
+    roadmaps and sections that cover it. Careers that share a roadmap.sh slug
+    reuse the same sections.
+    
+    Args:
+        content: Roadmap content to compile (default: get_roadmap_content())
+    
+    Returns:
+        Compiled graph dictionary
+    """
+    content = get_roadmap_content() if content is None else content
+    
+    topics = {}
+    word_index = {}
+    roadmaps = {}
+    
+    # Careers without curated content borrow sections from a career with the same slug
+    sources = dict((career, career) for career in content)
+    for career, slug in ROADMAP_MAPPING.items():
+        if career not in sources:
+            for other in content:
+                if ROADMAP_MAPPING.get(other) == slug:
+                    sources[career] = other
+                    break
+    
+    for career, source in sources.items():
+        sections = []
+        for idx, section in enumerate(content[source]['sections']):
+            keys = []
+            for label in section.get('topics', []):
+                key = _topic_key(label)
+                if not key:
+                    continue
+                node = topics.setdefault(key, {'label': label, 'occurrences': []})
+                node['occurrences'].append((career, idx))
+                keys.append(key)
+                for word in _topic_words(label):
+                    word_index.setdefault(word, set()).add(key)
+            sections.append({
+                'title': section['title'],
+                'topics': keys,
+                'next': idx + 1 if idx + 1 < len(content[source]['sections']) else None
+            })
+        roadmaps[career] = {'source': source, 'sections': sections}
+    
+    # Roadmap-level edges: prerequisite roadmap -> dependent roadmap
+    names = set(roadmaps) | set(ROADMAP_MAPPING) | set(ROADMAP_PREREQUISITES)
+    dependents = dict((name, []) for name in names)
+    for career, prerequisites in ROADMAP_PREREQUISITES.items():
+        for prerequisite in prerequisites:
+            dependents.setdefault(prerequisite, []).append(career)
+    
+    return {
+        'topics': topics,
+        'word_index': word_index,
+        'roadmaps': roadmaps,
+        'prerequisites': dict((name, ROADMAP_PREREQUISITES.get(name, [])) for name in names),
+        'dependents': dependents
+    }
+
+def get_roadmap_graph() -> Dict:
+    """Get the compiled roadmap graph, compiling it on first use"""
+    global _roadmap_graph
+    
+    if _roadmap_graph is None:
+        _roadmap_graph = compile_roadmap_graph()
+    
+    return _roadmap_graph
+
+def _expanded_sections(graph: Dict, career: str) -> List[Dict]:
+    """Sections of a roadmap, expanded through its prerequisite roadmaps"""
+    sections = []
+    for prerequisite in graph['prerequisites'].get(career, []):
+        sections.extend(_expanded_sections(graph, prerequisite))
+    
+    roadmap = graph['roadmaps'].get(career)
+    if roadmap:
+        sections.extend(dict(section, roadmap=career) for section in roadmap['sections'])
+    
+    return sections
+
+def find_roadmaps_for_topic(topic: str) -> List[Dict]:
+    """
+    Find which roadmaps cover a topic (e.g., "Docker")
+    
+    Exact topic matches come first, followed by topics containing every word
+    of the query (e.g., "Docker Compose").
+    
+    Args:
+        topic: Topic name
+    
+    Returns:
+        List of dictionaries with career, section and topic label
+    """
+    graph = get_roadmap_graph()
+    key = _topic_key(topic)
+    
+    keys = [key] if key in graph['topics'] else []
+    words = _topic_words(topic)
+    if words:
+        candidates = set.intersection(*(graph['word_index'].get(w, set()) for w in words))
+        keys.extend(sorted(candidates - {key}))
+    
+    results = []
+    for match in keys:
+        node = graph['topics'][match]
+        for career, idx in node['occurrences']:
+            results.append({
+                'career': career,
+                'section': graph['roadmaps'][career]['sections'][idx]['title'],
+                'topic': node['label']
+            })
+    
+    return results
+
+def get_topic_prerequisites(career: str, topic: str) -> List[str]:
+    """
+    Get the roadmap sections to complete before a topic
+    
+    Args:
+        career: Career name
+        topic: Topic within the career's roadmap
+    
+    Returns:
+        Section titles in learning order (empty if the topic is not on the roadmap)
+    """
+    graph = get_roadmap_graph()
+    name = _resolve_roadmap(career, graph['prerequisites'])
+    key = _topic_key(topic)
+    
+    sections = _expanded_sections(graph, name) if name else []
+    for idx, section in enumerate(sections):
+        if key in section['topics']:
+            return [s['title'] for s in sections[:idx]]
+    
+    return []
+
+def get_roadmap_topics(career: str) -> List[str]:
+    """Get all topics of a career roadmap in learning order"""
+    graph = get_roadmap_graph()
+    name = _resolve_roadmap(career, graph['prerequisites'])
+    
+    if not name:
+        return []
+    
+    return [
+        graph['topics'][key]['label']
+        for section in _expanded_sections(graph, name)
+        for key in section['topics']
+    ]
+
+def find_roadmap_path(from_career: str, to_career: str) -> Optional[List[str]]:
+    """
+    Find the shortest chain of roadmaps from one career to another
+    
+    Args:
+        from_career: Starting career (e.g., "Frontend Developer")
+        to_career: Target career (e.g., "Full Stack Developer")
+    
+    Returns:
+        List of careers from start to target, or None if unreachable
+    """
+    graph = get_roadmap_graph()
+    start = _resolve_roadmap(from_career, graph['prerequisites'])
+    goal = _resolve_roadmap(to_career, graph['prerequisites'])
+    
+    if not start or not goal:
+        return None
+    
+    # Careers sharing a roadmap.sh slug are interchangeable
+    def neighbours(name):
+        linked = list(graph['dependents'].get(name, []))
+        slug = ROADMAP_MAPPING.get(name)
+        if slug:
+            linked.extend(other for other, s in ROADMAP_MAPPING.items() if s == slug and other != name)
+        return linked
+    
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        name = queue.popleft()
+        if name == goal:
+            path = []
+            while name is not None:
+                path.append(name)
+                name = parents[name]
+            return path[::-1]
+        for nxt in neighbours(name):
+            if nxt not in parents:
+                parents[nxt] = name
+                queue.append(nxt)
+    
+    return None
+
+def get_learning_path(from_career: str, to_career: str) -> List[Dict]:
+    """
+    Get the sections still to learn when moving from one career to another
+    
+    Args:
+        from_career: Career the user already covers
+        to_career: Target career
+    
+    Returns:
+        Target roadmap sections in learning order, each with only the topics
+        not already covered by the starting roadmap
+    """
+    graph = get_roadmap_graph()
+    start = _resolve_roadmap(from_career, graph['prerequisites'])
+    goal = _resolve_roadmap(to_career, graph['prerequisites'])
+    
+    if not goal:
+        return []
+    
+    known = set()
+    if start:
+        for section in _expanded_sections(graph, start):
+            known.update(section['topics'])
+    
+    path = []
+    for section in _expanded_sections(graph, goal):
+        remaining = [key for key in section['topics'] if key not in known]
+        if remaining:
+            path.append({
+                'career': section['roadmap'],
+                'section': section['title'],
+                'topics': [graph['topics'][key]['label'] for key in remaining]
+            })
+            known.update(remaining)
+    
+    return path
@@ -0,0 +1,350 @@
+"""
+Roadmap Sync - Offline ingestion of roadmap.sh roadmaps
+Parses roadmap.sh's open-source roadmap JSON files (from a local checkout,
+a dump directory, or conditional GETs) into the local roadmap store
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import requests
+
+from .roadmap_fetcher import ROADMAP_MAPPING, ROADMAP_STORE_PATH, reload_roadmap_store
+
+# Raw roadmap JSON files in the roadmap.sh repository (kamranahmedse/developer-roadmap)
+DEFAULT_BASE_URL = "https://raw.githubusercontent.com/kamranahmedse/developer-roadmap/master/src/data/roadmaps"
+
+STORE_VERSION = 1
+
+def content_hash(data: bytes) -> str:
+    """Hash raw roadmap file content for incremental re-sync"""
+    return hashlib.sha256(data).hexdigest()
+
+def _label(node: Dict) -> str:
+    """Get the display label of a roadmap.sh node"""
+    return " ".join(str(node.get('data', {}).get('label', '')).split())
+
+def _y(node: Dict) -> float:
+    """Vertical position of a node (roadmaps read top to bottom)"""
+    return float(node.get('position', {}).get('y', 0))
+
+def _check_sections(sections) -> List[Dict]:
+    """Validate sections in this app's format (raises ValueError)"""
+    if not isinstance(sections, list):
+        raise ValueError("'sections' must be a list")
+    for i, section in enumerate(sections):
+        if not isinstance(section, dict) or not isinstance(section.get('title'), str) or not section['title'].strip():
+            raise ValueError(f"section {i} needs a non-empty 'title'")
+        if not isinstance(section.get('description', ''), str):
+            raise ValueError(f"section {i}: 'description' must be a string")
+        topics = section.get('topics', [])
+        if not isinstance(topics, list) or not all(isinstance(t, str) for t in topics):
+            raise ValueError(f"section {i}: 'topics' must be a list of strings")
+        resources = section.get('resources', [])
+        if not isinstance(resources, list) or not all(
+            isinstance(r, dict) and isinstance(r.get('title'), str) and isinstance(r.get('url'), str)
+            for r in resources
+        ):
+            raise ValueError(f"section {i}: 'resources' must be a list of {{title, url}} objects")
+    return sections
+
+def _check_graph(data: Dict):
+    """Validate the node/edge shapes of a roadmap.sh document (raises ValueError)"""
+    nodes, edges = data.get('nodes', []), data.get('edges', [])
+    if not isinstance(nodes, list) or not isinstance(edges, list):
+        raise ValueError("'nodes' and 'edges' must be lists")
+    for i, node in enumerate(nodes):
+        if not isinstance(node, dict):
+            raise ValueError(f"node {i} is not an object")
+        if not isinstance(node.get('data', {}), dict) or not isinstance(node.get('position', {}), dict):
+            raise ValueError(f"node {i}: 'data' and 'position' must be objects")
+        y = node.get('position', {}).get('y', 0)
+        if isinstance(y, bool) or not isinstance(y, (int, float)):
+            raise ValueError(f"node {i}: position 'y' must be a number")
+        if node.get('type') in ('topic', 'subtopic') and not isinstance(node.get('id'), str):
+            raise ValueError(f"{node['type']} node {i} has no 'id'")
+    for i, edge in enumerate(edges):
+        if not isinstance(edge, dict) or not all(isinstance(edge.get(end, ""), str) for end in ('source', 'target')):
+            raise ValueError(f"edge {i} needs string 'source' and 'target'")
+
+def parse_roadmap_json(data: Dict, slug: str) -> Dict:
+    """
+    Parse a roadmap.sh roadmap JSON document into roadmap content
+
+    Supports the node/edge format used by roadmap.sh (``topic`` nodes become
+    sections, ``subtopic`` nodes become their topics) as well as documents
+    that already use this app's ``title``/``sections`` format.
+
+    Args:
+        data: Parsed JSON document
+        slug: roadmap.sh slug (e.g., "frontend")
+
+    Returns:
+        Roadmap dictionary in the same format as ROADMAP_CONTENT entries
+        (ValueError if the document is malformed)
+    """
+    url = f"https://roadmap.sh/{slug}"
+
+    if not isinstance(data, dict):
+        raise ValueError("roadmap document must be a JSON object")
+
+    if 'sections' in data:
+        for field in ('title', 'description', 'url'):
+            if not isinstance(data.get(field, ''), str):
+                raise ValueError(f"'{field}' must be a string")
+        return {
+            "title": data.get('title', f"{slug} Roadmap"),
+            "description": data.get('description', ''),
+            "url": data.get('url', url),
+            "sections": _check_sections(data['sections'])
+        }
+
+    _check_graph(data)
+
+    nodes = [n for n in data.get('nodes', []) if _label(n)]
+    by_id = dict((n['id'], n) for n in nodes if isinstance(n.get('id'), str))
+    topics = sorted((n for n in nodes if n.get('type') == 'topic'), key=_y)
+    subtopics = [n for n in nodes if n.get('type') == 'subtopic']
+    titles = [n for n in nodes if n.get('type') == 'title']
+
+    # Attach subtopics to the topic they are linked to, else the nearest topic above
+    children = dict((t['id'], []) for t in topics)
+    attached = set()
+    for edge in data.get('edges', []):
+        source, target = by_id.get(edge.get('source')), by_id.get(edge.get('target'))
+        if not source or not target:
+            continue
+        for parent, child in ((source, target), (target, source)):
+            if parent.get('type') == 'topic' and child.get('type') == 'subtopic' and child['id'] not in attached:
+                children[parent['id']].append(child)
+                attached.add(child['id'])
+
+    for sub in subtopics:
+        if sub.get('id') in attached or not topics:
+            continue
+        above = [t for t in topics if _y(t) <= _y(sub)] or topics[:1]
+        children[above[-1]['id']].append(sub)
+
+    sections = []
+    for topic in topics:
+        labels = [_label(c) for c in sorted(children[topic['id']], key=_y)]
+        sections.append({
+            "title": _label(topic),
+            "description": f"Key topics for {_label(topic)}.",
+            "topics": labels
+        })
+
+    title = _label(min(titles, key=_y)) if titles else slug.replace('-', ' ').title()
+
+    return {
+        "title": f"{title} Roadmap",
+        "description": f"Roadmap synced from roadmap.sh/{slug}",
+        "url": url,
+        "sections": sections
+    }
+
+def load_store(path: Path = ROADMAP_STORE_PATH) -> Dict:
+    """Load the roadmap store file (empty store if missing)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"version": STORE_VERSION, "roadmaps": {}}
+
+def save_store(store: Dict, path: Path = ROADMAP_STORE_PATH):
+    """Atomically write the roadmap store file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(store, f, indent=1, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+def _update_entry(store: Dict, slug: str, raw: bytes, source: str, stats: Dict, **extra) -> None:
+    """Parse and store raw roadmap content unless its hash is unchanged"""
+    entries = store.setdefault('roadmaps', {})
+    digest = content_hash(raw)
+    entry = entries.get(slug)
+
+    if entry and entry.get('hash') == digest:
+        entry.update(extra)
+        stats['unchanged'].append(slug)
+        return
+
+    try:
+        roadmap = parse_roadmap_json(json.loads(raw.decode('utf-8')), slug)
+    except (ValueError, UnicodeDecodeError) as e:
+        stats['failed'].append(f"{slug}: {e}")
+        return
+
+    entries[slug] = dict({
+        "hash": digest,
+        "source": source,
+        "synced_at": _now(),
+        "roadmap": roadmap
+    }, **extra)
+    stats['updated'].append(slug)
+
+def _new_stats() -> Dict[str, List[str]]:
+    return {"updated": [], "unchanged": [], "missing": [], "failed": []}
+
+def find_roadmap_files(source_dir: Path, slugs: Optional[Iterable[str]] = None) -> Dict[str, Path]:
+    """
+    Find roadmap JSON files in a roadmap.sh checkout or a dump directory
+
+    Matches ``<slug>/<slug>.json`` (repository layout) and ``<slug>.json``
+    directly inside the source directory (dump layout).
+
+    Args:
+        source_dir: Checkout root, its src/data/roadmaps directory, or a dump directory
+        slugs: Only include these slugs (default: all found)
+
+    Returns:
+        Dictionary mapping slug to file path
+    """
+    source_dir = Path(source_dir)
+    wanted = set(slugs) if slugs is not None else None
+    found = {}
+
+    for path in sorted(source_dir.rglob("*.json")):
+        slug = path.stem
+        if path.parent.name != slug and path.parent != source_dir:
+            continue
+        if wanted is not None and slug not in wanted:
+            continue
+        found.setdefault(slug, path)
+
+    return found
+
+def sync_from_directory(
+    source_dir: Path,
+    slugs: Optional[Iterable[str]] = None,
+    store_path: Path = ROADMAP_STORE_PATH
+) -> Dict[str, List[str]]:
+    """
+    Sync roadmaps from a local roadmap.sh checkout or dump directory
+
+    Files whose content hash matches the stored hash are skipped.
+
+    Args:
+        source_dir: Directory to scan
+        slugs: Slugs to sync (default: every slug in ROADMAP_MAPPING)
+        store_path: Roadmap store file
+
+    Returns:
+        Lists of updated, unchanged, missing and failed slugs
+    """
+    slugs = sorted(set(ROADMAP_MAPPING.values())) if slugs is None else list(slugs)
+    files = find_roadmap_files(source_dir, slugs)
+    store = load_store(store_path)
+    stats = _new_stats()
+
+    for slug in slugs:
+        path = files.get(slug)
+        if path is None:
+            stats['missing'].append(slug)
+            continue
+        _update_entry(store, slug, path.read_bytes(), str(path), stats)
+
+    if stats['updated']:
+        save_store(store, store_path)
+
+    return stats
+
+def sync_from_http(
+    slugs: Optional[Iterable[str]] = None,
+    base_url: str = DEFAULT_BASE_URL,
+    store_path: Path = ROADMAP_STORE_PATH,
+    timeout: float = 10
+) -> Dict[str, List[str]]:
+    """
+    Sync roadmaps over HTTP using conditional GETs
+
+    Sends If-None-Match / If-Modified-Since from the stored ETag and
+    Last-Modified values, so unchanged roadmaps cost a 304 response.
+
+    Args:
+        slugs: Slugs to sync (default: every slug in ROADMAP_MAPPING)
+        base_url: URL serving ``<slug>/<slug>.json`` files
+        store_path: Roadmap store file
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        Lists of updated, unchanged, missing and failed slugs
+    """
+    slugs = sorted(set(ROADMAP_MAPPING.values())) if slugs is None else list(slugs)
+    store = load_store(store_path)
+    entries = store.setdefault('roadmaps', {})
+    stats = _new_stats()
+    changed = False
+
+    with requests.Session() as session:
+        for slug in slugs:
+            url = f"{base_url.rstrip('/')}/{slug}/{slug}.json"
+            entry = entries.get(slug, {})
+            headers = {}
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+            try:
+                response = session.get(url, headers=headers, timeout=timeout)
+            except requests.exceptions.RequestException as e:
+                stats['failed'].append(f"{slug}: {e}")
+                continue
+
+            if response.status_code == 304:
+                stats['unchanged'].append(slug)
+                continue
+            if response.status_code == 404:
+                stats['missing'].append(slug)
+                continue
+            if response.status_code != 200:
+                stats['failed'].append(f"{slug}: HTTP {response.status_code}")
+                continue
+
+            _update_entry(
+                store, slug, response.content, url, stats,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
+            changed = True
+
+    if changed:
+        save_store(store, store_path)
+
+    return stats
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point (see sync_roadmaps.py)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sync roadmap.sh roadmaps into the local roadmap store")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--source", type=Path, help="roadmap.sh checkout or dump directory")
+    source.add_argument("--http", nargs="?", const=DEFAULT_BASE_URL, metavar="BASE_URL",
+                        help="Fetch over HTTP with conditional GETs (default: roadmap.sh GitHub raw files)")
+    parser.add_argument("--slug", action="append", dest="slugs",
+                        help="Slug to sync (repeatable, default: all slugs in ROADMAP_MAPPING)")
+    parser.add_argument("--store", type=Path, default=ROADMAP_STORE_PATH, help="Roadmap store file")
+    parser.add_argument("--timeout", type=float, default=10, help="HTTP timeout in seconds")
+    args = parser.parse_args(argv)
+
+    if args.source:
+        stats = sync_from_directory(args.source, args.slugs, args.store)
+    else:
+        stats = sync_from_http(args.slugs, args.http, args.store, args.timeout)
+
+    reload_roadmap_store()
+
+    for key in ("updated", "unchanged", "missing", "failed"):
+        print(f"{key:>10}: {len(stats[key])}" + (f"  ({', '.join(stats[key])})" if stats[key] else ""))
+
+    return 1 if stats['failed'] else 0
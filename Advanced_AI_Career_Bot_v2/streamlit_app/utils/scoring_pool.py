@@ -0,0 +1,135 @@
+"""
+Scoring Pool - Multi-process execution mode for the model loader
+Loads the model once in the parent and forks workers that share its memory
+copy-on-write, each with its own intra-op thread budget
+"""
+
+import multiprocessing
+import os
+from typing import Dict, List, Optional
+
+import torch
+
+from . import model_loader
+
+def default_threads_per_worker(workers: int) -> int:
+    """Split the available cores between workers to avoid oversubscription"""
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+def _init_worker(threads: int, load: bool):
+    """Worker initializer: pin the thread budget and load the model if not inherited"""
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Inter-op pool was already started in the parent before fork
+        pass
+
+    if load:
+        model_loader.load_model()
+
+def _score_chunk(args):
+    """Score one chunk of queries inside a worker"""
+    queries, top_k, use_hybrid = args
+    results = model_loader.get_career_recommendations_batch(
+        queries, top_k=top_k, use_hybrid=use_hybrid, batch_size=len(queries)
+    )
+    return [
+        [
+            {'career': str(r['career']), 'confidence': float(r['confidence']), 'method': r['method']}
+            for r in recs
+        ]
+        for recs in results
+    ]
+
+class ScoringPool:
+    """Process pool that scores queries with a model shared across workers"""
+
+    def __init__(self, workers: int, threads_per_worker: Optional[int] = None, chunk_size: int = 16):
+        """
+        Start the worker processes
+
+        On platforms with fork, the model is loaded in the parent (if needed)
+        and inherited copy-on-write; otherwise every worker loads its own copy.
+
+        Args:
+            workers: Number of worker processes
+            threads_per_worker: torch intra-op threads per worker
+                                (default: cpu_count // workers)
+            chunk_size: Queries per task sent to a worker
+        """
+        self.workers = max(1, workers)
+        self.threads_per_worker = threads_per_worker or default_threads_per_worker(self.workers)
+        self.chunk_size = max(1, chunk_size)
+
+        use_fork = 'fork' in multiprocessing.get_all_start_methods()
+        if use_fork and model_loader._model is None:
+            if not model_loader.load_model():
+                raise RuntimeError("Could not load model for the scoring pool")
+
+        # Forked tokenizers must not start their own thread pools
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+        context = multiprocessing.get_context('fork' if use_fork else 'spawn')
+        self._pool = context.Pool(
+            processes=self.workers,
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker, not use_fork)
+        )
+
+    def score(self, queries: List[str], top_k: int = 5, use_hybrid: bool = True) -> List[List[Dict]]:
+        """
+        Score queries across the workers in chunks
+
+        Args:
+            queries: User career descriptions/queries
+            top_k: Number of recommendations per query
+            use_hybrid: Use both model prediction and embedding similarity
+
+        Returns:
+            One recommendation list per query, in input order
+        """
+        chunks = [
+            (list(queries[i:i + self.chunk_size]), top_k, use_hybrid)
+            for i in range(0, len(queries), self.chunk_size)
+        ]
+        results = []
+        for chunk_results in self._pool.imap(_score_chunk, chunks):
+            results.extend(chunk_results)
+        return results
+
+    def worker_pids(self) -> List[int]:
+        """Process ids of the live workers"""
+        return [p.pid for p in self._pool._pool if p.is_alive()]
+
+    def close(self):
+        """Stop the worker processes"""
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+def process_memory(pid: int) -> Dict[str, Optional[int]]:
+    """
+    Resident (RSS) and proportional (PSS) memory of a process in KiB
+
+    PSS divides shared pages between the processes sharing them, so it shows
+    how much each forked worker really costs. Linux only; None elsewhere.
+    """
+    memory = {'rss_kb': None, 'pss_kb': None}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, value = line.split(':', 1)
+                if key == 'Rss':
+                    memory['rss_kb'] = int(value.split()[0])
+                elif key == 'Pss':
+                    memory['pss_kb'] = int(value.split()[0])
+    except (OSError, ValueError):
+        pass
+    return memory
@@ -0,0 +1,392 @@
+"""
+Session Store - Server-side session persistence shared across workers
+Keeps per-user values (recommendations, chat history) outside the Streamlit
+process so a user whose connection lands on another worker gets them back
+with a lookup instead of a recomputation
+
+Backends, chosen with CAREER_SESSION_STORE:
+    memory                      this process only (default)
+    sqlite:///path/to/file.db   one file shared by workers on the same host
+    redis://host:6379/0         any server speaking the Redis protocol
+
+Values are stored one record per (session, key) so they load lazily per key,
+as JSON, zlib-compressed when large. Store failures never break a request:
+reads fall back to "missing" and writes are dropped.
+
+The page URL carries a signed, single-use token for the session instead of
+the bare id: every restore issues a new token, so a copied or logged link
+stops working once the session has been picked up again.
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+import zlib
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+# Seconds a session survives without being written
+SESSION_TTL = int(os.environ.get("CAREER_SESSION_TTL", str(7 * 24 * 3600)))
+
+# Seconds between sweeps of expired sessions in the memory store
+MEMORY_SWEEP_INTERVAL = 60.0
+
+# Payloads at least this large (bytes) are compressed
+COMPRESS_MIN_BYTES = 512
+
+# Leading byte of a stored payload
+_RAW = b"j"
+_COMPRESSED = b"z"
+
+# Query parameter carrying the session token (survives reconnects to another worker)
+SESSION_PARAM = "sid"
+
+# Key signing session tokens; every worker sharing a store needs the same one
+# (default: random per process, so tokens only restore on the issuing worker)
+SESSION_SECRET = os.environ.get("CAREER_SESSION_SECRET", "").encode("utf-8") or secrets.token_bytes(32)
+
+# Session value holding the nonce of the current token
+_TOKEN_KEY = "token_nonce"
+
+def _plain(value: Any) -> Any:
+    """JSON fallback for numpy scalars (e.g., the confidences in recommendations)"""
+    try:
+        return value.item()
+    except (AttributeError, ValueError):
+        raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def dumps(value: Any) -> bytes:
+    """Serialize a value compactly (JSON, zlib for large payloads)"""
+    data = json.dumps(value, separators=(",", ":"), default=_plain).encode("utf-8")
+    if len(data) >= COMPRESS_MIN_BYTES:
+        return _COMPRESSED + zlib.compress(data)
+    return _RAW + data
+
+def loads(payload: bytes) -> Any:
+    """Inverse of dumps()"""
+    if payload[:1] == _COMPRESSED:
+        return json.loads(zlib.decompress(payload[1:]))
+    return json.loads(payload[1:])
+
+def new_session_id() -> str:
+    """Random, URL-safe session id"""
+    return uuid.uuid4().hex
+
+def is_session_id(value: Optional[str]) -> bool:
+    """Whether a value (e.g., from the URL) looks like an id from new_session_id()"""
+    return bool(value) and len(value) == 32 and all(c in "0123456789abcdef" for c in value)
+
+def _sign(session_id: str, nonce: str) -> str:
+    return hmac.new(SESSION_SECRET, f"{session_id}.{nonce}".encode("utf-8"), hashlib.sha256).hexdigest()
+
+class SessionStore:
+    """Key-value store of per-session values (base class and interface)"""
+
+    # Errors treated as "store unavailable"
+    errors = (OSError,)
+
+    def get(self, session_id: str, key: str, default: Any = None) -> Any:
+        """
+        Load one value of a session
+
+        Args:
+            session_id: Session id
+            key: Value name (e.g., "recommendations")
+            default: Returned if the value is missing, expired or unreadable
+
+        Returns:
+            The stored value or default
+        """
+        try:
+            payload = self._get(session_id, key)
+            return default if payload is None else loads(payload)
+        except self.errors + (ValueError, zlib.error) as e:
+            print(f"Session store read failed ({key}): {e}", file=sys.stderr)
+            return default
+
+    def set(self, session_id: str, key: str, value: Any):
+        """Store one value of a session and extend the session's lifetime"""
+        try:
+            self._set(session_id, key, dumps(value))
+        except self.errors as e:
+            print(f"Session store write failed ({key}): {e}", file=sys.stderr)
+
+    def delete(self, session_id: str, key: Optional[str] = None):
+        """Delete one value, or the whole session if key is None"""
+        try:
+            self._delete(session_id, key)
+        except self.errors as e:
+            print(f"Session store delete failed ({key}): {e}", file=sys.stderr)
+
+    def issue_token(self, session_id: str) -> str:
+        """
+        Create the URL token for a session, revoking its earlier tokens
+
+        Returns:
+            "<session id>.<nonce>.<signature>"
+        """
+        nonce = secrets.token_hex(8)
+        self.set(session_id, _TOKEN_KEY, nonce)
+        return f"{session_id}.{nonce}.{_sign(session_id, nonce)}"
+
+    def redeem_token(self, token: Optional[str]) -> Optional[str]:
+        """
+        Session id of a token from issue_token(), if it is still the current one
+
+        Tokens with a bad signature (e.g., an id picked by the client), for an
+        unknown or expired session, or superseded by a newer token give None.
+        Callers should issue a new token for the session right away.
+        """
+        parts = (token or "").split(".")
+        if len(parts) != 3 or not is_session_id(parts[0]):
+            return None
+        session_id, nonce, signature = parts
+        if not hmac.compare_digest(signature, _sign(session_id, nonce)):
+            return None
+        current = self.get(session_id, _TOKEN_KEY)
+        if current is None or not hmac.compare_digest(str(current), nonce):
+            return None
+        return session_id
+
+    def _get(self, session_id: str, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def _set(self, session_id: str, key: str, payload: bytes):
+        raise NotImplementedError
+
+    def _delete(self, session_id: str, key: Optional[str]):
+        raise NotImplementedError
+
+class MemorySessionStore(SessionStore):
+    """Per-process store (sessions are lost when the worker exits)"""
+
+    def __init__(self, ttl: int = SESSION_TTL):
+        self.ttl = ttl
+        self._sessions = {}  # session_id -> (expires_at, {key: payload})
+        self._next_sweep = time.time() + MEMORY_SWEEP_INTERVAL
+        self._lock = threading.Lock()
+
+    def _get(self, session_id, key):
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._sessions[session_id]
+                return None
+            return entry[1].get(key)
+
+    def _set(self, session_id, key, payload):
+        with self._lock:
+            now = time.time()
+            # Expired sessions are dropped on read, and swept at most once per
+            # MEMORY_SWEEP_INTERVAL so sessions never read again don't pile up
+            if now >= self._next_sweep:
+                for expired in [sid for sid, (expires_at, _) in self._sessions.items() if expires_at < now]:
+                    del self._sessions[expired]
+                self._next_sweep = now + MEMORY_SWEEP_INTERVAL
+            values = self._sessions.get(session_id, (0, {}))[1]
+            values[key] = payload
+            self._sessions[session_id] = (now + self.ttl, values)
+
+    def _delete(self, session_id, key):
+        with self._lock:
+            if key is None:
+                self._sessions.pop(session_id, None)
+            elif session_id in self._sessions:
+                self._sessions[session_id][1].pop(key, None)
+
+class SQLiteSessionStore(SessionStore):
+    """Store in a SQLite file (shared by workers on one host or a shared volume)"""
+
+    errors = (OSError, sqlite3.Error)
+
+    def __init__(self, path: Path, ttl: int = SESSION_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS session_values (
+                    session_id TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (session_id, key)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("DELETE FROM session_values WHERE expires_at < ?", (time.time(),))
+            conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path), timeout=30)
+
+    def _get(self, session_id, key):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT value FROM session_values WHERE session_id = ? AND key = ? AND expires_at >= ?",
+                (session_id, key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, session_id, key, payload):
+        expires_at = time.time() + self.ttl
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO session_values VALUES (?, ?, ?, ?)",
+                (session_id, key, payload, expires_at)
+            )
+            conn.execute("UPDATE session_values SET expires_at = ? WHERE session_id = ?", (expires_at, session_id))
+            conn.commit()
+
+    def _delete(self, session_id, key):
+        with closing(self._connect()) as conn:
+            if key is None:
+                conn.execute("DELETE FROM session_values WHERE session_id = ?", (session_id,))
+            else:
+                conn.execute("DELETE FROM session_values WHERE session_id = ? AND key = ?", (session_id, key))
+            conn.commit()
+
+class RedisError(Exception):
+    """Error reply from a Redis-protocol server"""
+
+class RedisSessionStore(SessionStore):
+    """
+    Store on a Redis-protocol server (Redis, Valkey, KeyDB, ...)
+
+    Each session is one hash ("career:session:<id>") with a field per key and
+    an expiry refreshed on every write. Speaks RESP directly over a socket per
+    thread, so no client library is needed.
+    """
+
+    errors = (OSError, RedisError)
+
+    def __init__(self, url: str, ttl: int = SESSION_TTL, timeout: float = 2.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.password = parsed.password
+        self.ttl = ttl
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            conn = (sock, sock.makefile('rb'))
+            # Only a connection that finished its handshake is reused
+            try:
+                if self.password:
+                    self._call_on(conn, b"AUTH", self.password)
+                if self.db:
+                    self._call_on(conn, b"SELECT", str(self.db))
+            except BaseException:
+                conn[1].close()
+                sock.close()
+                raise
+            self._local.conn = conn
+        return conn
+
+    def _call_on(self, conn, *args):
+        sock, reader = conn
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode('utf-8')
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        sock.sendall(b"".join(parts))
+        return self._read_reply(reader)
+
+    def _read_reply(self, reader):
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest
+        if kind == b"-":
+            raise RedisError(rest.decode('utf-8', 'replace'))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(rest)
+            return None if count < 0 else [self._read_reply(reader) for _ in range(count)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    def _call(self, *args):
+        """Send one command, reconnecting once if the connection went stale"""
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                return self._call_on(conn, *args)
+            except OSError:
+                self._local.conn = None
+                conn[1].close()
+                conn[0].close()
+                if attempt:
+                    raise
+
+    def _key(self, session_id: str) -> str:
+        return f"career:session:{session_id}"
+
+    def _get(self, session_id, key):
+        return self._call(b"HGET", self._key(session_id), key)
+
+    def _set(self, session_id, key, payload):
+        self._call(b"HSET", self._key(session_id), key, payload)
+        self._call(b"EXPIRE", self._key(session_id), self.ttl)
+
+    def _delete(self, session_id, key):
+        if key is None:
+            self._call(b"DEL", self._key(session_id))
+        else:
+            self._call(b"HDEL", self._key(session_id), key)
+
+def create_session_store(url: str) -> SessionStore:
+    """
+    Build a store from a CAREER_SESSION_STORE value
+
+    Args:
+        url: "memory", "sqlite:///path/to/file.db" or "redis://host:port/db"
+
+    Returns:
+        SessionStore instance
+    """
+    if not url or url == "memory":
+        return MemorySessionStore()
+    if url.startswith("sqlite://"):
+        return SQLiteSessionStore(Path(url[len("sqlite://"):]))
+    if url.startswith(("redis://", "valkey://")):
+        return RedisSessionStore(url)
+    raise ValueError(f"Unknown session store: {url!r}")
+
+# Global store instance (one per process)
+_store = None
+_store_lock = threading.Lock()
+
+def get_session_store() -> SessionStore:
+    """Process-wide store configured by CAREER_SESSION_STORE"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_session_store(os.environ.get("CAREER_SESSION_STORE", "memory"))
+    return _store
@@ -0,0 +1,100 @@
+"""
+Single Flight - Coalescing of identical concurrent work
+When several callers ask for the same thing at the same time (e.g., many users
+opening the interview questions for a popular career), only the first runs the
+computation and the others wait for and share its result
+
+Only in-flight work is shared; nothing is cached once the call returns.
+"""
+
+import threading
+from typing import Callable, Dict, Hashable
+
+from . import metrics
+
+class _Call:
+    """One in-flight computation and its outcome"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Runs at most one computation per key at a time and shares its result"""
+
+    def __init__(self, name: str, share_errors: bool = True):
+        """
+        Args:
+            name: Group name used in metrics ("single_flight.<name>.*")
+            share_errors: If False, callers whose shared computation raised
+                          run it again themselves instead of receiving the error
+                          (for work that can fail for caller-specific reasons,
+                          like an invalid API key)
+        """
+        self.name = name
+        self.share_errors = share_errors
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {'calls': 0, 'executions': 0, 'coalesced': 0}
+
+    def do(self, key: Hashable, func: Callable, *args, **kwargs):
+        """
+        Call func(*args, **kwargs), or wait for an identical call in flight
+
+        Args:
+            key: Identifies the work; calls with equal keys must be
+                 interchangeable
+            func: Computation to run
+
+        Returns:
+            func's result (shared object for coalesced callers)
+        """
+        with self._lock:
+            self._stats['calls'] += 1
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+                self._stats['executions'] += 1
+            else:
+                leader = False
+                self._stats['coalesced'] += 1
+
+        if not leader:
+            metrics.increment(f"single_flight.{self.name}.coalesced")
+            call.done.wait()
+            if call.error is None:
+                return call.result
+            if self.share_errors:
+                raise call.error
+            return func(*args, **kwargs)
+
+        metrics.increment(f"single_flight.{self.name}.executions")
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Computations currently running"""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of calls, executions and coalesced calls since start (or reset)"""
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._lock:
+            for counter in self._stats:
+                self._stats[counter] = 0
@@ -0,0 +1,221 @@
+"""
+Skill Gap Analysis - Local skills gap engine
+Compares a user's skills against the skills mapping dataset, orders the
+missing skills along the career roadmap and attaches learning resources
+"""
+
+import csv
+import re
+import threading
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .roadmap_fetcher import ROADMAP_CONTENT
+from .resource_finder import get_learning_resources
+
+# Dataset paths
+DATASET_DIR = Path(__file__).parent.parent / "datasets"
+SKILLS_MAPPING_PATH = DATASET_DIR / "skills_mapping.csv"
+
+# Skills without a matching roadmap section are ordered after all sections
+UNMAPPED_SECTION = "Additional Skills"
+
+# Global variables for the compiled gap index (keyed by dataset role, so it
+# holds at most one entry per role however careers are spelled)
+_skills_mapping = None
+_gap_index = {}
+_gap_lock = threading.Lock()
+
+def _normalize(skill: str) -> str:
+    """Lower-case and collapse whitespace so skills compare reliably"""
+    return " ".join(skill.lower().split())
+
+def mentions(skill: str, text: str) -> bool:
+    """Check whether a skill appears in text as a whole word/phrase"""
+    pattern = r"(?<![a-z0-9])" + re.escape(_normalize(skill)) + r"(?![a-z0-9])"
+    return re.search(pattern, text) is not None
+
+def load_skills_mapping(path: Path = SKILLS_MAPPING_PATH) -> Dict[str, List[str]]:
+    """
+    Load the role -> required skills mapping from the skills dataset
+
+    Args:
+        path: Path to skills_mapping.csv
+
+    Returns:
+        Dictionary mapping each role to its ordered list of skills
+    """
+    global _skills_mapping
+
+    if _skills_mapping is not None and path == SKILLS_MAPPING_PATH:
+        return _skills_mapping
+
+    mapping = {}
+    try:
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                skills = [s.strip() for s in row.get('skills', '').split(',') if s.strip()]
+                mapping.setdefault(row['role'], []).extend(skills)
+    except FileNotFoundError:
+        mapping = {}
+
+    if path == SKILLS_MAPPING_PATH:
+        _skills_mapping = mapping
+    return mapping
+
+def _resolve_key(career: str, keys) -> Optional[str]:
+    """Resolve a career name against a set of keys (direct, then partial match)"""
+    if career in keys:
+        return career
+    for key in keys:
+        if career.lower() in key.lower() or key.lower() in career.lower():
+            return key
+    return None
+
+def _compile_career(career: str) -> Dict:
+    """
+    Compile the required skills of a career into roadmap order
+
+    Each required skill is placed in the first roadmap section whose title or
+    topics mention it. Skills not covered by the roadmap keep their dataset
+    order after the last section.
+    """
+    mapping = load_skills_mapping()
+    role = _resolve_key(career, mapping.keys())
+    required = mapping.get(role, []) if role else []
+
+    roadmap_key = _resolve_key(role or career, ROADMAP_CONTENT.keys())
+    sections = ROADMAP_CONTENT[roadmap_key]['sections'] if roadmap_key else []
+    section_texts = [
+        _normalize(" ".join([section['title']] + section.get('topics', [])))
+        for section in sections
+    ]
+
+    entries = []
+    for position, skill in enumerate(required):
+        order = len(sections)
+        for idx, text in enumerate(section_texts):
+            if mentions(skill, text):
+                order = idx
+                break
+
+        if order < len(sections):
+            section = sections[order]
+            entries.append({
+                'skill': skill,
+                'section': section['title'],
+                'order': order,
+                'position': position,
+                'resources': section.get('resources', [])
+            })
+        else:
+            entries.append({
+                'skill': skill,
+                'section': UNMAPPED_SECTION,
+                'order': order,
+                'position': position,
+                'resources': []
+            })
+
+    entries.sort(key=lambda e: (e['order'], e['position']))
+
+    return {
+        'career': role or career,
+        'roadmap': roadmap_key,
+        'entries': entries
+    }
+
+def _get_compiled(career: str) -> Dict:
+    """Get (and memoize) the compiled gap index for a career"""
+    role = _resolve_key(career, load_skills_mapping().keys())
+    if role is None:
+        # Careers outside the dataset have no required skills; nothing to memoize
+        return _compile_career(career)
+
+    with _gap_lock:
+        compiled = _gap_index.get(role)
+    if compiled is None:
+        compiled = _compile_career(role)
+        with _gap_lock:
+            compiled = _gap_index.setdefault(role, compiled)
+    return compiled
+
+def _has_skill(required: str, user_skills: List[str]) -> bool:
+    """Check whether any user skill covers a required skill"""
+    required_norm = _normalize(required)
+    for skill in user_skills:
+        if skill == required_norm or mentions(skill, required_norm) or mentions(required_norm, skill):
+            return True
+    return False
+
+def analyze_skill_gap(user_skills: List[str], target_career: str) -> Dict:
+    """
+    Compute the skills gap between a user's skills and a target career
+
+    Args:
+        user_skills: Skills the user already has (e.g., from the skills multiselect)
+        target_career: Career the user is aiming for
+
+    Returns:
+        Dictionary with matched skills, missing skills in roadmap order (each
+        with its roadmap section and resources), coverage percentage, and the
+        career's top courses and certifications
+    """
+    compiled = _get_compiled(target_career)
+    normalized = [_normalize(s) for s in user_skills if s and s.strip()]
+
+    matched = []
+    missing = []
+    for entry in compiled['entries']:
+        if _has_skill(entry['skill'], normalized):
+            matched.append(entry['skill'])
+        else:
+            missing.append({
+                'skill': entry['skill'],
+                'section': entry['section'],
+                'order': entry['order'],
+                'resources': entry['resources']
+            })
+
+    total = len(compiled['entries'])
+    resources = get_learning_resources(compiled['career'])
+
+    return {
+        'career': compiled['career'],
+        'roadmap': compiled['roadmap'],
+        'matched': matched,
+        'missing': missing,
+        'coverage': (len(matched) / total * 100) if total else 0.0,
+        'courses': resources['courses'][:3],
+        'certifications': resources['certifications'][:2]
+    }
+
+def format_skill_gap(gap: Dict) -> str:
+    """
+    Format a skill gap as a compact text block for LLM prompts
+
+    Args:
+        gap: Result of analyze_skill_gap
+
+    Returns:
+        Compact multi-line summary of the gap
+    """
+    lines = [f"Target: {gap['career']} (skill coverage {gap['coverage']:.0f}%)"]
+
+    if gap['matched']:
+        lines.append(f"Has: {', '.join(gap['matched'])}")
+
+    if gap['missing']:
+        lines.append("Missing (in learning order):")
+        for section, items in groupby(gap['missing'], key=lambda m: m['section']):
+            lines.append(f"- {section}: {', '.join(m['skill'] for m in items)}")
+    else:
+        lines.append("Missing: none")
+
+    if gap['courses']:
+        lines.append(f"Courses: {'; '.join(gap['courses'])}")
+    if gap['certifications']:
+        lines.append(f"Certifications: {'; '.join(gap['certifications'])}")
+
+    return "\n".join(lines)
@@ -0,0 +1,738 @@
+"""
+Trainer - CPU training pipeline for the career classifier
+Scriptable version of the Colab notebook's training: streams the datasets,
+pre-tokenizes them once, trains on batches of similar-length samples padded
+only to their longest sample, checkpoints every epoch, and writes the model
+files model_loader.load_model reads
+
+With frozen_backbone, the encoder runs once over the corpus (features cached
+on disk) and only the classifier head is trained.
+
+Run it with train.py (see docs/TRAINING.md).
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+from torch.utils.data import DataLoader
+
+from .career_embeddings import AGGREGATIONS, build_embeddings
+from .training_data import (
+    DATASET_DIR,
+    TOKEN_CACHE_DIR,
+    LengthBucketSampler,
+    TokenizedCorpus,
+    TokenizedDataset,
+    corpus_fingerprint,
+    is_validation,
+    iter_corpus,
+    make_collate,
+    pretokenize,
+)
+
+# Same hyperparameters as the notebook's CONFIG
+TRAIN_CONFIG = {
+    'base_model': 'sentence-transformers/all-MiniLM-L6-v2',
+    'max_length': 128,
+    'hidden_dim': 256,
+    'dropout': 0.3,
+    'batch_size': 32,
+    'learning_rate': 2e-5,
+    'num_epochs': 10,
+    'warmup_steps': 100,
+    'weight_decay': 0.01,
+    'gradient_accumulation_steps': 2,
+    'patience': 3,
+    'val_fraction': 0.15,
+    'bf16': False,
+    # Frozen-backbone mode: train the classifier head on cached features
+    'frozen_backbone': False,
+    'head_epochs': 200,
+    'head_learning_rate': 1e-3,
+    'head_patience': 20,
+    # Career similarity embeddings: 'first' (notebook) or 'centroid'
+    'embedding_aggregation': 'first',
+}
+
+# Batches per length-sorted pool in the bucketing sampler
+BUCKET_POOL_BATCHES = 50
+
+# Training state saved after every epoch (in the output directory)
+CHECKPOINT_NAME = "training_checkpoint.pth"
+
+# Where pooled encoder features are cached (frozen-backbone mode)
+FEATURE_CACHE_DIR = TOKEN_CACHE_DIR / "features"
+
+def configure_threads(intra_op: Optional[int] = None, inter_op: Optional[int] = None) -> Dict[str, int]:
+    """
+    Set PyTorch's CPU thread pools
+
+    Args:
+        intra_op: Threads used inside one operation (default: all cores)
+        inter_op: Threads running independent operations in parallel
+                  (default: 1; only settable before any parallel work)
+
+    Returns:
+        The thread counts in effect
+    """
+    torch.set_num_threads(intra_op or os.cpu_count() or 1)
+    try:
+        torch.set_num_interop_threads(inter_op or 1)
+    except RuntimeError as e:
+        print(f"Warning: inter-op threads already fixed ({e})", file=sys.stderr)
+    return {'intra_op': torch.get_num_threads(), 'inter_op': torch.get_num_interop_threads()}
+
+def load_training_data(dataset_dir: Path = DATASET_DIR) -> Dict:
+    """
+    Stream the datasets into texts and labels
+
+    Returns:
+        Dict with texts, labels (indices into the sorted classes), classes,
+        sample counts per source and the dataset directory
+    """
+    texts, roles = [], []
+    sources = Counter()
+    for sample in iter_corpus(dataset_dir):
+        texts.append(sample['text'])
+        roles.append(sample['role'])
+        sources[sample['source']] += 1
+
+    classes = sorted(set(roles))
+    index = {role: i for i, role in enumerate(classes)}
+    return {
+        'texts': texts,
+        'labels': [index[role] for role in roles],
+        'classes': classes,
+        'sources': dict(sources),
+        'dataset_dir': Path(dataset_dir),
+    }
+
+def make_loader(
+    dataset: TokenizedDataset,
+    collate_fn: Callable,
+    batch_size: int,
+    shuffle: bool = True,
+    sampler: str = 'bucket',
+    seed: int = 0
+) -> DataLoader:
+    """
+    DataLoader over a pre-tokenized dataset
+
+    Args:
+        dataset: Pre-tokenized samples
+        collate_fn: Dynamic-padding collate (see make_collate)
+        batch_size: Samples per batch
+        shuffle: Randomize order (training); validation batches in length order
+        sampler: 'bucket' for length-bucketed batches, 'random' for plain
+                 shuffled batches
+        seed: Seed of the batch order
+
+    Returns:
+        DataLoader; call set_epoch(epoch) on its batch_sampler for bucketed
+        loaders to vary the order between epochs
+    """
+    if sampler == 'bucket':
+        batch_sampler = LengthBucketSampler(
+            dataset.lengths,
+            batch_size,
+            shuffle=shuffle,
+            pool_batches=BUCKET_POOL_BATCHES,
+            seed=seed
+        )
+        return DataLoader(dataset, batch_sampler=batch_sampler, collate_fn=collate_fn)
+
+    generator = torch.Generator().manual_seed(seed)
+    return DataLoader(dataset, batch_size=batch_size, shuffle=shuffle, collate_fn=collate_fn, generator=generator)
+
+def split_indices(texts: List[str], labels: List[int], val_fraction: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Deterministic train/validation split by text hash (see is_validation)
+
+    sklearn's stratified split (used in the notebook) refuses classes with a
+    single sample, which the bundled datasets have. Such classes, and classes
+    that would otherwise lose all their samples, stay in training only.
+
+    Returns:
+        (train indices, validation indices)
+    """
+    labels = np.asarray(labels)
+    held_out = np.array([is_validation(text, val_fraction) for text in texts], dtype=bool)
+    for label in np.unique(labels):
+        members = labels == label
+        if held_out[members].all():
+            held_out[members] = False
+    return np.flatnonzero(~held_out), np.flatnonzero(held_out)
+
+def train_epoch(
+    model: nn.Module,
+    loader: DataLoader,
+    optimizer,
+    scheduler,
+    criterion,
+    accumulation_steps: int = 1,
+    bf16: bool = False
+) -> Dict[str, float]:
+    """
+    One training epoch (gradient accumulation and clipping as in the notebook)
+
+    With bf16, the forward pass runs under bfloat16 autocast on CPU (weights
+    and optimizer state stay float32).
+
+    Returns:
+        Mean loss, accuracy, seconds, and padded / real token counts
+    """
+    model.train()
+    total_loss = 0.0
+    correct = 0
+    seen = 0
+    padded_tokens = 0
+    real_tokens = 0
+    start = time.perf_counter()
+
+    optimizer.zero_grad()
+    for step, batch in enumerate(loader):
+        with torch.autocast('cpu', dtype=torch.bfloat16, enabled=bf16):
+            logits = model(batch['input_ids'], batch['attention_mask']).float()
+        loss = criterion(logits, batch['label'])
+        (loss / accumulation_steps).backward()
+
+        if (step + 1) % accumulation_steps == 0 or step + 1 == len(loader):
+            torch.nn.utils.clip_grad_norm_(model.parameters(), 1.0)
+            optimizer.step()
+            scheduler.step()
+            optimizer.zero_grad()
+
+        total_loss += loss.item() * len(batch['label'])
+        correct += (logits.argmax(dim=1) == batch['label']).sum().item()
+        seen += len(batch['label'])
+        padded_tokens += batch['attention_mask'].numel()
+        real_tokens += int(batch['attention_mask'].sum())
+
+    return {
+        'loss': total_loss / max(seen, 1),
+        'acc': correct / max(seen, 1),
+        'seconds': time.perf_counter() - start,
+        'padded_tokens': padded_tokens,
+        'real_tokens': real_tokens,
+    }
+
+def evaluate(model: nn.Module, loader: DataLoader, criterion, bf16: bool = False) -> Dict[str, float]:
+    """
+    Validation pass
+
+    Returns:
+        Mean loss, accuracy and seconds
+    """
+    model.eval()
+    total_loss = 0.0
+    correct = 0
+    seen = 0
+    start = time.perf_counter()
+
+    with torch.no_grad():
+        for batch in loader:
+            with torch.autocast('cpu', dtype=torch.bfloat16, enabled=bf16):
+                logits = model(batch['input_ids'], batch['attention_mask']).float()
+            total_loss += criterion(logits, batch['label']).item() * len(batch['label'])
+            correct += (logits.argmax(dim=1) == batch['label']).sum().item()
+            seen += len(batch['label'])
+
+    return {
+        'loss': total_loss / max(seen, 1),
+        'acc': correct / max(seen, 1),
+        'seconds': time.perf_counter() - start,
+    }
+
+def _run_fingerprint(config: Dict, data: Dict, sampler: str, seed: int) -> str:
+    """Hash of everything a resumed run must share with its checkpoint"""
+    digest = hashlib.sha256(json.dumps(
+        {'config': config, 'classes': data['classes'], 'sampler': sampler, 'seed': seed},
+        sort_keys=True
+    ).encode('utf-8'))
+    digest.update(corpus_fingerprint(data['texts'], config['max_length']).encode('utf-8'))
+    return digest.hexdigest()
+
+def _atomic_save(path: Path, write: Callable):
+    """Write a file via a temporary sibling so readers never see a partial file"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+def load_checkpoint(path: Path, fingerprint: str) -> Optional[Dict]:
+    """Load a training checkpoint written by the same run configuration, if any"""
+    try:
+        checkpoint = torch.load(path, map_location='cpu', weights_only=False)
+    except (FileNotFoundError, EOFError, RuntimeError, pickle.UnpicklingError):
+        return None
+    if checkpoint.get('fingerprint') != fingerprint:
+        return None
+    return checkpoint
+
+def module_fingerprint(module: nn.Module) -> str:
+    """Hash of a module's weights (identifies the encoder behind cached features)"""
+    digest = hashlib.blake2b(digest_size=32)
+    for name, tensor in module.state_dict().items():
+        digest.update(name.encode('utf-8'))
+        digest.update(tensor.detach().cpu().contiguous().numpy().tobytes())
+    return digest.hexdigest()
+
+def encode_features(
+    encoder: nn.Module,
+    corpus: TokenizedCorpus,
+    collate_fn: Callable,
+    batch_size: int = 32,
+    cache_dir: Optional[Path] = None
+) -> np.ndarray:
+    """
+    Pooled ([CLS]) output of a frozen encoder for every sample, cached on disk
+
+    Features are cached per encoder (by weight hash) and looked up per sample
+    (by token id hash), so after adding rows to the datasets only the new
+    samples go through the encoder.
+
+    Args:
+        encoder: The classifier's base model
+        corpus: Pre-tokenized samples
+        collate_fn: Dynamic-padding collate (see make_collate)
+        batch_size: Samples per encoder call
+        cache_dir: Cache root (default: FEATURE_CACHE_DIR)
+
+    Returns:
+        float32 array of shape (samples, hidden size)
+    """
+    cache_path = Path(cache_dir or FEATURE_CACHE_DIR) / f"{module_fingerprint(encoder)[:16]}.npz"
+    digests = [hashlib.blake2b(corpus[i].tobytes(), digest_size=16).digest() for i in range(len(corpus))]
+    features = np.zeros((len(corpus), encoder.config.hidden_size), dtype=np.float32)
+    missing = np.ones(len(corpus), dtype=bool)
+
+    try:
+        with np.load(cache_path) as cached:
+            position = {digest: i for i, digest in enumerate(cached['digests'].tolist())}
+            cached_features = cached['features']
+    except (FileNotFoundError, OSError, KeyError, ValueError):
+        position = {}
+    for i, digest in enumerate(digests):
+        j = position.get(digest)
+        if j is not None:
+            features[i] = cached_features[j]
+            missing[i] = False
+
+    todo = np.flatnonzero(missing)
+    if len(todo):
+        encoder.eval()
+        # Length order keeps padding minimal
+        batches = LengthBucketSampler(corpus.lengths[todo], batch_size, shuffle=False)
+        with torch.inference_mode():
+            for batch in batches:
+                positions = todo[batch]
+                padded = collate_fn([(corpus[p], 0) for p in positions])
+                output = encoder(input_ids=padded['input_ids'], attention_mask=padded['attention_mask'])
+                features[positions] = output.last_hidden_state[:, 0, :].numpy()
+
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        def write(path):
+            with open(path, 'wb') as f:
+                np.savez(f, digests=np.array(digests, dtype='S16'), features=features)
+
+        _atomic_save(cache_path, write)
+
+    return features
+
+def train_head(
+    model: nn.Module,
+    features: np.ndarray,
+    labels: List[int],
+    train_idx: np.ndarray,
+    val_idx: np.ndarray,
+    config: Dict,
+    seed: int = 42,
+    log: Optional[Callable[[Dict], None]] = None
+) -> Tuple[List[Dict], float]:
+    """
+    Train only the classifier head of a CareerClassifier on pooled features
+
+    The backbone keeps its pretrained weights, so the model's state dict is a
+    complete checkpoint for load_model. The head with the best validation
+    accuracy is loaded into the model.
+
+    Returns:
+        (per-epoch history, best validation accuracy)
+    """
+    model.base_model.requires_grad_(False)
+    # Same path as CareerClassifier.forward after pooling
+    head = nn.Sequential(model.dropout, model.classifier)
+    x = torch.from_numpy(features)
+    y = torch.as_tensor(labels, dtype=torch.long)
+    train_idx = torch.as_tensor(train_idx)
+    val_idx = torch.as_tensor(val_idx)
+
+    optimizer = torch.optim.AdamW(
+        model.classifier.parameters(), lr=config['head_learning_rate'], weight_decay=config['weight_decay']
+    )
+    criterion = nn.CrossEntropyLoss()
+    generator = torch.Generator().manual_seed(seed)
+    batch_size = config['batch_size']
+
+    history = []
+    best_val_acc = -1.0
+    best_state = None
+    patience_left = config['head_patience']
+
+    for epoch in range(config['head_epochs']):
+        start = time.perf_counter()
+        head.train()
+        order = train_idx[torch.randperm(len(train_idx), generator=generator)]
+        total_loss = 0.0
+        correct = 0
+        for offset in range(0, len(order), batch_size):
+            batch = order[offset:offset + batch_size]
+            logits = head(x[batch])
+            loss = criterion(logits, y[batch])
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            total_loss += loss.item() * len(batch)
+            correct += (logits.argmax(dim=1) == y[batch]).sum().item()
+
+        stats = {
+            'epoch': epoch + 1,
+            'train_loss': total_loss / max(len(order), 1),
+            'train_acc': correct / max(len(order), 1),
+            'train_seconds': time.perf_counter() - start,
+        }
+        # Without a validation set, track training accuracy instead
+        val_acc = stats['train_acc']
+        if len(val_idx):
+            head.eval()
+            with torch.no_grad():
+                logits = head(x[val_idx])
+            stats['val_loss'] = criterion(logits, y[val_idx]).item()
+            stats['val_acc'] = val_acc = (logits.argmax(dim=1) == y[val_idx]).float().mean().item()
+        history.append(stats)
+        if log:
+            log(stats)
+
+        if val_acc > best_val_acc:
+            best_val_acc = val_acc
+            best_state = {k: v.detach().clone() for k, v in model.classifier.state_dict().items()}
+            patience_left = config['head_patience']
+        else:
+            patience_left -= 1
+            if patience_left <= 0:
+                break
+
+    if best_state is not None:
+        model.classifier.load_state_dict(best_state)
+    return history, best_val_acc
+
+def train(
+    config: Optional[Dict] = None,
+    dataset_dir: Path = DATASET_DIR,
+    sampler: str = 'bucket',
+    seed: int = 42,
+    log: Optional[Callable[[Dict], None]] = None,
+    checkpoint_path: Optional[Path] = None,
+    resume: bool = True
+) -> Dict:
+    """
+    Train a career classifier on the merged datasets
+
+    Args:
+        config: Overrides of TRAIN_CONFIG
+        dataset_dir: Directory with the dataset CSV files
+        sampler: 'bucket' (length-bucketed) or 'random' batches
+        seed: Seed of initialization and batch order
+        log: Called with each epoch's stats
+        checkpoint_path: Save the training state here after every epoch
+        resume: Continue from checkpoint_path if it holds a checkpoint of the
+                same configuration and data (frozen-backbone runs take seconds
+                and are not checkpointed)
+
+    Returns:
+        Dict with the trained model (best validation epoch), training data,
+        per-epoch history, best validation accuracy and split sizes
+    """
+    from transformers import AutoTokenizer, get_linear_schedule_with_warmup
+
+    from .model_loader import CareerClassifier
+
+    config = {**TRAIN_CONFIG, **(config or {})}
+    epochs_key = 'head_epochs' if config['frozen_backbone'] else 'num_epochs'
+    if config[epochs_key] < 1:
+        raise ValueError(f"{epochs_key} must be at least 1 (got {config[epochs_key]})")
+    torch.manual_seed(seed)
+
+    data = load_training_data(dataset_dir)
+    if not data['texts']:
+        raise ValueError(f"No training samples found in {dataset_dir}")
+    classes = data['classes']
+    labels = data['labels']
+
+    tokenizer = AutoTokenizer.from_pretrained(config['base_model'])
+    corpus = pretokenize(data['texts'], tokenizer, config['max_length'])
+    train_idx, val_idx = split_indices(data['texts'], labels, config['val_fraction'])
+
+    collate_fn = make_collate(tokenizer)
+    if config['frozen_backbone']:
+        model = CareerClassifier(config['base_model'], len(classes), config['hidden_dim'], config['dropout'])
+        start = time.perf_counter()
+        features = encode_features(model.base_model, corpus, collate_fn, config['batch_size'])
+        feature_seconds = time.perf_counter() - start
+        history, best_val_acc = train_head(model, features, labels, train_idx, val_idx, config, seed, log)
+        model.eval()
+        return {
+            'model': model,
+            'data': data,
+            'config': config,
+            'history': history,
+            'best_val_acc': best_val_acc,
+            'training_samples': len(train_idx),
+            'validation_samples': len(val_idx),
+            'resumed_from': 0,
+            'feature_seconds': feature_seconds,
+        }
+
+    train_loader = make_loader(
+        TokenizedDataset(corpus, labels, train_idx), collate_fn, config['batch_size'],
+        shuffle=True, sampler=sampler, seed=seed
+    )
+    val_loader = make_loader(
+        TokenizedDataset(corpus, labels, val_idx), collate_fn, config['batch_size'],
+        shuffle=False, sampler=sampler, seed=seed
+    ) if len(val_idx) else None
+
+    model = CareerClassifier(config['base_model'], len(classes), config['hidden_dim'], config['dropout'])
+    optimizer = torch.optim.AdamW(model.parameters(), lr=config['learning_rate'], weight_decay=config['weight_decay'])
+    accumulation_steps = config['gradient_accumulation_steps']
+    total_steps = -(-len(train_loader) // accumulation_steps) * config['num_epochs']
+    scheduler = get_linear_schedule_with_warmup(optimizer, config['warmup_steps'], total_steps)
+    criterion = nn.CrossEntropyLoss()
+
+    state = {
+        'epoch': 0,
+        'history': [],
+        'best_val_acc': -1.0,
+        'best_state': None,
+        'patience_left': config['patience'],
+        'finished': False,
+    }
+    fingerprint = _run_fingerprint(config, data, sampler, seed)
+    checkpoint = load_checkpoint(checkpoint_path, fingerprint) if checkpoint_path and resume else None
+    if checkpoint:
+        model.load_state_dict(checkpoint['model_state_dict'])
+        optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
+        scheduler.load_state_dict(checkpoint['scheduler_state_dict'])
+        torch.set_rng_state(checkpoint['rng_state'])
+        state.update({key: checkpoint[key] for key in state})
+    resumed_from = state['epoch']
+
+    while not state['finished'] and state['epoch'] < config['num_epochs']:
+        epoch = state['epoch']
+        if hasattr(train_loader.batch_sampler, 'set_epoch'):
+            train_loader.batch_sampler.set_epoch(epoch)
+
+        stats = {'epoch': epoch + 1}
+        stats.update({f"train_{k}": v for k, v in train_epoch(
+            model, train_loader, optimizer, scheduler, criterion, accumulation_steps, config['bf16']
+        ).items()})
+        # Without a validation set, track training accuracy instead
+        val_acc = stats['train_acc']
+        if val_loader is not None:
+            stats.update({f"val_{k}": v for k, v in evaluate(model, val_loader, criterion, config['bf16']).items()})
+            val_acc = stats['val_acc']
+        state['history'].append(stats)
+        if log:
+            log(stats)
+
+        if val_acc > state['best_val_acc']:
+            state['best_val_acc'] = val_acc
+            state['best_state'] = {k: v.detach().clone() for k, v in model.state_dict().items()}
+            state['patience_left'] = config['patience']
+        else:
+            state['patience_left'] -= 1
+            state['finished'] = state['patience_left'] <= 0
+        state['epoch'] = epoch + 1
+
+        if checkpoint_path:
+            _atomic_save(Path(checkpoint_path), lambda path: torch.save({
+                **state,
+                'fingerprint': fingerprint,
+                'model_state_dict': model.state_dict(),
+                'optimizer_state_dict': optimizer.state_dict(),
+                'scheduler_state_dict': scheduler.state_dict(),
+                'rng_state': torch.get_rng_state(),
+            }, path))
+
+    # Keep the final weights if no epoch recorded a best state
+    if state['best_state'] is not None:
+        model.load_state_dict(state['best_state'])
+    model.eval()
+    return {
+        'model': model,
+        'data': data,
+        'config': config,
+        'history': state['history'],
+        'best_val_acc': state['best_val_acc'],
+        'training_samples': len(train_idx),
+        'validation_samples': len(val_idx),
+        'resumed_from': resumed_from,
+    }
+
+def save_artifacts(result: Dict, output_dir: Path) -> Dict[str, Path]:
+    """
+    Write the files model_loader.load_model reads
+
+    Career embeddings are updated incrementally: careers whose texts did not
+    change since the last build in output_dir keep their embedding.
+
+    Args:
+        result: Return value of train()
+        output_dir: Model directory (e.g., streamlit_app/models)
+
+    Returns:
+        Artifact name -> path
+    """
+    from sklearn.preprocessing import LabelEncoder
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    config = result['config']
+    data = result['data']
+
+    label_encoder = LabelEncoder().fit(data['classes'])
+    metadata = {
+        'model_config': config,
+        'num_classes': len(data['classes']),
+        'classes': data['classes'],
+        'best_val_acc': result['best_val_acc'],
+        'training_samples': result['training_samples'],
+        'validation_samples': result['validation_samples'],
+        'data_sources': data['sources'],
+    }
+
+    paths = {
+        'model': output_dir / "career_model_cpu.pth",
+        'label_encoder': output_dir / "label_encoder.pkl",
+        'embeddings': output_dir / "career_embeddings.npy",
+        'metadata': output_dir / "model_metadata.json",
+    }
+
+    def write_encoder(path):
+        with open(path, 'wb') as f:
+            pickle.dump(label_encoder, f)
+
+    def write_metadata(path):
+        with open(path, 'w') as f:
+            json.dump(metadata, f, indent=2)
+
+    # Class names rather than the LabelEncoder object (as the notebook saves):
+    # load_model's torch.load only accepts plain data (weights_only)
+    _atomic_save(paths['model'], lambda path: torch.save({
+        'model_state_dict': result['model'].state_dict(),
+        'config': config,
+        'classes': data['classes'],
+        'history': result['history'],
+    }, path))
+    _atomic_save(paths['label_encoder'], write_encoder)
+    build_embeddings(
+        data['classes'],
+        config['base_model'],
+        output_dir,
+        dataset_dir=data['dataset_dir'],
+        aggregation=config['embedding_aggregation']
+    )
+    # Metadata last: load_model reads it first
+    _atomic_save(paths['metadata'], write_metadata)
+    return paths
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point (see train.py)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train the career classifier on CPU")
+    parser.add_argument("--datasets", type=Path, default=DATASET_DIR, help="Directory with the dataset CSV files")
+    parser.add_argument("--output", type=Path, help="Model directory to write (default: the app's models/)")
+    parser.add_argument("--base-model", default=TRAIN_CONFIG['base_model'], help="Hugging Face encoder to fine-tune")
+    parser.add_argument("--epochs", type=int,
+                        help=f"Maximum training epochs (default: {TRAIN_CONFIG['num_epochs']}, "
+                             f"{TRAIN_CONFIG['head_epochs']} with --frozen-backbone)")
+    parser.add_argument("--batch-size", type=int, default=TRAIN_CONFIG['batch_size'], help="Samples per batch")
+    parser.add_argument("--max-length", type=int, default=TRAIN_CONFIG['max_length'], help="Truncation length in tokens")
+    parser.add_argument("--sampler", choices=["bucket", "random"], default="bucket",
+                        help="Length-bucketed or plain shuffled batches")
+    parser.add_argument("--threads", type=int, help="Intra-op threads (default: all cores)")
+    parser.add_argument("--interop-threads", type=int, default=1, help="Inter-op threads")
+    parser.add_argument("--bf16", action="store_true", help="bfloat16 autocast on CPU (needs AVX512-BF16/AMX to be faster)")
+    parser.add_argument("--frozen-backbone", action="store_true",
+                        help="Keep the pretrained encoder and train only the classifier head on cached features")
+    parser.add_argument("--embedding-aggregation", choices=AGGREGATIONS, default=TRAIN_CONFIG['embedding_aggregation'],
+                        help="Career embeddings from the first 5 texts (notebook) or the centroid of all texts")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--restart", action="store_true", help="Ignore any existing checkpoint")
+    args = parser.parse_args(argv)
+    if args.epochs is not None and args.epochs < 1:
+        parser.error("--epochs must be at least 1")
+
+    threads = configure_threads(args.threads, args.interop_threads)
+
+    output_dir = args.output
+    if output_dir is None:
+        from .model_loader import MODEL_DIR
+        output_dir = MODEL_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = output_dir / CHECKPOINT_NAME
+
+    config = {
+        'base_model': args.base_model,
+        'batch_size': args.batch_size,
+        'max_length': args.max_length,
+        'bf16': args.bf16,
+        'frozen_backbone': args.frozen_backbone,
+        'embedding_aggregation': args.embedding_aggregation,
+    }
+    if args.epochs is not None:
+        config['head_epochs' if args.frozen_backbone else 'num_epochs'] = args.epochs
+
+    def log(stats):
+        print(json.dumps({k: round(v, 4) if isinstance(v, float) else v for k, v in stats.items()}))
+
+    try:
+        result = train(
+            config,
+            dataset_dir=args.datasets,
+            sampler=args.sampler,
+            seed=args.seed,
+            log=log,
+            checkpoint_path=checkpoint_path,
+            resume=not args.restart
+        )
+        save_artifacts(result, output_dir)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    checkpoint_path.unlink(missing_ok=True)
+
+    epoch_seconds = [stats['train_seconds'] for stats in result['history']]
+    print(json.dumps({
+        'output': str(output_dir),
+        'classes': len(result['data']['classes']),
+        'training_samples': result['training_samples'],
+        'validation_samples': result['validation_samples'],
+        'best_val_acc': round(result['best_val_acc'], 4),
+        'resumed_from_epoch': result['resumed_from'],
+        'feature_s': round(result['feature_seconds'], 4) if 'feature_seconds' in result else None,
+        'mean_epoch_s': round(sum(epoch_seconds) / len(epoch_seconds), 4) if epoch_seconds else None,
+        'threads': threads,
+    }))
+    return 0
@@ -0,0 +1,377 @@
+"""
+Training Data - Corpus merging and cached pre-tokenization for training
+Merges the career datasets into labelled text samples (as the Colab notebook
+does), tokenizes the whole corpus once in batches and stores the token ids as
+compact memory-mapped .npy arrays keyed by tokenizer and corpus hash, so the
+epoch loop only slices arrays, groups samples of similar length and pads each
+batch to its longest sample
+"""
+
+import csv
+import functools
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset, Sampler
+
+# Default dataset directory
+DATASET_DIR = Path(__file__).parent.parent / "datasets"
+
+# Where pre-tokenized corpora are cached
+TOKEN_CACHE_DIR = Path(os.environ.get("CAREER_TOKEN_CACHE", Path(tempfile.gettempdir()) / "career_bot_tokens"))
+
+# Source name -> CSV file (all optional)
+DATASET_FILES = {
+    'qa': "career_qa.csv",
+    'skills': "skills_mapping.csv",
+    'jobs': "job_descriptions.csv",
+    'books': "books_recommendations.csv"
+}
+
+# Samples with shorter text are dropped
+MIN_TEXT_LENGTH = 10
+
+# Texts tokenized per tokenizer call
+TOKENIZE_BATCH_SIZE = 1024
+
+def sample_text(source: str, row: Dict[str, str]) -> str:
+    """Training text for one CSV row (same templates as the notebook)"""
+    get = lambda column: row.get(column) or ''
+    if source == 'qa':
+        text = f"{get('question')} {get('answer')}"
+    elif source == 'skills':
+        text = f"Skills: {get('skills')} {get('description')}"
+    elif source == 'jobs':
+        text = f"{get('description')} Requirements: {get('requirements')}"
+    else:
+        text = f"Recommended book: {get('book_title')} by {get('author')}. {get('description')}"
+    return text.strip()
+
+def iter_corpus(dataset_dir: Path = DATASET_DIR) -> Iterator[Dict[str, str]]:
+    """
+    Stream training samples from all available datasets, one CSV row at a time
+
+    Only a short digest of each sample is kept for deduplication, so memory
+    does not grow with the size of the CSV files.
+
+    Args:
+        dataset_dir: Directory containing the CSV files in DATASET_FILES
+
+    Yields:
+        {'role', 'text', 'source'} dicts, without duplicate (role, text)
+        pairs or texts shorter than MIN_TEXT_LENGTH
+    """
+    seen = set()
+    for source, filename in DATASET_FILES.items():
+        path = Path(dataset_dir) / filename
+        if not path.exists():
+            continue
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                role = (row.get('role') or '').strip()
+                text = sample_text(source, row)
+                if not role or len(text) <= MIN_TEXT_LENGTH:
+                    continue
+                digest = hashlib.blake2b(f"{role}\0{text}".encode('utf-8'), digest_size=16).digest()
+                if digest in seen:
+                    continue
+                seen.add(digest)
+                yield {'role': role, 'text': text, 'source': source}
+
+def load_corpus(dataset_dir: Path = DATASET_DIR) -> List[Dict[str, str]]:
+    """
+    Merge all available datasets into training samples
+
+    Args:
+        dataset_dir: Directory containing the CSV files in DATASET_FILES
+
+    Returns:
+        List of {'role', 'text', 'source'} dicts (see iter_corpus)
+    """
+    return list(iter_corpus(dataset_dir))
+
+def is_validation(text: str, val_fraction: float) -> bool:
+    """
+    Deterministic train/validation assignment of one sample
+
+    Based on a hash of the text only, so a sample stays on the same side of
+    the split across runs, machines, and when rows are added or reordered.
+    """
+    digest = hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') < val_fraction * 2 ** 64
+
+def tokenizer_fingerprint(tokenizer) -> str:
+    """Hash identifying everything about a tokenizer that affects token ids"""
+    backend = getattr(tokenizer, 'backend_tokenizer', None)
+    if backend is not None:
+        # Fast tokenizers serialize vocab, normalizer and pre-tokenizer, plus
+        # truncation/padding settings that each call changes (left out)
+        state = json.loads(backend.to_str())
+        state.pop('truncation', None)
+        state.pop('padding', None)
+        state = json.dumps(state, sort_keys=True)
+    else:
+        state = json.dumps({
+            'class': type(tokenizer).__name__,
+            'vocab': sorted(tokenizer.get_vocab().items()),
+            'special': tokenizer.all_special_tokens,
+            'lower': getattr(tokenizer, 'do_lower_case', None)
+        })
+    return hashlib.sha256(state.encode('utf-8')).hexdigest()
+
+def corpus_fingerprint(texts: Iterable[str], max_length: int) -> str:
+    """Hash of the texts (in order) and the truncation length"""
+    digest = hashlib.sha256(f"max_length={max_length}\0".encode('utf-8'))
+    for text in texts:
+        digest.update(text.encode('utf-8'))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+class TokenizedCorpus:
+    """
+    Token ids of a corpus as one flat array plus offsets
+
+    Sample i is ids[offsets[i]:offsets[i + 1]]. Ids are uint16 when the
+    vocabulary fits (int32 otherwise); attention masks are implied by the
+    lengths, so they are built per batch instead of stored.
+    """
+
+    def __init__(self, ids: np.ndarray, offsets: np.ndarray):
+        self.ids = ids
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        return self.ids[self.offsets[index]:self.offsets[index + 1]]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Token count of every sample"""
+        return np.diff(self.offsets)
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True) -> "TokenizedCorpus":
+        mode = 'r' if mmap else None
+        return cls(
+            np.load(Path(directory) / "ids.npy", mmap_mode=mode),
+            np.load(Path(directory) / "offsets.npy", mmap_mode=mode)
+        )
+
+    def save(self, directory: Path):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / "ids.npy", self.ids)
+        np.save(directory / "offsets.npy", self.offsets)
+
+def tokenize_corpus(texts: List[str], tokenizer, max_length: int = 128) -> TokenizedCorpus:
+    """
+    Tokenize texts in batches, without padding
+
+    Args:
+        texts: Sample texts
+        tokenizer: Hugging Face tokenizer
+        max_length: Truncation length (including special tokens)
+
+    Returns:
+        TokenizedCorpus held in memory
+    """
+    dtype = np.uint16 if len(tokenizer) <= np.iinfo(np.uint16).max + 1 else np.int32
+    chunks = []
+    lengths = []
+    for start in range(0, len(texts), TOKENIZE_BATCH_SIZE):
+        encoded = tokenizer(
+            texts[start:start + TOKENIZE_BATCH_SIZE],
+            add_special_tokens=True,
+            max_length=max_length,
+            truncation=True
+        )['input_ids']
+        for token_ids in encoded:
+            chunks.append(np.asarray(token_ids, dtype=dtype))
+            lengths.append(len(token_ids))
+
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    ids = np.concatenate(chunks) if chunks else np.zeros(0, dtype=dtype)
+    return TokenizedCorpus(ids, offsets)
+
+def pretokenize(
+    texts: List[str],
+    tokenizer,
+    max_length: int = 128,
+    cache_dir: Optional[Path] = None
+) -> TokenizedCorpus:
+    """
+    Tokenize a corpus once and reuse it across epochs and runs
+
+    The result is cached under cache_dir in a directory named after the
+    tokenizer and corpus fingerprints; later calls with the same tokenizer,
+    texts and max_length memory-map it instead of tokenizing again.
+
+    Args:
+        texts: Sample texts
+        tokenizer: Hugging Face tokenizer
+        max_length: Truncation length
+        cache_dir: Cache root (default: TOKEN_CACHE_DIR)
+
+    Returns:
+        Memory-mapped TokenizedCorpus
+    """
+    cache_dir = Path(cache_dir or TOKEN_CACHE_DIR)
+    key = f"{tokenizer_fingerprint(tokenizer)[:16]}-{corpus_fingerprint(texts, max_length)[:16]}"
+    directory = cache_dir / key
+
+    if not (directory / "offsets.npy").exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Build next to the final location and move into place atomically
+        staging = Path(tempfile.mkdtemp(prefix=f".{key}-", dir=cache_dir))
+        try:
+            tokenize_corpus(texts, tokenizer, max_length).save(staging)
+            try:
+                os.replace(staging, directory)
+            except OSError:
+                # Another process finished the same corpus first
+                if not (directory / "offsets.npy").exists():
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    return TokenizedCorpus.load(directory)
+
+class TokenizedDataset(Dataset):
+    """Pre-tokenized samples and their labels (no tokenizer in the epoch loop)"""
+
+    def __init__(self, corpus: TokenizedCorpus, labels, indices=None):
+        """
+        Args:
+            corpus: Token ids of all samples
+            labels: Class index of every sample in the corpus
+            indices: Subset of corpus positions (e.g., a train split)
+        """
+        self.corpus = corpus
+        self.labels = np.asarray(labels, dtype=np.int64)
+        self.indices = np.arange(len(corpus)) if indices is None else np.asarray(indices)
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, idx):
+        position = self.indices[idx]
+        return self.corpus[position], self.labels[position]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Token count of every sample in this dataset"""
+        return self.corpus.lengths[self.indices]
+
+class LengthBucketSampler(Sampler):
+    """
+    Batch sampler grouping samples of similar length
+
+    When shuffling, each epoch shuffles all samples, cuts them into pools of
+    batch_size * pool_batches, sorts every pool by length and splits it into
+    batches, then shuffles the batch order. Batches stay random from epoch to
+    epoch but pad to similar lengths. Without shuffling (validation), samples
+    are simply batched in length order.
+    """
+
+    def __init__(
+        self,
+        lengths,
+        batch_size: int,
+        shuffle: bool = True,
+        pool_batches: int = 50,
+        drop_last: bool = False,
+        seed: int = 0
+    ):
+        """
+        Args:
+            lengths: Token count of every sample (e.g., TokenizedDataset.lengths)
+            batch_size: Samples per batch
+            shuffle: Randomize pools and batch order (training)
+            pool_batches: Batches per sorted pool; larger pools pad less but
+                          mix less
+            drop_last: Drop batches smaller than batch_size
+            seed: Base random seed (combined with the epoch, see set_epoch)
+        """
+        self.lengths = np.asarray(lengths)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.pool_size = batch_size * max(1, pool_batches)
+        self.drop_last = drop_last
+        self.seed = seed
+        self.epoch = 0
+
+    def set_epoch(self, epoch: int):
+        """Use a different (reproducible) order for each epoch"""
+        self.epoch = epoch
+
+    def _batches(self) -> List[np.ndarray]:
+        if not self.shuffle:
+            order = np.argsort(self.lengths, kind='stable')
+            return self._split(order)
+
+        rng = np.random.default_rng((self.seed, self.epoch))
+        order = rng.permutation(len(self.lengths))
+        batches = []
+        for start in range(0, len(order), self.pool_size):
+            pool = order[start:start + self.pool_size]
+            pool = pool[np.argsort(self.lengths[pool], kind='stable')]
+            batches.extend(self._split(pool))
+        rng.shuffle(batches)
+        return batches
+
+    def _split(self, indices: np.ndarray) -> List[np.ndarray]:
+        batches = [indices[i:i + self.batch_size] for i in range(0, len(indices), self.batch_size)]
+        if self.drop_last and batches and len(batches[-1]) < self.batch_size:
+            batches.pop()
+        return batches
+
+    def __iter__(self):
+        for batch in self._batches():
+            yield batch.tolist()
+
+    def __len__(self) -> int:
+        if not self.shuffle:
+            return len(self._split(np.arange(len(self.lengths))))
+        full_pools, remainder = divmod(len(self.lengths), self.pool_size)
+        per_pool = self.pool_size // self.batch_size
+        if self.drop_last:
+            return full_pools * per_pool + remainder // self.batch_size
+        return full_pools * per_pool + -(-remainder // self.batch_size)
+
+def pad_collate(batch, pad_token_id: int = 0) -> Dict[str, torch.Tensor]:
+    """
+    Pad a batch to its longest sample
+
+    Args:
+        batch: List of (token ids, label) pairs from TokenizedDataset
+        pad_token_id: Id used for padding
+
+    Returns:
+        Dictionary with input_ids, attention_mask and label tensors
+    """
+    longest = max(len(token_ids) for token_ids, _ in batch)
+    input_ids = np.full((len(batch), longest), pad_token_id, dtype=np.int64)
+    attention_mask = np.zeros((len(batch), longest), dtype=np.int64)
+    for row, (token_ids, _) in enumerate(batch):
+        input_ids[row, :len(token_ids)] = token_ids
+        attention_mask[row, :len(token_ids)] = 1
+
+    return {
+        'input_ids': torch.from_numpy(input_ids),
+        'attention_mask': torch.from_numpy(attention_mask),
+        'label': torch.tensor([label for _, label in batch], dtype=torch.long)
+    }
+
+def make_collate(tokenizer):
+    """pad_collate bound to the tokenizer's pad id (picklable for DataLoader workers)"""
+    return functools.partial(pad_collate, pad_token_id=tokenizer.pad_token_id or 0)